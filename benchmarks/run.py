@@ -0,0 +1,305 @@
+# Набор тестов производительности: время выполнения, события SimPy в секунду и пиковый RSS планировщиков
+# и оптимизаторов PSO при росте числа задач, VM и хостов. Результаты сохраняются в JSON для сравнения коммитов:
+#   python -m benchmarks.run --suite quick --output bench.json
+#   python -m benchmarks.run --suite quick --compare bench.json
+import argparse
+import contextlib
+import json
+import math
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+import numpy as np
+
+SCHEDULERS = ("FCFS", "SJF", "RoundRobin", "PS")
+PSO_OPTIMIZERS = ("classic", "vectorized")
+
+# Наборы тестов: точка отсчета и значения осей масштабирования. Для планировщиков каждая ось (cloudlets, vms,
+# hosts) меняется отдельно при остальных параметрах из base; для PSO - число измерений и частиц.
+SUITES = {
+    "quick": {
+        "base": {"cloudlets": 1000, "vms": 10, "hosts": 1},
+        "cloudlets": [1000, 10000],
+        "vms": [10, 100],
+        "hosts": [1, 10],
+        "pso": {"dimensions": [10, 100], "particles": [30], "iterations": 50},
+    },
+    "full": {
+        "base": {"cloudlets": 10000, "vms": 10, "hosts": 1},
+        "cloudlets": [1000, 10000, 100000, 1000000],
+        "vms": [10, 100, 1000, 10000],
+        "hosts": [1, 10, 100, 1000, 10000],
+        "pso": {"dimensions": [10, 100, 1000, 10000], "particles": [30, 300], "iterations": 100},
+    },
+}
+
+# Типы VM нагрузки (как в example.py); VM создаются по кругу из этих типов
+VM_TYPES = (
+    {"mips": 500, "pes_number": 1, "ram": 819.2, "bw": 2000, "size": 10000, "vmm": "Xen"},
+    {"mips": 175, "pes_number": 2, "ram": 512, "bw": 2000, "size": 10000, "vmm": "Xen"},
+    {"mips": 125, "pes_number": 1, "ram": 2048, "bw": 2000, "size": 10000, "vmm": "Xen"},
+)
+
+
+def datacenter_config(vms, hosts):
+    # Конфигурация датацентра (см. experiment.build_datacenter): hosts одинаковых хостов, на которых
+    # помещаются vms VM типов VM_TYPES
+    per_host = math.ceil(vms / hosts)
+    host = {"count": hosts, "ram": 2048 * per_host, "bw": 2000 * per_host, "storage": 10000 * per_host,
+            "pes": 2 * per_host, "mips": 1000}
+    vm_configs = [{**VM_TYPES[index], "count": vms // len(VM_TYPES) + (index < vms % len(VM_TYPES))}
+                  for index in range(len(VM_TYPES))]
+    return {"name": f"bench-{vms}vms-{hosts}hosts", "hosts": [host], "vms": [vm for vm in vm_configs if vm["count"]]}
+
+
+def scheduler_cases(suite, schedulers, options=None):
+    # Тесты планировщиков по осям масштабирования набора (повторяющиеся точки не дублируются)
+    cases = []
+    seen = set()
+    for axis in ("cloudlets", "vms", "hosts"):
+        for value in suite[axis]:
+            params = {**suite["base"], axis: value}
+            if axis == "hosts":
+                params["vms"] = max(params["vms"], value)  # Хотя бы одна VM на хост
+            for scheduler in schedulers:
+                key = (scheduler, params["cloudlets"], params["vms"], params["hosts"])
+                if key in seen:
+                    continue
+                seen.add(key)
+                cases.append({"name": f"{scheduler}/cloudlets={params['cloudlets']}/vms={params['vms']}"
+                                      f"/hosts={params['hosts']}",
+                              "kind": "scheduler", "scheduler": scheduler, **params, "options": options or {}})
+    return cases
+
+
+def startup_cases(schedulers):
+    # Холодный старт: время импорта и крошечной симуляции в новом интерпретаторе
+    return [{"name": f"startup/{scheduler}", "kind": "startup", "scheduler": scheduler} for scheduler in schedulers]
+
+
+def pso_cases(suite, optimizers):
+    # Тесты ParticleSwarmOptimizer.optimize на функции сферы
+    pso = suite["pso"]
+    return [{"name": f"pso-{optimizer}/dimensions={dimensions}/particles={particles}", "kind": "pso",
+             "optimizer": optimizer, "dimensions": dimensions, "particles": particles,
+             "iterations": pso["iterations"]}
+            for optimizer in optimizers for dimensions in pso["dimensions"] for particles in pso["particles"]]
+
+
+def peak_rss_mb():
+    # Пиковый RSS текущего процесса в МБ (None, если модуль resource недоступен)
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10  # macOS - байты, Linux - КБ
+
+
+def run_scheduler_case(case):
+    from cloudsim.entities.cloudlet_batch import CloudletBatch
+    from cloudsim.entities.entity import reset_ids, set_id_mode
+    from cloudsim.simulation.cloudlet import CloudletExecution
+    from cloudsim.simulation.experiment import build_datacenter
+    from cloudsim.simulation.profiling import EventCounter
+
+    started = time.perf_counter()
+    set_id_mode("int")  # Компактные целочисленные идентификаторы
+    reset_ids()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        datacenter = build_datacenter(datacenter_config(case["vms"], case["hosts"]))
+        cloudlets = CloudletBatch.generate(case["cloudlets"], seed=0)
+        execution = CloudletExecution(case["scheduler"], cloudlets, datacenter,
+                                      **{"verbosity": "off", "dispatch": "event", **case["options"]})
+        counter = EventCounter(execution.env)
+        setup_time = time.perf_counter() - started
+        started = time.perf_counter()
+        execution.execute()
+        wall_time = time.perf_counter() - started
+    events = counter.count
+    return {"setup_time": setup_time, "wall_time": wall_time, "events": events,
+            "events_per_sec": events / wall_time if wall_time > 0 else None, "makespan": float(execution.makespan)}
+
+
+# Холодный старт в новом интерпретаторе: импорт ядра симулятора и крошечная симуляция
+STARTUP_SCRIPT = """
+import contextlib, json, os, sys, time
+started = time.perf_counter()
+from cloudsim.simulation.cloudlet import CloudletExecution
+from cloudsim.simulation.experiment import build_datacenter, generate_cloudlets
+import_time = time.perf_counter() - started
+with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+    execution = CloudletExecution(sys.argv[1], generate_cloudlets(0, {"num_cloudlets": 10}), build_datacenter({}),
+                                  verbosity="off")
+    execution.execute()
+print(json.dumps({"import_time": import_time, "wall_time": time.perf_counter() - started,
+                  "heavy_modules": [name for name in ("pandas", "matplotlib") if name in sys.modules]}))
+"""
+
+
+def run_startup_case(case):
+    # Отдельный интерпретатор: процесс теста уже импортировал numpy и модуль benchmarks
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, case["scheduler"]], capture_output=True,
+                               text=True, cwd=root, check=True)
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def sphere(position):
+    return float(np.sum(position ** 2))
+
+
+def run_pso_case(case):
+    from cloudsim.schedulers.pso.PS import ParticleSwarmOptimizer, Particle, VectorizedParticleSwarmOptimizer
+
+    config = {"num_particles": case["particles"], "num_iterations": case["iterations"], "inertia": 0.5,
+              "cognitive": 2, "social": 2, "bounds": [[-10, 10]] * case["dimensions"]}
+    started = time.perf_counter()
+    if case["optimizer"] == "vectorized":
+        optimizer = VectorizedParticleSwarmOptimizer(
+            batch_objective_function=lambda positions: np.sum(positions ** 2, axis=1), config=config, seed=0)
+    else:
+        optimizer = ParticleSwarmOptimizer(Particle, sphere, config=config, seed=0)
+    setup_time = time.perf_counter() - started
+    started = time.perf_counter()
+    _, best_value, _, _ = optimizer.optimize()
+    wall_time = time.perf_counter() - started
+    evaluations = case["particles"] * case["iterations"]
+    return {"setup_time": setup_time, "wall_time": wall_time, "evaluations": evaluations,
+            "evaluations_per_sec": evaluations / wall_time if wall_time > 0 else None, "best_value": float(best_value)}
+
+
+def _case_worker(case, connection):
+    # Выполнение одного теста в отдельном процессе (пиковый RSS не зависит от предыдущих тестов)
+    try:
+        if case["kind"] == "pso":
+            result = run_pso_case(case)
+        elif case["kind"] == "startup":
+            result = run_startup_case(case)
+        else:
+            result = run_scheduler_case(case)
+        result["status"] = "ok"
+    except Exception as error:
+        result = {"status": "error", "error": f"{type(error).__name__}: {error}"}
+    result["peak_rss_mb"] = peak_rss_mb()
+    connection.send(result)
+    connection.close()
+
+
+def run_case(case, timeout=None):
+    # Результат теста: параметры, измерения и статус ("ok", "error" или "timeout")
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_case_worker, args=(case, sender))
+    process.start()
+    sender.close()
+    if receiver.poll(timeout):
+        try:
+            result = receiver.recv()
+        except EOFError:
+            result = {"status": "error", "error": f"Процесс завершился с кодом {process.exitcode}"}
+    else:
+        process.terminate()
+        result = {"status": "timeout", "error": f"Превышено время {timeout} с"}
+    process.join()
+    return {"name": case["name"], "params": {key: value for key, value in case.items() if key != "name"}, **result}
+
+
+def run_repeated(case, repeat=1, timeout=None):
+    # Самый быстрый из repeat запусков теста (время всех запусков - в wall_times)
+    runs = []
+    for _ in range(repeat):
+        result = run_case(case, timeout)
+        if result["status"] != "ok":
+            return result
+        runs.append(result)
+    best = min(runs, key=lambda result: result["wall_time"])
+    best["wall_times"] = [result["wall_time"] for result in runs]
+    return best
+
+
+def metadata(suite_name):
+    # Сведения о запуске для сравнения результатов разных коммитов
+    import simpy
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"suite": suite_name, "commit": commit, "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine(),
+            "cpu_count": os.cpu_count(), "simpy": simpy.__version__, "numpy": np.__version__}
+
+
+def compare(results, baseline, threshold):
+    # Сравнение времени выполнения с результатами другого запуска; возвращает список регрессий
+    baseline_times = {result["name"]: result["wall_time"] for result in baseline["results"]
+                      if result.get("status") == "ok"}
+    regressions = []
+    print(f"{'case':60} {'baseline, s':>12} {'current, s':>12} {'ratio':>8}")
+    for result in results:
+        previous = baseline_times.get(result["name"])
+        if previous is None or result.get("status") != "ok":
+            continue
+        ratio = result["wall_time"] / previous if previous > 0 else math.inf
+        flag = " REGRESSION" if ratio > threshold else ""
+        print(f"{result['name']:60} {previous:12.4f} {result['wall_time']:12.4f} {ratio:8.2f}{flag}")
+        if flag:
+            regressions.append(result["name"])
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Тесты производительности cloudsim")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="quick", help="набор тестов")
+    parser.add_argument("--schedulers", nargs="*", default=list(SCHEDULERS), help="имена планировщиков")
+    parser.add_argument("--pso", nargs="*", default=list(PSO_OPTIMIZERS), choices=PSO_OPTIMIZERS,
+                        help="оптимизаторы PSO")
+    parser.add_argument("--options", help="JSON-объект с дополнительными параметрами CloudletExecution")
+    parser.add_argument("--filter", help="выполнять только тесты, в имени которых есть эта строка")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="количество повторов каждого теста (в отчет попадает самый быстрый)")
+    parser.add_argument("--timeout", type=float, default=600, help="ограничение времени одного теста, с")
+    parser.add_argument("--output", help="JSON-файл для результатов")
+    parser.add_argument("--compare", help="JSON-файл с результатами для сравнения")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="отношение времени выполнения, начиная с которого тест считается регрессией")
+    args = parser.parse_args(argv)
+
+    suite = SUITES[args.suite]
+    options = json.loads(args.options) if args.options else None
+    cases = (startup_cases(args.schedulers) + scheduler_cases(suite, args.schedulers, options)
+             + pso_cases(suite, args.pso))
+    if args.filter:
+        cases = [case for case in cases if args.filter in case["name"]]
+
+    results = []
+    for case in cases:
+        result = run_repeated(case, args.repeat, args.timeout)
+        results.append(result)
+        if result["status"] == "ok":
+            rate = result.get("events_per_sec") or result.get("evaluations_per_sec")
+            print(f"{case['name']:60} {result['wall_time']:10.4f} s {rate or 0:14.0f}/s "
+                  f"{result['peak_rss_mb'] or 0:8.1f} MB")
+        else:
+            print(f"{case['name']:60} {result['status']}: {result['error']}")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    report = {"metadata": metadata(args.suite), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if baseline is not None and compare(results, baseline, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
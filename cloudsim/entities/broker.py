@@ -1,4 +1,6 @@
+import heapq
 from cloudsim.entities.entity import Entity
+from cloudsim.entities.vm_allocation_policy import host_capacity_matrix, host_usage_matrix, vm_demand_matrix
 
 
 class Broker(Entity):
@@ -7,16 +9,120 @@ class Broker(Entity):
         self.broker_id = super().getId()  # Получаем уникальный ID брокера, используя метод родительского класса
         self.datacenter = datacenter  # Связываем брокера с центром обработки данных
         self.host_list = datacenter.get_host_list()  # Получаем список хостов из центра обработки данных
+        # Очередь с приоритетом хостов по количеству доступных ресурсов. Элементы - кортежи
+        # (отрицательные доступные ресурсы, индекс хоста, версия ресурсов хоста, хост); элементы
+        # с устаревшей версией пропускаются при извлечении (ленивое удаление).
+        # Ресурсы сравниваются как кортежи (RAM, BW, хранилище, PE), то есть лексикографически - так же, как
+        # исходный выбор max(host_list, key=available_resources): сначала по свободной RAM, при равной RAM -
+        # по BW и т. д., при полном равенстве - первый хост в списке. Это не сбалансированная скалярная оценка.
+        self.host_heap = []
+        self.host_index = {}  # ID хоста -> позиция в списке хостов (для разрешения равенства ресурсов)
+        for index, host in enumerate(self.host_list):
+            self.host_index[host.host_id] = index
+            host.broker = self
+        self.rebuild_host_heap()
 
-    def assign_vm_to_host(self, vm):
-        # Проверяем, есть ли хосты с достаточными ресурсами для размещения новой виртуальной машины (VM)
-        available_hosts = [host for host in self.host_list if host.has_enough_resources(vm)]
+    def rebuild_host_heap(self):
+        # Перестраиваем очередь с приоритетом по текущим ресурсам всех хостов
+        self.host_heap = [self._heap_entry(host) for host in self.host_list if not self._is_saturated(host)]
+        heapq.heapify(self.host_heap)
+
+    @staticmethod
+    def _is_saturated(host):
+        # Хост без свободных PE не может принять ни одну VM, поэтому в очередь он не попадает.
+        # Иначе хосты с большим запасом памяти, но занятыми PE, постоянно оказывались бы
+        # на вершине очереди и просматривались бы при каждом размещении.
+        return host.available_resources()[3] <= 0
+
+    def _heap_entry(self, host):
+        available = tuple(-value for value in host.available_resources())
+        return available, self.host_index[host.host_id], host.resource_version, host
+
+    def update_host(self, host):
+        # Вызывается хостом при изменении его свободных ресурсов
+        if not self._is_saturated(host):
+            heapq.heappush(self.host_heap, self._heap_entry(host))
+        # Периодически удаляем накопившиеся устаревшие элементы
+        if len(self.host_heap) > 4 * len(self.host_list) + 64:
+            self.rebuild_host_heap()
+
+    def select_host(self, vm):
+        # Находим хост с наибольшим (лексикографически) кортежем доступных ресурсов среди хостов, на которых
+        # VM помещается. Из очереди извлекаются хосты с большими ресурсами, на которых VM не помещается
+        # (например, много RAM, но мало хранилища), поэтому выбор стоит O((s + 1)·log H), где s - число таких
+        # хостов; в худшем случае s = H. Хосты без свободных PE в очереди не хранятся (см. _is_saturated).
+        if vm.pes_number <= 0:
+            # VM без PE может разместиться и на хостах без свободных PE, которых нет в очереди
+            available_hosts = [host for host in self.host_list if host.has_enough_resources(vm)]
+            return max(available_hosts, key=lambda host: host.available_resources()) if available_hosts else None
+        valid_entries = []
+        selected_host = None
+        while self.host_heap:
+            entry = heapq.heappop(self.host_heap)
+            host = entry[3]
+            if entry[2] != host.resource_version:
+                continue  # Устаревший элемент - ресурсы хоста с тех пор изменились
+            valid_entries.append(entry)
+            if host.has_enough_resources(vm):
+                selected_host = host
+                break
+        # Возвращаем в очередь актуальные элементы, извлеченные при поиске
+        for entry in valid_entries:
+            heapq.heappush(self.host_heap, entry)
+        return selected_host
+
+    def assign_vms(self, vm_list):
+        # Размещаем пакет виртуальных машин (VM) по хостам
+        policy = self.datacenter.vm_allocation_policy
+        if policy is None:
+            # Политика не задана: каждая VM размещается на хосте с наибольшим количеством доступных ресурсов
+            for vm in vm_list:
+                self.assign_vm_to_host(vm)
+            return
 
-        if not available_hosts:
+        # Политика размещает весь пакет за один векторный проход по матрицам ресурсов хостов
+        policy.prepare(self.host_list)
+        placement = policy.allocate(host_capacity_matrix(self.host_list), host_usage_matrix(self.host_list),
+                                    vm_demand_matrix(vm_list))
+        if (placement < 0).any():
             raise ValueError("Нет доступных хостов с достаточными ресурсами для размещения VM.")
+        for vm, host_index in zip(vm_list, placement):
+            self.host_list[host_index].assign_vm(vm)
 
-        # Находим хост с наибольшим количеством доступных ресурсов
-        selected_host = max(self.host_list, key=lambda host: host.available_resources())
+    def assign_vm_to_host(self, vm):
+        if self.datacenter.vm_allocation_policy is not None:
+            # Размещение одной VM по заданной политике
+            self.assign_vms([vm])
+            return
+
+        # Выбираем хост с достаточными ресурсами для размещения новой виртуальной машины (VM)
+        selected_host = self.select_host(vm)
+
+        if selected_host is None:
+            raise ValueError("Нет доступных хостов с достаточными ресурсами для размещения VM.")
 
         # Назначаем виртуальную машину на выбранный хост
-        selected_host.assign_vm(vm)
\ No newline at end of file
+        selected_host.assign_vm(vm)
+
+    def release_vm(self, vm):
+        # Освобождаем ресурсы хоста, на котором размещена виртуальная машина (VM)
+        if vm.host is None:
+            raise ValueError("VM не размещена ни на одном хосте.")
+        vm.host.release_vm(vm)
+
+    def migrate_vm(self, vm, target_host=None):
+        # Переносим VM на указанный хост или, если он не задан, на хост с наибольшим количеством ресурсов
+        if vm.host is None:
+            raise ValueError("VM не размещена ни на одном хосте.")
+        source_host = vm.host
+        if target_host is None:
+            # Временно освобождаем ресурсы VM, чтобы выбор хоста учитывал и исходный хост
+            source_host.release_vm(vm)
+            target_host = self.select_host(vm)
+            if target_host is None:
+                source_host.assign_vm(vm)
+                raise ValueError("Нет доступных хостов с достаточными ресурсами для миграции VM.")
+            target_host.assign_vm(vm)
+        else:
+            source_host.migrate_vm(vm, target_host)
+        return target_host
@@ -1,17 +1,24 @@
 from cloudsim.entities.entity import Entity
 
 class Cloudlet(Entity):
+    __slots__ = ("length", "pes_number", "file_size", "output_size", "vm", "status", "submit_time", "finish_time")
+
     def __init__(self, length, pes_number, file_size, output_size):
         super().__init__()
-        self.cloudlet_id = super().getId()  # Получаем уникальный идентификатор для Cloudlet
         self.length = length  # Длина задания (объем вычислений)
         self.pes_number = pes_number  # Количество процессорных элементов (PE) для выполнения задания
         self.file_size = file_size  # Размер входных данных
         self.output_size = output_size  # Размер выходных данных
         self.vm = None  # Виртуальная машина, на которой будет выполняться Cloudlet
         self.status = "Created"  # Статус задания (по умолчанию создано)
+        self.submit_time = 0  # Время поступления задания в планировщик
         self.finish_time = None  # Время завершения задания (изначально не задано)
 
+    @property
+    def cloudlet_id(self):
+        # Уникальный идентификатор Cloudlet
+        return self.id
+
     def set_vm(self, vm):
         # Устанавливаем виртуальную машину (VM) для выполнения данного Cloudlet
         self.vm = vm
@@ -0,0 +1,234 @@
+# Пакет задач в виде набора столбцов NumPy (struct-of-arrays) вместо списка объектов Cloudlet
+import numpy as np
+from cloudsim.entities.cloudlet import Cloudlet
+from cloudsim.entities.entity import reserve_ids
+
+# Статусы задач пакета и их коды в столбце status
+CLOUDLET_STATUSES = ("Created", "Running", "Completed")
+STATUS_CODES = {status: code for code, status in enumerate(CLOUDLET_STATUSES)}
+
+# Параметры генерации по умолчанию (как в generate_random_cloudlets из example.py)
+DEFAULT_GENERATOR_CONFIG = {
+    "length": (1, 15),
+    "pes_number": (1, 2),
+    "file_size": (100, 500),
+    "output_size": (30, 150),
+}
+
+
+def generate_column(rng, spec, count):
+    """
+    Столбец из count значений по описанию распределения spec:
+      число - все значения одинаковы;
+      (low, high) - равномерно распределенные целые из [low, high] (как random.randint);
+      {"distribution": имя, ...параметры} - метод numpy.random.Generator с этими параметрами
+      (например {"distribution": "exponential", "scale": 5}); "round": True округляет до целых,
+      "min" ограничивает значения снизу;
+      функция (rng, count) -> массив;
+      массив длины count - используется как есть.
+    """
+    if callable(spec):
+        column = np.asarray(spec(rng, count))
+    elif isinstance(spec, dict):
+        params = dict(spec)
+        distribution = params.pop("distribution")
+        round_values = params.pop("round", False)
+        minimum = params.pop("min", None)
+        column = getattr(rng, distribution)(size=count, **params)
+        if round_values:
+            column = np.rint(column).astype(np.int64)
+        if minimum is not None:
+            column = np.maximum(column, minimum)
+    elif isinstance(spec, tuple):
+        low, high = spec
+        column = rng.integers(low, high, size=count, endpoint=True)
+    elif np.ndim(spec) == 0:
+        column = np.full(count, spec)
+    else:
+        column = np.asarray(spec)
+    if column.shape != (count,):
+        raise ValueError(f"Ожидался столбец из {count} значений, получено {column.shape}")
+    return column
+
+
+def cloudlet_column(cloudlets, name, dtype=float):
+    # Значения атрибута name всех задач в виде массива (для CloudletBatch - столбец без обхода объектов)
+    if isinstance(cloudlets, CloudletBatch):
+        return cloudlets.columns[name].astype(dtype, copy=False)
+    return np.array([getattr(cloudlet, name) for cloudlet in cloudlets], dtype=dtype)
+
+
+class CloudletBatch:
+    """
+    Пакет задач, хранящий атрибуты в столбцах NumPy: length, pes_number, file_size, output_size,
+    submit_time, status (коды CLOUDLET_STATUSES), vm (код VM, -1 - не назначена) и finish_time (NaN - не
+    завершена). Идентификаторы задач - последовательный диапазон целых из счетчика сущностей.
+
+    Планировщики работают с пакетом как со списком задач: итерация и индексирование возвращают
+    CloudletView - легкие представления строк с интерфейсом Cloudlet, которые читают и пишут столбцы.
+    """
+
+    def __init__(self, length, pes_number, file_size, output_size, submit_time=None):
+        length = np.asarray(length)
+        count = len(length)
+        first_id = reserve_ids(count)
+        self.columns = {
+            "cloudlet_id": np.arange(first_id, first_id + count, dtype=np.int64),
+            "length": length,
+            "pes_number": np.asarray(pes_number),
+            "file_size": np.asarray(file_size),
+            "output_size": np.asarray(output_size),
+            "submit_time": np.zeros(count) if submit_time is None else np.asarray(submit_time, dtype=float),
+            "status": np.zeros(count, dtype=np.int8),
+            "vm": np.full(count, -1, dtype=np.int64),
+            "finish_time": np.full(count, np.nan),
+        }
+        for name, column in self.columns.items():
+            if column.shape != (count,):
+                raise ValueError(f"Столбец {name} должен содержать {count} значений, получено {column.shape}")
+        self.vm_objects = []  # VM, назначенные задачам пакета, по коду из столбца vm
+        self._vm_codes = {}  # Идентификатор VM -> код
+
+    @classmethod
+    def generate(cls, count, seed=None, config=None):
+        # Генерация пакета задач: config - описания распределений столбцов (см. generate_column)
+        rng = np.random.default_rng(seed)
+        config = {**DEFAULT_GENERATOR_CONFIG, **(config or {})}
+        columns = {name: generate_column(rng, config[name], count) for name in DEFAULT_GENERATOR_CONFIG}
+        submit_time = generate_column(rng, config["submit_time"], count) if "submit_time" in config else None
+        return cls(submit_time=submit_time, **columns)
+
+    @classmethod
+    def from_cloudlets(cls, cloudlets):
+        # Пакет с атрибутами существующих объектов Cloudlet (получает новые идентификаторы)
+        return cls(*(cloudlet_column(cloudlets, name, None)
+                     for name in ("length", "pes_number", "file_size", "output_size", "submit_time")))
+
+    def to_cloudlets(self):
+        # Объекты Cloudlet с атрибутами пакета
+        cloudlets = []
+        for length, pes_number, file_size, output_size, submit_time in zip(
+                *(self.columns[name].tolist() for name in ("length", "pes_number", "file_size", "output_size",
+                                                           "submit_time"))):
+            cloudlet = Cloudlet(length, pes_number, file_size, output_size)
+            cloudlet.submit_time = submit_time
+            cloudlets.append(cloudlet)
+        return cloudlets
+
+    def __len__(self):
+        return len(self.columns["length"])
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Индекс задачи вне пакета")
+        return CloudletView(self, index)
+
+    def __iter__(self):
+        return iter(self.views())
+
+    def __getattr__(self, name):
+        # Доступ к столбцам как к атрибутам: batch.length, batch.finish_time, ...
+        columns = self.__dict__.get("columns")
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    def views(self, indices=None):
+        # Представления строк пакета в порядке indices (по умолчанию - все строки по порядку)
+        if indices is None:
+            indices = range(len(self))
+        else:
+            indices = np.asarray(indices).tolist()
+        return [CloudletView(self, index) for index in indices]
+
+    def argsort(self, name="length"):
+        # Порядок строк по возрастанию столбца name (устойчивая сортировка, как sorted())
+        return np.argsort(self.columns[name], kind="stable")
+
+    def vm_code(self, vm):
+        # Код VM для столбца vm
+        code = self._vm_codes.get(vm.get_id())
+        if code is None:
+            code = self._vm_codes[vm.get_id()] = len(self.vm_objects)
+            self.vm_objects.append(vm)
+        return code
+
+    def vm_ids(self):
+        # Идентификаторы назначенных VM по задачам (None - VM не назначена)
+        ids = [vm.get_id() for vm in self.vm_objects]
+        return [ids[code] if code >= 0 else None for code in self.columns["vm"].tolist()]
+
+
+class CloudletView:
+    # Представление одной задачи пакета с интерфейсом Cloudlet; атрибуты читаются и пишутся в столбцы пакета
+    __slots__ = ("batch", "index")
+
+    def __init__(self, batch, index):
+        self.batch = batch
+        self.index = index
+
+    def __repr__(self):
+        return f"CloudletView(cloudlet_id={self.cloudlet_id}, length={self.length})"
+
+    def _get(self, name):
+        return self.batch.columns[name].item(self.index)
+
+    def _set(self, name, value):
+        self.batch.columns[name][self.index] = value
+
+    id = cloudlet_id = property(lambda self: self._get("cloudlet_id"))
+    name = property(lambda self: self._get("cloudlet_id"))
+    length = property(lambda self: self._get("length"), lambda self, value: self._set("length", value))
+    pes_number = property(lambda self: self._get("pes_number"), lambda self, value: self._set("pes_number", value))
+    file_size = property(lambda self: self._get("file_size"), lambda self, value: self._set("file_size", value))
+    output_size = property(lambda self: self._get("output_size"),
+                           lambda self, value: self._set("output_size", value))
+    submit_time = property(lambda self: self._get("submit_time"),
+                           lambda self, value: self._set("submit_time", value))
+
+    @property
+    def finish_time(self):
+        finish_time = self._get("finish_time")
+        return None if finish_time != finish_time else finish_time  # NaN - задача не завершена
+
+    @finish_time.setter
+    def finish_time(self, value):
+        # Время завершения; задача с заданным временем завершения получает статус "Completed"
+        self._set("finish_time", np.nan if value is None else value)
+        if value is not None:
+            self._set("status", STATUS_CODES["Completed"])
+
+    @property
+    def status(self):
+        return CLOUDLET_STATUSES[self._get("status")]
+
+    @status.setter
+    def status(self, value):
+        self._set("status", STATUS_CODES[value])
+
+    @property
+    def vm(self):
+        code = self._get("vm")
+        return None if code < 0 else self.batch.vm_objects[code]
+
+    def getId(self):
+        return self.cloudlet_id
+
+    def set_vm(self, vm):
+        # Назначение VM; задача с назначенной VM получает статус "Running"
+        if vm is None:
+            self._set("vm", -1)
+            return
+        self._set("vm", self.batch.vm_code(vm))
+        self._set("status", STATUS_CODES["Running"])
+
+    def get_vm(self):
+        return self.vm
+
+    def get_status(self):
+        return self.status
+
+    def get_finish_time(self):
+        return self.finish_time
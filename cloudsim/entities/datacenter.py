@@ -1,5 +1,6 @@
 from cloudsim.entities.entity import Entity
 from cloudsim.entities.broker import Broker
+from cloudsim.entities.vm_allocation_policy import get_vm_allocation_policy
 
 
 class DatacenterCharacteristics:
@@ -34,12 +35,16 @@ class Datacenter(Entity):
         self.setName(name)  # Устанавливаем имя датацентра
 
         self.characteristics = characteristics  # Характеристики датацентра
-        self.vm_allocation_policy = vm_allocation_policy  # Политика выделения виртуальных машин
+        # Политика выделения виртуальных машин: None (хост с наибольшим количеством доступных ресурсов),
+        # имя политики ("first_fit", "best_fit", "worst_fit", "dot_product", "power_aware")
+        # или экземпляр VmAllocationPolicy
+        self.vm_allocation_policy = get_vm_allocation_policy(vm_allocation_policy)
         self.last_process_time = 0.0  # Последнее время обработки
         self.storage_list = storage_list  # Список хранилищ
         self.vm_list = []  # Список виртуальных машин (VM)
         self.scheduling_interval = scheduling_interval  # Интервал планирования задач
         self.broker = Broker(self)  # Создаем брокера для управления распределением VM
+        self.topology = None  # Топология сети (NetworkTopology), задается через set_topology
 
         # Привязываем хосты к датацентру
         for host in self.characteristics.host_list:
@@ -50,17 +55,25 @@ class Datacenter(Entity):
             raise Exception(
                 f"{super().getName()}: Ошибка - в данном датацентре нет PE, поэтому он не может обрабатывать Cloudlet'ы.")
 
-        # Если есть PE, выводим сообщение о создании межоблачной сети
-        if self.characteristics.number_of_pes != 0 and len(self.characteristics.host_list) != 0:
-            print(f"{name}: создана межоблачная топология сети...")
-
         self.characteristics.set_id(super().getId())  # Устанавливаем ID для датацентра
 
+    def set_topology(self, topology, **options):
+        # Подключение хостов датацентра к топологии сети (options - параметры NetworkTopology.add_datacenter);
+        # возвращает узел коммутатора датацентра для соединения с другими датацентрами
+        switch = topology.add_datacenter(self, **options)
+        print(f"{self.name}: создана межоблачная топология сети...")
+        return switch
+
+    def set_power_model(self, power_model):
+        # Одна модель мощности для всех хостов датацентра (задается до set_vms, если размещение VM
+        # учитывает энергию - политика "power_aware")
+        for host in self.characteristics.host_list:
+            host.set_power_model(power_model)
+
     def set_vms(self, vm_list):
         # Назначаем список виртуальных машин (VM) для датацентра
         self.vm_list = vm_list
-        for vm in vm_list:
-            self.broker.assign_vm_to_host(vm)  # Передаем VM брокеру для распределения по хостам
+        self.broker.assign_vms(vm_list)  # Передаем VM брокеру для распределения по хостам
 
     def get_host_list(self):
         # Возвращаем список хостов датацентра
@@ -1,18 +1,88 @@
+import itertools
 import uuid
 
+# Режимы идентификаторов сущностей
+ID_MODE_UUID = "uuid"  # Строки uuid4 (по умолчанию; медленнее, 36 символов на идентификатор)
+ID_MODE_INT = "int"  # Целые числа из монотонного счетчика симуляции (компактно и быстро; включается set_id_mode)
+ID_MODES = (ID_MODE_UUID, ID_MODE_INT)
+
+_id_mode = ID_MODE_UUID  # Текущий режим идентификаторов
+_id_counter = itertools.count()  # Счетчик целочисленных идентификаторов текущей симуляции
+_id_namespace = uuid.uuid4()  # Пространство имен для получения UUID из целочисленных идентификаторов
+
+
+def set_id_mode(mode):
+    # Выбор режима идентификаторов для сущностей, создаваемых после вызова. В режиме "int" счетчик общий
+    # для процесса: для одинаковой нумерации в каждой симуляции вызывайте reset_ids() перед её построением.
+    global _id_mode
+    if mode not in ID_MODES:
+        raise ValueError(f"Неизвестный режим идентификаторов: {mode}. Допустимые значения: {ID_MODES}")
+    _id_mode = mode
+
+
+def get_id_mode():
+    return _id_mode
+
+
+def reset_ids(start=0):
+    # Начало новой симуляции: счетчик идентификаторов начинается заново, UUID при экспорте - с новым пространством имен
+    global _id_counter, _id_namespace
+    _id_counter = itertools.count(start)
+    _id_namespace = uuid.uuid4()
+
+
+def reserve_ids(count):
+    # Резервирование count последовательных целочисленных идентификаторов (для пакетов задач); возвращает первый
+    global _id_counter
+    start = next(_id_counter)
+    _id_counter = itertools.count(start + count)
+    return start
+
+
+def get_id_state():
+    # Состояние генератора идентификаторов (для снимков симуляции): режим, следующий идентификатор, пространство имен
+    return _id_mode, reserve_ids(0), _id_namespace
+
+
+def set_id_state(state):
+    # Восстановление состояния генератора идентификаторов из get_id_state
+    global _id_mode, _id_counter, _id_namespace
+    _id_mode, start, _id_namespace = state
+    _id_counter = itertools.count(start)
+
+
+def entity_uuid(entity_id):
+    # UUID сущности для экспорта: для целочисленного идентификатора - uuid5 в пространстве имен симуляции
+    if isinstance(entity_id, str):
+        return entity_id
+    return str(uuid.uuid5(_id_namespace, str(entity_id)))
+
+
 class Entity:
+    __slots__ = ("id", "_name")
+
     def __init__(self):
         self.id = self.generate_id()  # Генерируем уникальный идентификатор для сущности
-        self.name = self.id  # Имя сущности по умолчанию совпадает с её ID
+        self._name = None  # Имя сущности (по умолчанию совпадает с её ID)
+
+    @property
+    def name(self):
+        return self.id if self._name is None else self._name
 
     def setName(self, name):
         # Устанавливаем имя для сущности
-        self.name = name
+        self._name = name
 
     def getId(self):
         # Возвращаем уникальный идентификатор сущности
         return self.id
 
+    def get_uuid(self):
+        # Возвращаем UUID сущности (для экспорта результатов)
+        return entity_uuid(self.id)
+
     def generate_id(self):
-        # Генерируем уникальный ID с помощью библиотеки uuid
-        return str(uuid.uuid4())
\ No newline at end of file
+        # Генерируем уникальный ID: следующее значение счетчика или uuid4 в режиме "uuid"
+        if _id_mode == ID_MODE_INT:
+            return next(_id_counter)
+        return str(uuid.uuid4())
@@ -1,32 +1,46 @@
 from cloudsim.entities.entity import Entity
+from cloudsim.entities.power_model import get_power_model
 
 
 class Host(Entity):
-    def __init__(self, ram, bw, storage, pe_list):
+    __slots__ = ("ram", "bw", "storage", "pe_list", "assigned_vms", "used_ram", "used_bw", "used_storage", "used_pes",
+                 "resource_version", "broker", "datacenter", "power_model")
+
+    def __init__(self, ram, bw, storage, pe_list, power_model=None):
         super().__init__()  # Инициализация базового класса
-        self.host_id = super().getId()  # Получаем уникальный идентификатор хоста
         self.ram = ram  # Объем оперативной памяти хоста
         self.bw = bw  # Пропускная способность хоста
         self.storage = storage  # Объем хранилища хоста
         self.pe_list = pe_list  # Список процессорных элементов (PE)
         self.assigned_vms = []  # Список назначенных виртуальных машин (VM)
+        # Счетчики используемых ресурсов, обновляемые при назначении и освобождении VM
+        self.used_ram = 0  # Используемая память
+        self.used_bw = 0  # Используемая пропускная способность
+        self.used_storage = 0  # Используемое хранилище
+        self.used_pes = 0  # Используемое количество PE
+        self.resource_version = 0  # Номер версии ресурсов, увеличивается при каждом изменении
+        self.broker = None  # Брокер, который отслеживает свободные ресурсы хоста
+        # Модель потребляемой мощности (PowerModel, словарь {"model": ..., ...} или None - энергия не учитывается)
+        self.set_power_model(power_model)
+
+    @property
+    def host_id(self):
+        # Уникальный идентификатор хоста
+        return self.id
+
+    def set_power_model(self, power_model):
+        self.power_model = get_power_model(power_model)
 
     def set_datacenter(self, datacenter):
         # Устанавливаем датацентр для хоста
         self.datacenter = datacenter
 
     def available_resources(self):
-        # Вычисляем доступные ресурсы, вычитая использованные ресурсы из общего объема
-        used_ram = sum(vm.ram for vm in self.assigned_vms)  # Используемая память
-        used_bw = sum(vm.bw for vm in self.assigned_vms)  # Используемая пропускная способность
-        used_storage = sum(vm.size for vm in self.assigned_vms)  # Используемое хранилище
-        pes = sum(vm.pes_number for vm in self.assigned_vms)  # Используемое количество PE
-
-        # Вычисляем доступные ресурсы
-        available_ram = self.ram - used_ram
-        available_bw = self.bw - used_bw
-        available_storage = self.storage - used_storage
-        available_pes = len(self.pe_list) - pes
+        # Вычисляем доступные ресурсы по счетчикам использованных ресурсов (O(1))
+        available_ram = self.ram - self.used_ram
+        available_bw = self.bw - self.used_bw
+        available_storage = self.storage - self.used_storage
+        available_pes = len(self.pe_list) - self.used_pes
 
         return available_ram, available_bw, available_storage, available_pes  # Возвращаем доступные ресурсы
 
@@ -38,18 +52,45 @@ class Host(Entity):
 
     def assign_vm(self, vm):
         # Проверяем, достаточно ли ресурсов для назначения VM
-        available_ram, available_bw, available_storage, available_pes = self.available_resources()
-
-        if (vm.ram > available_ram) or (vm.bw > available_bw) or (vm.size > available_storage) or (
-                vm.pes_number > available_pes):
+        if not self.has_enough_resources(vm):
             raise ValueError("Недостаточно доступных ресурсов для выделения VM.")
 
-        # Назначаем VM хосту
+        # Назначаем VM хосту и учитываем занятые ею ресурсы
         self.assigned_vms.append(vm)
+        self._update_usage(vm, 1)
+        vm.host = self
+
+    def release_vm(self, vm):
+        # Освобождаем ресурсы, занятые виртуальной машиной (VM) на этом хосте
+        if vm.host is not self:
+            raise ValueError("VM не размещена на данном хосте.")
+        self.assigned_vms.remove(vm)
+        self._update_usage(vm, -1)
+        vm.host = None
+
+    def migrate_vm(self, vm, target_host):
+        # Переносим виртуальную машину (VM) с этого хоста на целевой хост
+        if target_host is self:
+            return
+        if not target_host.has_enough_resources(vm):
+            raise ValueError("Недостаточно доступных ресурсов на целевом хосте для миграции VM.")
+        self.release_vm(vm)
+        target_host.assign_vm(vm)
+
+    def _update_usage(self, vm, sign):
+        # Обновляем счетчики используемых ресурсов (sign = 1 при назначении, -1 при освобождении)
+        self.used_ram += sign * vm.ram
+        self.used_bw += sign * vm.bw
+        self.used_storage += sign * vm.size
+        self.used_pes += sign * vm.pes_number
+        self.resource_version += 1
+        # Сообщаем брокеру, что свободные ресурсы хоста изменились
+        if self.broker is not None:
+            self.broker.update_host(self)
 
     def get_details(self):
         # Выводим подробную информацию о хосте
         print(
             f"ID хоста: {self.host_id}\nОперативная память: {self.ram}\nПропускная способность: {self.bw}\nХранилище: {self.storage}\nКоличество PE: {len(self.pe_list)}\n")
         for vm in self.assigned_vms:
-            vm.get_details()  # Выводим информацию о каждой назначенной VM
\ No newline at end of file
+            vm.get_details()  # Выводим информацию о каждой назначенной VM
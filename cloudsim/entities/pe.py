@@ -1,7 +1,13 @@
 from cloudsim.entities.entity import Entity
 
 class Pe(Entity):
+    __slots__ = ("mips_rating",)
+
     def __init__(self, mips_rating):
         super().__init__()  # Инициализация базового класса
-        self.pe_id = super().getId()  # Получаем уникальный идентификатор процессорного элемента (PE)
-        self.mips_rating = mips_rating  # Устанавливаем рейтинг MIPS (Million Instructions Per Second) для PE
\ No newline at end of file
+        self.mips_rating = mips_rating  # Устанавливаем рейтинг MIPS (Million Instructions Per Second) для PE
+
+    @property
+    def pe_id(self):
+        # Уникальный идентификатор процессорного элемента (PE)
+        return self.id
@@ -0,0 +1,93 @@
+# Модели потребляемой мощности хоста в зависимости от загрузки его PE (доля от 0 до 1)
+import numpy as np
+
+
+class PowerModel:
+    """
+    Базовая модель мощности хоста. Мощность - кусочно-линейная функция загрузки, поэтому между событиями
+    изменения загрузки она постоянна, и энергия накапливается точно: мощность x длительность интервала.
+    Наследники реализуют power(utilization) и могут заменить powers векторной версией.
+    """
+
+    def power(self, utilization):
+        raise NotImplementedError
+
+    def powers(self, utilizations):
+        # Мощность для массива значений загрузки (для векторных оценок политики размещения VM)
+        return np.array([self.power(float(utilization)) for utilization in utilizations], dtype=float)
+
+
+class PowerModelLinear(PowerModel):
+    # Мощность растет линейно от мощности простоя (static_power_percent от max_power) до max_power.
+
+    def __init__(self, max_power, static_power_percent=0.7):
+        if max_power < 0 or not 0 <= static_power_percent <= 1:
+            raise ValueError("Мощность должна быть неотрицательной, а доля мощности простоя - от 0 до 1")
+        self.max_power = max_power  # Мощность при полной загрузке
+        self.static_power = max_power * static_power_percent  # Мощность простоя
+        self.dynamic_power = max_power - self.static_power  # Прирост мощности от простоя до полной загрузки
+
+    def power(self, utilization):
+        return self.static_power + self.dynamic_power * utilization
+
+    def powers(self, utilizations):
+        return self.static_power + self.dynamic_power * np.asarray(utilizations, dtype=float)
+
+    # Модели с одинаковыми параметрами равны (политика размещения VM оценивает такие хосты вместе)
+    def __eq__(self, other):
+        return type(other) is type(self) and (other.static_power, other.dynamic_power) == \
+            (self.static_power, self.dynamic_power)
+
+    def __hash__(self):
+        return hash((type(self), self.static_power, self.dynamic_power))
+
+
+class PowerModelSpecPower(PowerModel):
+    # Мощность по таблице измерений (как в результатах SPECpower_ssj2008: 11 значений при загрузке 0%, 10%, ..., 100%)
+    # с линейной интерполяцией между соседними уровнями.
+
+    def __init__(self, power_table):
+        power_table = [float(power) for power in power_table]
+        if len(power_table) < 2 or min(power_table) < 0:
+            raise ValueError("Таблица мощности должна содержать не меньше двух неотрицательных значений")
+        self.power_table = power_table
+        self.steps = len(power_table) - 1  # Число интервалов загрузки между точками таблицы
+
+    def power(self, utilization):
+        position = min(max(utilization, 0.0), 1.0) * self.steps
+        index = min(int(position), self.steps - 1)
+        fraction = position - index
+        return self.power_table[index] + (self.power_table[index + 1] - self.power_table[index]) * fraction
+
+    def powers(self, utilizations):
+        # Та же интерполяция, что и в power, для массива значений загрузки
+        table = np.asarray(self.power_table)
+        position = np.clip(np.asarray(utilizations, dtype=float), 0.0, 1.0) * self.steps
+        index = np.minimum(position.astype(np.int64), self.steps - 1)
+        return table[index] + (table[index + 1] - table[index]) * (position - index)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other.power_table == self.power_table
+
+    def __hash__(self):
+        return hash((type(self), tuple(self.power_table)))
+
+
+POWER_MODELS = {
+    "linear": PowerModelLinear,
+    "spec_power": PowerModelSpecPower,
+}
+
+
+def get_power_model(model):
+    # Модель может быть задана экземпляром PowerModel, словарем {"model": имя, ...параметры конструктора}
+    # (например из конфигурации эксперимента) или None (без модели мощности)
+    if model is None or isinstance(model, PowerModel):
+        return model
+    if isinstance(model, dict):
+        options = dict(model)
+        name = options.pop("model", None)
+        if name in POWER_MODELS:
+            return POWER_MODELS[name](**options)
+        model = name
+    raise ValueError(f"Неизвестная модель мощности: {model}. Допустимые значения: {tuple(POWER_MODELS)}")
@@ -1,9 +1,11 @@
 from cloudsim.entities.entity import Entity
+from cloudsim.entities.vm_execution import EXECUTION_EXCLUSIVE, create_execution
 
 class Vm(Entity):
-    def __init__(self, broker_id, mips, pes_number, ram, bw, size, vmm):
+    __slots__ = ("broker_id", "mips", "pes_number", "ram", "bw", "size", "vmm", "host", "execution_model", "execution")
+
+    def __init__(self, broker_id, mips, pes_number, ram, bw, size, vmm, execution_model=EXECUTION_EXCLUSIVE):
         super().__init__()  # Инициализация базового класса
-        self.vmid = self.getId()  # Получаем уникальный идентификатор виртуальной машины (VM)
         self.broker_id = broker_id  # Идентификатор брокера, управляющего этой VM
         self.mips = mips  # Рейтинг MIPS (Million Instructions Per Second) для виртуальной машины
         self.pes_number = pes_number  # Количество процессорных элементов (PE), используемых виртуальной машиной
@@ -11,10 +13,23 @@ class Vm(Entity):
         self.bw = bw  # Пропускная способность виртуальной машины
         self.size = size  # Объем хранилища, выделенного для VM
         self.vmm = vmm  # Виртуальная машина мониторинга (VMM), используемая для управления этой VM
+        self.host = None  # Хост, на котором размещена VM (назначается при размещении)
+        # Модель выполнения задач ("exclusive", "space_shared" или "time_shared", см. vm_execution)
+        self.set_execution_model(execution_model)
+
+    def set_execution_model(self, model, **options):
+        # Установка модели выполнения задач; options - параметры модели (например max_cloudlets для "time_shared")
+        self.execution_model = model
+        self.execution = create_execution(self, model, **options)  # None для модели "exclusive"
+
+    @property
+    def vmid(self):
+        # Уникальный идентификатор виртуальной машины (VM)
+        return self.id
 
     def get_id(self):
         # Возвращаем уникальный идентификатор виртуальной машины
-        return self.vmid
+        return self.id
 
     def get_details(self):
         # Выводим подробную информацию о виртуальной машине
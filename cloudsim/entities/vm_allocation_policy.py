@@ -0,0 +1,164 @@
+import numpy as np
+
+# Порядок столбцов в матрицах ресурсов хостов и требований VM.
+RESOURCE_COLUMNS = ("ram", "bw", "storage", "pes")
+
+
+def host_capacity_matrix(host_list):
+    # Матрица (хосты x ресурсы) полной емкости хостов
+    return np.array([[host.ram, host.bw, host.storage, len(host.pe_list)] for host in host_list],
+                    dtype=float).reshape(-1, len(RESOURCE_COLUMNS))
+
+
+def host_usage_matrix(host_list):
+    # Матрица (хосты x ресурсы) ресурсов, уже занятых размещенными VM
+    return np.array([[host.used_ram, host.used_bw, host.used_storage, host.used_pes] for host in host_list],
+                    dtype=float).reshape(-1, len(RESOURCE_COLUMNS))
+
+
+def vm_demand_matrix(vm_list):
+    # Матрица (VM x ресурсы) требований виртуальных машин
+    return np.array([[vm.ram, vm.bw, vm.size, vm.pes_number] for vm in vm_list],
+                    dtype=float).reshape(-1, len(RESOURCE_COLUMNS))
+
+
+class VmAllocationPolicy:
+    """
+    Базовая политика размещения VM на хостах.
+
+    Политика работает над массивами NumPy: оценка и проверка доступности всех хостов для VM
+    вычисляются одной векторной операцией, а не циклом по объектам Host. Для подряд идущих
+    одинаковых VM пересчитывается только строка хоста, выбранного на предыдущем шаге.
+    Наследники реализуют score - оценку хостов (меньше - лучше).
+    """
+
+    def prepare(self, host_list):
+        # Вызывается брокером перед размещением пакета VM: данные хостов, которых нет в матрицах ресурсов
+        pass
+
+    def allocate(self, capacity, used, demands):
+        # capacity, used - матрицы (хосты x ресурсы), demands - матрица (VM x ресурсы).
+        # Возвращает массив индексов хостов для каждой VM (-1, если VM не поместилась ни на один хост).
+        capacity = np.asarray(capacity, dtype=float)
+        used = np.array(used, dtype=float)  # Копия - занятые ресурсы обновляются по мере размещения
+        demands = np.asarray(demands, dtype=float)
+        # Нормирующие множители для сравнения разных ресурсов (нулевая емкость не участвует в оценке)
+        scale = np.where(capacity > 0, capacity, 1.0)
+        host_indices = np.arange(len(capacity))
+        free = capacity - used
+        placement = np.full(len(demands), -1, dtype=np.int64)
+        previous_demand = None
+        scores = None
+        for vm_index, demand in enumerate(demands):
+            if previous_demand is None or not np.array_equal(demand, previous_demand):
+                # VM с другими требованиями: пересчитываем оценки всех хостов
+                scores = self._masked_scores(free, scale, demand, host_indices)
+                previous_demand = demand
+            host_index = int(np.argmin(scores)) if len(scores) else 0
+            if not len(scores) or scores[host_index] == np.inf:
+                continue  # VM не помещается ни на один хост
+            placement[vm_index] = host_index
+            # Обновляем только строку выбранного хоста (так же, как счетчики Host: емкость минус занятое)
+            used[host_index] += demand
+            free[host_index] = capacity[host_index] - used[host_index]
+            row = slice(host_index, host_index + 1)
+            scores[row] = self._masked_scores(free[row], scale[row], demand, host_indices[row])
+        return placement
+
+    def _masked_scores(self, free, scale, demand, host_indices):
+        # Оценки хостов, на которых VM не помещается, заменяются на бесконечность
+        fits = (free >= demand).all(axis=1)
+        return np.where(fits, self.score(free, scale, demand, host_indices), np.inf)
+
+    def score(self, free, scale, demand, host_indices):
+        # free - свободные ресурсы хостов, scale - нормирующие множители (емкость хостов),
+        # demand - требования VM, host_indices - индексы хостов в списке. Меньшая оценка - лучший хост.
+        raise NotImplementedError
+
+
+class VmAllocationPolicyFirstFit(VmAllocationPolicy):
+    # Первый по порядку хост, на котором VM помещается.
+    def score(self, free, scale, demand, host_indices):
+        return host_indices.astype(float)
+
+
+class VmAllocationPolicyBestFit(VmAllocationPolicy):
+    # Хост с наименьшим суммарным нормированным остатком ресурсов после размещения (плотная упаковка).
+    def score(self, free, scale, demand, host_indices):
+        return ((free - demand) / scale).sum(axis=1)
+
+
+class VmAllocationPolicyWorstFit(VmAllocationPolicy):
+    # Хост с наибольшим суммарным нормированным остатком ресурсов после размещения (балансировка нагрузки).
+    def score(self, free, scale, demand, host_indices):
+        return -((free - demand) / scale).sum(axis=1)
+
+
+class VmAllocationPolicyDotProduct(VmAllocationPolicy):
+    # Многомерная упаковка: хост, у которого вектор свободных ресурсов наиболее сонаправлен
+    # с вектором требований VM (наибольшее скалярное произведение нормированных векторов).
+    def score(self, free, scale, demand, host_indices):
+        return -((free / scale) * (demand / scale)).sum(axis=1)
+
+
+class VmAllocationPolicyPowerAware(VmAllocationPolicy):
+    # Хост с наименьшим приростом потребляемой мощности после размещения (как PABFD в CloudSim): загрузка хоста
+    # оценивается долей занятых PE, а размещение на пустом хосте стоит и его мощности простоя (хост включается),
+    # поэтому VM собираются на меньшем числе хостов с более экономичными моделями мощности.
+    # Требует модели мощности у всех хостов (Host.power_model).
+
+    def __init__(self):
+        self.capacity = None  # Матрица (хосты x ресурсы) емкости хостов
+        self.power_models = []  # Различные модели мощности хостов
+        self.model_indices = None  # Массив: номер модели мощности каждого хоста в power_models
+
+    def prepare(self, host_list):
+        missing = sum(host.power_model is None for host in host_list)
+        if missing:
+            raise ValueError(f"Политика \"power_aware\" требует модели мощности у всех хостов: не задана у {missing}")
+        self.capacity = host_capacity_matrix(host_list)
+        # Хосты группируются по равным моделям мощности: мощность группы вычисляется одним вызовом powers
+        indices = {}
+        self.power_models = []
+        for host in host_list:
+            if host.power_model not in indices:
+                indices[host.power_model] = len(self.power_models)
+                self.power_models.append(host.power_model)
+        self.model_indices = np.array([indices[host.power_model] for host in host_list], dtype=np.int64)
+
+    def score(self, free, scale, demand, host_indices):
+        pes = RESOURCE_COLUMNS.index("pes")
+        used = self.capacity[host_indices] - free
+        before = self._power(host_indices, used[:, pes] / scale[:, pes])
+        after = self._power(host_indices, (used[:, pes] + demand[pes]) / scale[:, pes])
+        empty = ~used.any(axis=1)
+        return after - np.where(empty, 0.0, before)
+
+    def _power(self, host_indices, utilization):
+        # Мощность хостов при заданной загрузке: модель мощности каждого хоста (PowerModel.powers)
+        if len(self.power_models) == 1:
+            return self.power_models[0].powers(utilization)
+        model_indices = self.model_indices[host_indices]
+        power = np.empty(len(host_indices), dtype=float)
+        for model_index in np.unique(model_indices):
+            rows = model_indices == model_index
+            power[rows] = self.power_models[model_index].powers(utilization[rows])
+        return power
+
+
+VM_ALLOCATION_POLICIES = {
+    "first_fit": VmAllocationPolicyFirstFit,
+    "best_fit": VmAllocationPolicyBestFit,
+    "worst_fit": VmAllocationPolicyWorstFit,
+    "dot_product": VmAllocationPolicyDotProduct,
+    "power_aware": VmAllocationPolicyPowerAware,
+}
+
+
+def get_vm_allocation_policy(policy):
+    # Политика может быть задана экземпляром VmAllocationPolicy, именем или None (выбор брокера по умолчанию)
+    if policy is None or isinstance(policy, VmAllocationPolicy):
+        return policy
+    if policy in VM_ALLOCATION_POLICIES:
+        return VM_ALLOCATION_POLICIES[policy]()
+    raise ValueError(f"Неизвестная политика размещения VM: {policy}. Допустимые значения: {tuple(VM_ALLOCATION_POLICIES)}")
@@ -0,0 +1,166 @@
+# Модели выполнения задач на VM: сколько задач VM выполняет одновременно и сколько длится выполнение
+import heapq
+
+# Модели выполнения
+EXECUTION_EXCLUSIVE = "exclusive"  # Одна задача на VM, выполнение длится cloudlet.length (как в ранних версиях)
+EXECUTION_SPACE_SHARED = "space_shared"  # Задачи занимают свои PE VM и выполняются, пока хватает свободных PE
+EXECUTION_TIME_SHARED = "time_shared"  # Все задачи VM выполняются одновременно, разделяя её MIPS
+EXECUTION_MODELS = (EXECUTION_EXCLUSIVE, EXECUTION_SPACE_SHARED, EXECUTION_TIME_SHARED)
+
+# Остаток работы (MI на PE), при котором задача time-shared считается завершенной: меньше одной инструкции.
+# Отметки задач, запущенных в разные моменты, накапливают разную погрешность округления, поэтому задачи,
+# которые должны завершиться одновременно, сравниваются с этим допуском, а не на точное равенство.
+REMAINING_TOLERANCE = 1e-6
+
+
+def allocated_mips(vm):
+    # MIPS одного PE VM (не больше рейтинга самого медленного PE хоста, на котором размещена VM)
+    host = vm.host
+    if host is not None and host.pe_list:
+        return min(vm.mips, min(pe.mips_rating for pe in host.pe_list))
+    return vm.mips
+
+
+def cloudlet_runtime(vm, cloudlet):
+    # Время выполнения задачи на выделенных ей PE VM: длина (MI) / (MIPS x число PE)
+    return cloudlet.length / (allocated_mips(vm) * min(cloudlet.pes_number, vm.pes_number))
+
+
+class SpaceSharedExecution:
+    """
+    Space-shared: задача занимает cloudlet.pes_number PE VM на всё время выполнения, а VM принимает новые
+    задачи, пока у неё есть свободные PE. Время выполнения - cloudlet_runtime.
+    """
+
+    def __init__(self, vm):
+        self.vm = vm
+        self.free_pes = vm.pes_number  # Свободные PE VM
+        self.cloudlets = 0  # Количество задач, которым выделены PE
+
+    def can_accept(self, cloudlet):
+        return cloudlet.pes_number <= self.free_pes
+
+    def has_capacity(self):
+        # Может ли VM принять еще хотя бы одну задачу
+        return self.free_pes > 0
+
+    def accepted_pes(self):
+        # Наибольшее число PE задачи, которую VM может принять сейчас
+        return self.free_pes
+
+    def reserve(self, cloudlet):
+        # Выделение PE задаче, назначенной на VM
+        self.free_pes -= cloudlet.pes_number
+        self.cloudlets += 1
+
+    def release(self, cloudlet):
+        # Освобождение PE завершенной задачи
+        self.free_pes += cloudlet.pes_number
+        self.cloudlets -= 1
+
+    def run(self, env, cloudlet):
+        # Событие окончания выполнения задачи
+        return env.timeout(cloudlet_runtime(self.vm, cloudlet))
+
+
+class TimeSharedExecution:
+    """
+    Time-shared: все задачи VM выполняются одновременно. Пока запрошенных задачами PE не больше, чем PE у VM,
+    каждая задача получает полный MIPS на каждый свой PE; иначе MIPS всех задач уменьшается в одинаковой
+    пропорции (число PE VM / запрошенное число PE).
+
+    Поскольку пропорция одна для всех задач, выполнение отслеживается в виртуальном времени - объеме работы
+    (MI), выполненном одним запрошенным PE. Задача завершается, когда виртуальное время достигает отметки
+    (виртуальное время при запуске + length / pes_number), поэтому отметки не меняются при изменении состава
+    задач. Завершения хранятся в куче по отметке, и при каждом запуске или завершении задачи пересчитывается
+    только один таймаут - до ближайшего завершения (без пошагового пересчета остатка всех задач).
+    max_cloudlets ограничивает число задач, одновременно назначенных на VM. При None VM никогда не бывает
+    занята: она остается в списке свободных, и каждая задача запускается сразу при приеме (с first_fit - на
+    первой подходящей VM), поэтому режимы "polling" и "event" не различаются и очереди не возникает.
+    """
+
+    def __init__(self, vm, max_cloudlets=None):
+        if max_cloudlets is not None and max_cloudlets < 1:
+            raise ValueError(f"max_cloudlets должно быть не меньше 1 или None: {max_cloudlets}")
+        self.vm = vm
+        self.max_cloudlets = max_cloudlets
+        self.cloudlets = 0  # Количество задач, назначенных на VM
+        self.requested_pes = 0  # Сумма PE выполняющихся задач
+        self.virtual_time = 0.0  # Работа (MI), выполненная одним запрошенным PE
+        self.updated = 0.0  # Момент последнего обновления виртуального времени
+        self.completions = []  # Куча (отметка завершения, номер запуска, PE задачи, событие завершения)
+        self.sequence = 0  # Номер последнего запуска
+        self.timer = None  # Таймаут до ближайшего завершения (устаревшие таймауты игнорируются)
+        self.env = None
+
+    def can_accept(self, cloudlet):
+        return self.has_capacity()
+
+    def has_capacity(self):
+        return self.max_cloudlets is None or self.cloudlets < self.max_cloudlets
+
+    def accepted_pes(self):
+        return self.vm.pes_number if self.has_capacity() else 0
+
+    def reserve(self, cloudlet):
+        self.cloudlets += 1
+
+    def release(self, cloudlet):
+        self.cloudlets -= 1
+
+    def rate(self):
+        # Скорость роста виртуального времени (MIPS одного запрошенного PE)
+        return allocated_mips(self.vm) * min(1, self.vm.pes_number / self.requested_pes)
+
+    def advance(self):
+        # Обновление виртуального времени до текущего момента
+        now = self.env.now
+        if self.requested_pes:
+            self.virtual_time += (now - self.updated) * self.rate()
+        self.updated = now
+
+    def run(self, env, cloudlet):
+        # Запуск задачи; возвращает событие окончания её выполнения
+        self.env = env
+        self.advance()
+        pes = min(cloudlet.pes_number, self.vm.pes_number)
+        done = env.event()
+        self.sequence += 1
+        heapq.heappush(self.completions, (self.virtual_time + cloudlet.length / pes, self.sequence, pes, done))
+        self.requested_pes += pes
+        self.reschedule()
+        return done
+
+    def reschedule(self):
+        # Таймаут до ближайшего завершения при текущем составе задач
+        if not self.completions:
+            self.timer = None
+            return
+        delay = max(0.0, (self.completions[0][0] - self.virtual_time) / self.rate())
+        self.timer = self.env.timeout(delay)
+        self.timer.callbacks.append(self.on_timer)
+
+    def on_timer(self, timer):
+        if timer is not self.timer:
+            return  # Состав задач изменился после создания таймаута
+        self.advance()
+        # Таймаут назначен на завершение ближайшей задачи: она завершается в любом случае, а виртуальное время
+        # выравнивается по её отметке, чтобы погрешность округления не накапливалась. Вместе с ней завершаются
+        # задачи, остаток работы которых не больше REMAINING_TOLERANCE.
+        self.virtual_time = max(self.virtual_time, self.completions[0][0])
+        while self.completions and self.completions[0][0] - self.virtual_time <= REMAINING_TOLERANCE:
+            _, _, pes, done = heapq.heappop(self.completions)
+            self.requested_pes -= pes
+            done.succeed()
+        self.reschedule()
+
+
+def create_execution(vm, model, **options):
+    # Объект модели выполнения для VM (None - модель "exclusive")
+    if model == EXECUTION_EXCLUSIVE:
+        return None
+    if model == EXECUTION_SPACE_SHARED:
+        return SpaceSharedExecution(vm, **options)
+    if model == EXECUTION_TIME_SHARED:
+        return TimeSharedExecution(vm, **options)
+    raise ValueError(f"Неизвестная модель выполнения: {model}. Допустимые значения: {EXECUTION_MODELS}")
@@ -0,0 +1,163 @@
+# Передача данных по сети на уровне потоков: max-min справедливое разделение полосы каналов
+# без событий на отдельные пакеты
+import math
+from cloudsim.network.topology import NetworkTopology
+
+
+class Flow:
+    __slots__ = ("links", "size", "remaining", "rate", "limit", "started", "done")
+
+    def __init__(self, links, size, limit, started, done):
+        self.links = links  # Номера каналов маршрута
+        self.size = size  # Объем данных
+        self.remaining = size  # Оставшийся объем данных
+        self.rate = 0.0  # Текущая скорость передачи
+        self.limit = limit  # Ограничение скорости потока (например Vm.bw) или None
+        self.started = started  # Момент запроса передачи
+        self.done = done  # Событие SimPy окончания передачи
+
+
+class FlowNetwork:
+    """
+    Передачи данных между узлами NetworkTopology в окружении SimPy.
+
+    Передача длится задержку маршрута, затем объем данных передается потоком, скорость которого определяется
+    max-min справедливым разделением пропускной способности каналов между всеми активными потоками
+    (с учетом ограничения скорости потока). Скорости пересчитываются только при начале и окончании потока,
+    и после каждого пересчета планируется один таймаут - до ближайшего окончания потока
+    (устаревшие таймауты игнорируются, как в TimeSharedExecution).
+    """
+
+    def __init__(self, env, topology):
+        self.env = env
+        self.topology = topology
+        self.flows = []  # Активные потоки
+        self.updated = 0.0  # Момент, до которого учтены переданные объемы
+        self.timer = None  # Таймаут до ближайшего окончания потока
+        self.completed = 0  # Завершенные передачи
+        self.volume = 0.0  # Переданный объем данных
+        self.transfer_time = 0.0  # Суммарная длительность завершенных передач
+        self.reallocations = 0  # Пересчеты скоростей потоков
+
+    def transfer(self, source, target, size, rate_limit=None):
+        # Передача size единиц данных из узла source в узел target; возвращает событие окончания передачи
+        done = self.env.event()
+        route = self.topology.route(source, target)
+        size *= self.topology.data_scale
+        flow = Flow(route.links, size, rate_limit or None, self.env.now, done)
+        if size <= 0 or not (route.links or flow.limit):
+            # Нет данных или данные уже на узле: передача длится только задержку маршрута
+            self.env.timeout(route.latency).callbacks.append(lambda _: self.finish(flow))
+        elif route.latency > 0:
+            self.env.timeout(route.latency).callbacks.append(lambda _: self.start(flow))
+        else:
+            self.start(flow)
+        return done
+
+    def stage_in(self, vm, cloudlet):
+        # Загрузка входных данных задачи из хранилища датацентра на хост VM (не быстрее Vm.bw)
+        host = vm.host
+        return self.transfer(self.topology.storage_node(host), host, cloudlet.file_size, vm.bw)
+
+    def stage_out(self, vm, cloudlet):
+        # Выгрузка выходных данных задачи с хоста VM в хранилище датацентра
+        host = vm.host
+        return self.transfer(host, self.topology.storage_node(host), cloudlet.output_size, vm.bw)
+
+    def start(self, flow):
+        self.advance()
+        self.flows.append(flow)
+        self.allocate()
+        self.reschedule()
+
+    def finish(self, flow):
+        self.completed += 1
+        self.volume += flow.size
+        self.transfer_time += self.env.now - flow.started
+        flow.done.succeed()
+
+    def advance(self):
+        # Учет объемов, переданных с момента последнего обновления при текущих скоростях
+        now = self.env.now
+        duration = now - self.updated
+        if duration > 0:
+            for flow in self.flows:
+                flow.remaining -= flow.rate * duration
+        self.updated = now
+
+    def allocate(self):
+        # Max-min справедливые скорости (последовательное заполнение): на каждом шаге находится наименьшая
+        # доля полосы среди каналов (остаток пропускной способности / число нераспределенных потоков) и
+        # ограничений потоков; потоки через насыщенные каналы и с достигнутым ограничением получают эту долю.
+        self.reallocations += 1
+        bandwidth = self.topology.link_bandwidth
+        capacity = {}  # Канал -> нераспределенная пропускная способность
+        count = {}  # Канал -> число нераспределенных потоков через канал
+        for flow in self.flows:
+            for link in flow.links:
+                if link in count:
+                    count[link] += 1
+                else:
+                    count[link] = 1
+                    capacity[link] = bandwidth[link]
+        pending = self.flows
+        while pending:
+            share = min((capacity[link] / number for link, number in count.items()), default=math.inf)
+            share = min(share, min((flow.limit for flow in pending if flow.limit is not None), default=math.inf))
+            threshold = share * (1 + 1e-12)
+            saturated = {link for link, number in count.items() if capacity[link] / number <= threshold}
+            remaining = []
+            for flow in pending:
+                if (flow.limit is not None and flow.limit <= threshold) or not saturated.isdisjoint(flow.links):
+                    flow.rate = share
+                    for link in flow.links:
+                        capacity[link] = max(0.0, capacity[link] - share)
+                        count[link] -= 1
+                        if not count[link]:
+                            del count[link]
+                else:
+                    remaining.append(flow)
+            pending = remaining
+
+    def reschedule(self):
+        # Таймаут до ближайшего окончания потока при текущих скоростях
+        if not self.flows:
+            self.timer = None
+            return
+        delay = min(flow.remaining / flow.rate for flow in self.flows)
+        self.timer = self.env.timeout(max(0.0, delay))
+        self.timer.callbacks.append(self.on_timer)
+
+    def on_timer(self, timer):
+        if timer is not self.timer:
+            return  # Состав потоков изменился после создания таймаута
+        self.advance()
+        active = []
+        for flow in self.flows:
+            # Завершаются потоки, передавшие весь объем (с учетом погрешности округления)
+            if flow.remaining <= flow.size * 1e-9:
+                self.finish(flow)
+            else:
+                active.append(flow)
+        self.flows = active
+        if active:
+            self.allocate()
+        self.reschedule()
+
+    def report(self):
+        return {
+            "transfers": self.completed,
+            "volume": self.volume,
+            "mean_transfer_time": self.transfer_time / self.completed if self.completed else None,
+            "reallocations": self.reallocations,
+        }
+
+
+def create_network(env, network, datacenter):
+    # Сеть планировщика: FlowNetwork, NetworkTopology (для неё создается FlowNetwork) или None - топология
+    # датацентра, если она задана (Datacenter.set_topology), иначе без модели сети
+    if network is None:
+        network = getattr(datacenter, "topology", None)
+    if isinstance(network, NetworkTopology):
+        network = FlowNetwork(env, network)
+    return network
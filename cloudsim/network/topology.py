@@ -0,0 +1,136 @@
+# Топология сети между датацентрами и хостами: узлы, каналы с пропускной способностью и задержкой,
+# кэшированные таблицы маршрутов
+import heapq
+
+STORAGE_NODE = "storage"  # Вид узла хранилища датацентра (источник входных и получатель выходных данных задач)
+SWITCH_NODE = "switch"  # Вид узла коммутатора датацентра
+
+
+class Route:
+    """Маршрут между двумя узлами: номера направленных каналов по порядку и суммарная задержка."""
+
+    __slots__ = ("links", "latency")
+
+    def __init__(self, links, latency):
+        self.links = links  # Кортеж номеров направленных каналов
+        self.latency = latency  # Сумма задержек каналов маршрута
+
+
+class NetworkTopology:
+    """
+    Граф сети: узлы - любые хешируемые ключи (хосты, коммутаторы и хранилища датацентров), каналы - направленные,
+    с пропускной способностью (единиц данных в единицу времени) и задержкой. add_link по умолчанию добавляет пару
+    встречных каналов (полный дуплекс), поэтому потоки в разные стороны не делят полосу.
+
+    Маршрут - кратчайший путь по задержке (при равной задержке - с меньшим числом каналов). Маршруты считаются
+    алгоритмом Дейкстры один раз для каждого узла-источника (сразу ко всем узлам) и кэшируются до изменения
+    топологии; precompute() заполняет таблицы для всех источников заранее.
+    data_scale переводит единицы объема данных задач (file_size, output_size) в единицы пропускной
+    способности каналов, умноженные на единицу времени (например 8 для МБ и Мбит/с).
+    """
+
+    def __init__(self, data_scale=1.0):
+        self.data_scale = data_scale
+        self.nodes = {}  # Узел -> список исходящих каналов
+        self.link_bandwidth = []  # Номер канала -> пропускная способность
+        self.link_latency = []  # Номер канала -> задержка
+        self.link_nodes = []  # Номер канала -> (откуда, куда)
+        self.storage = {}  # Хост -> узел хранилища его датацентра
+        self._routes = {}  # Источник -> {узел назначения: Route} (кэш таблиц маршрутов)
+
+    def add_node(self, node):
+        self.nodes.setdefault(node, [])
+        return node
+
+    def add_link(self, a, b, bandwidth, latency=0.0, duplex=True):
+        # Канал a -> b (и b -> a при duplex=True); возвращает номер канала a -> b
+        if bandwidth <= 0:
+            raise ValueError("Пропускная способность канала должна быть положительной")
+        if latency < 0:
+            raise ValueError("Задержка канала не может быть отрицательной")
+        self.add_node(a)
+        self.add_node(b)
+        link = self._add_directed(a, b, bandwidth, latency)
+        if duplex:
+            self._add_directed(b, a, bandwidth, latency)
+        self._routes.clear()
+        return link
+
+    def _add_directed(self, a, b, bandwidth, latency):
+        link = len(self.link_bandwidth)
+        self.link_bandwidth.append(bandwidth)
+        self.link_latency.append(latency)
+        self.link_nodes.append((a, b))
+        self.nodes[a].append(link)
+        return link
+
+    def add_datacenter(self, datacenter, latency=0.0, storage_bandwidth=None, storage_latency=0.0):
+        # Сеть датацентра "звездой": каждый хост соединен с коммутатором датацентра каналом с пропускной
+        # способностью хоста (Host.bw), коммутатор - с хранилищем датацентра (по умолчанию с суммарной
+        # пропускной способностью хостов). Возвращает узел коммутатора (для соединения датацентров между собой).
+        hosts = datacenter.get_host_list()
+        switch = self.add_node((SWITCH_NODE, datacenter.getId()))
+        storage = self.add_node((STORAGE_NODE, datacenter.getId()))
+        for host in hosts:
+            self.add_link(host, switch, host.bw, latency)
+            self.storage[host] = storage
+        if storage_bandwidth is None:
+            storage_bandwidth = sum(host.bw for host in hosts)
+        self.add_link(switch, storage, storage_bandwidth, storage_latency)
+        datacenter.topology = self
+        return switch
+
+    def storage_node(self, host):
+        # Узел хранилища, из которого хост получает входные данные задач и в которое отправляет выходные
+        return self.storage[host]
+
+    def routes_from(self, source):
+        # Таблица маршрутов из узла source ко всем достижимым узлам (кэшируется)
+        routes = self._routes.get(source)
+        if routes is None:
+            routes = self._routes[source] = self._shortest_paths(source)
+        return routes
+
+    def route(self, source, target):
+        route = self.routes_from(source).get(target)
+        if route is None:
+            raise ValueError(f"Нет маршрута между узлами {source} и {target}")
+        return route
+
+    def precompute(self):
+        # Заполнение таблиц маршрутов для всех узлов-источников
+        for node in self.nodes:
+            self.routes_from(node)
+
+    def _shortest_paths(self, source):
+        if source not in self.nodes:
+            raise ValueError(f"Узел {source} отсутствует в топологии")
+        best = {source: (0.0, 0)}  # Узел -> (задержка, число каналов)
+        previous = {}  # Узел -> канал, по которому в него пришел кратчайший путь
+        heap = [(0.0, 0, 0, source)]
+        order = 0  # Порядковый номер элемента кучи (узлы могут быть несравнимы)
+        while heap:
+            latency, hops, _, node = heapq.heappop(heap)
+            if (latency, hops) > best[node]:
+                continue
+            for link in self.nodes[node]:
+                target = self.link_nodes[link][1]
+                candidate = (latency + self.link_latency[link], hops + 1)
+                if target not in best or candidate < best[target]:
+                    best[target] = candidate
+                    previous[target] = link
+                    order += 1
+                    heapq.heappush(heap, (*candidate, order, target))
+
+        routes = {source: Route((), 0.0)}
+        for target in best:
+            if target in routes:
+                continue
+            links = []
+            node = target
+            while node != source:
+                link = previous[node]
+                links.append(link)
+                node = self.link_nodes[link][0]
+            routes[target] = Route(tuple(reversed(links)), best[target][0])
+        return routes
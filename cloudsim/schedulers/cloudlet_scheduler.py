@@ -1,42 +1,364 @@
+import heapq
 from cloudsim.entities.entity import Entity
-import pandas as pd
+from cloudsim.network.flows import create_network
+from cloudsim.schedulers.vm_index import FreeVmIndex
+from cloudsim.simulation.metrics import UtilizationMetrics
+from cloudsim.simulation.events import ConsoleEventSink, EVENT_COMPLETE, EVENT_START, VERBOSITY_EVENT, \
+    VERBOSITY_LEVELS, verbosity_level
+
+# Режимы диспетчеризации задач, ожидающих свободную VM.
+DISPATCH_POLLING = "polling"  # Ожидающие задачи опрашивают список свободных VM каждую единицу времени.
+DISPATCH_EVENT = "event"  # Ожидающие задачи блокируются в очереди и пробуждаются только при освобождении VM.
+DISPATCH_MODES = (DISPATCH_POLLING, DISPATCH_EVENT)
+
+# Стратегии выбора свободной VM для задачи.
+VM_SELECTION_FIRST_FIT = "first_fit"  # Первая подходящая VM из списка свободных (линейный поиск).
+VM_SELECTION_BEST_FIT = "best_fit"  # Наименьшая подходящая VM из индекса классов ресурсов (FreeVmIndex).
+VM_SELECTION_MODES = (VM_SELECTION_FIRST_FIT, VM_SELECTION_BEST_FIT)
+
+
+class WaitingCloudlets:
+    """
+    Очередь задач, ожидающих VM, с выдачей первой задачи, которую может принять VM данного класса ресурсов
+    (PEs, RAM, хранилище). Используется режимом "event" и очередью готовых задач Round-Robin.
+
+    Каждая задача хранится один раз - в куче по (приоритет, номер постановки) своей сигнатуры: набора классов VM,
+    на которых она помещается. Сигнатура вычисляется перебором классов один раз для каждого сочетания требований
+    задачи (кэш требований ограничен DEMAND_CACHE_SIZE записями), а каждому классу известны кучи сигнатур,
+    в которые он входит. Выдача для класса сравнивает головы только этих куч: O(s + log n), где s - число
+    сигнатур класса (не больше числа различных наборов классов и не зависит от длины очереди).
+    Удаление элемента из середины очереди (discard) ленивое: элемент помечается и пропускается, когда окажется
+    в голове кучи.
+    """
+
+    DEMAND_CACHE_SIZE = 4096  # Наибольшее число запомненных сочетаний требований задач
+
+    def __init__(self, resource_classes):
+        self._class_heaps = {resource_class: [] for resource_class in resource_classes}  # Класс -> кучи его сигнатур
+        self._signature_heaps = {}  # Сигнатура (frozenset классов) -> куча [приоритет, номер постановки, элемент]
+        self._demand_heaps = {}  # Требования задачи (PEs, RAM, хранилище) -> куча её сигнатуры или None
+        self._sequence = 0  # Номер последней постановки в очередь
+        self.size = 0  # Количество задач в очереди
+
+    def __len__(self):
+        return self.size
+
+    def _heap(self, cloudlet):
+        # Куча сигнатуры задачи (None, если задача не помещается ни на один класс VM)
+        demand = (cloudlet.pes_number, cloudlet.file_size, cloudlet.output_size)
+        try:
+            return self._demand_heaps[demand]
+        except KeyError:
+            pass
+        signature = frozenset(resource_class for resource_class in self._class_heaps
+                              if resource_class[0] >= demand[0] and resource_class[1] >= demand[1]
+                              and resource_class[2] >= demand[2])
+        heap = self._signature_heaps.get(signature) if signature else None
+        if signature and heap is None:
+            heap = self._signature_heaps[signature] = []
+            for resource_class in signature:
+                self._class_heaps[resource_class].append(heap)
+        if len(self._demand_heaps) >= self.DEMAND_CACHE_SIZE:
+            self._demand_heaps.clear()
+        self._demand_heaps[demand] = heap
+        return heap
+
+    def fits(self, cloudlet):
+        # Помещается ли задача хотя бы на один класс VM (иначе она никогда не будет выдана из очереди)
+        return self._heap(cloudlet) is not None
+
+    def append(self, cloudlet, item, priority=0):
+        # Постановка элемента задачи в очередь: элементы выдаются по возрастанию приоритета, при равном - по порядку
+        # постановки. Задача, которая не помещается ни на одну VM, отвергается. Возвращает запись очереди (для discard).
+        heap = self._heap(cloudlet)
+        if heap is None:
+            raise ValueError(f"Для задачи {cloudlet.cloudlet_id} нет VM с достаточными ресурсами.")
+        self._sequence += 1
+        entry = [priority, self._sequence, item]
+        heapq.heappush(heap, entry)
+        self.size += 1
+        return entry
+
+    def discard(self, entry):
+        # Удаление записи, возвращенной append: элемент заменяется на None и пропускается в голове кучи
+        entry[2] = None
+        self.size -= 1
+
+    def _first_heap(self, resource_class):
+        # Куча класса resource_class с наименьшей головой (или None); удаленные записи снимаются с голов куч
+        first = None
+        for heap in self._class_heaps.get(resource_class, ()):
+            while heap and heap[0][2] is None:
+                heapq.heappop(heap)
+            if heap and (first is None or heap[0] < first[0]):
+                first = heap
+        return first
+
+    def pop_for(self, resource_class):
+        # Первый элемент задачи, которую может принять VM класса resource_class (или None)
+        first = self._first_heap(resource_class)
+        if first is None:
+            return None
+        self.size -= 1
+        return heapq.heappop(first)[2]
+
+    def peek_priority(self, resource_class):
+        # Приоритет первой задачи, которую может принять VM класса resource_class (или None), без изъятия
+        first = self._first_heap(resource_class)
+        return None if first is None else first[0][0]
+
 
 class CloudletScheduler(Entity):
-    def __init__(self, env, datacenter):
+    def __init__(self, env, datacenter, dispatch=DISPATCH_POLLING, vm_selection=VM_SELECTION_FIRST_FIT,
+                 verbosity=VERBOSITY_EVENT, sink=None, trace=None, network=None):
         super().__init__()
+        if dispatch not in DISPATCH_MODES:
+            raise ValueError(f"Неизвестный режим диспетчеризации: {dispatch}. Допустимые значения: {DISPATCH_MODES}")
+        if vm_selection not in VM_SELECTION_MODES:
+            raise ValueError(f"Неизвестная стратегия выбора VM: {vm_selection}. Допустимые значения: {VM_SELECTION_MODES}")
         self.env = env  # Симуляционное окружение.
         self.vm_list = datacenter.vm_list  # Список виртуальных машин (VM) в датацентре.
-        self.free_vms = [vm for vm in self.vm_list]  # Изначально все виртуальные машины свободны.
+        if not self.supports_execution_models and any(vm.execution is not None for vm in self.vm_list):
+            raise ValueError(f"Планировщик {type(self).__name__} поддерживает только модель выполнения VM \"exclusive\"")
+        self.vm_selection = vm_selection  # Стратегия выбора VM ("first_fit" или "best_fit").
+        # Изначально все виртуальные машины свободны. Для best-fit свободные VM хранятся в индексе классов ресурсов.
+        if vm_selection == VM_SELECTION_BEST_FIT:
+            self.free_vms = FreeVmIndex(self.vm_list)
+        else:
+            self.free_vms = [vm for vm in self.vm_list]
         self.running_vms = []  # Список виртуальных машин, на которых выполняются задачи.
         self.clock_time = 0  # Внутренний таймер планировщика.
         self.total_execution_time = 0  # Общее время выполнения всех задач.
         # Хранение максимальной загрузки ресурсов каждой виртуальной машины (PEs, RAM, Storage).
         self.max_utilization = {vm.get_id(): [0, 0, 0] for vm in self.vm_list}
+        # Взвешенные по времени метрики загрузки VM и хостов, ожидания и полного времени выполнения задач.
+        self.metrics = UtilizationMetrics(self.vm_list)
+        self.dispatch = dispatch  # Режим диспетчеризации ("polling" или "event").
+        # Очередь задач, ожидающих освобождения подходящей VM (используется в режиме "event").
+        # Для VM с моделью "space_shared" классом ресурсов служит число свободных PE, поэтому классы заводятся
+        # для каждого числа PE от 1 до pes_number.
+        self.resource_classes = [
+            (pes_number, vm.ram, vm.size) for vm in self.vm_list
+            for pes_number in (range(1, vm.pes_number + 1) if vm.execution is not None else (vm.pes_number,))]
+        self.waiting_cloudlets = WaitingCloudlets(self.resource_classes)
+        # Опрашивающие задачи по waiting_priority (потоковый режим "polling" планировщиков с prioritized_waiting)
+        self.polling_queue = None
+        # Уровень подробности вывода: "off", "summary" (итоговая сводка) или "event" (сводка и события задач).
+        level = verbosity_level(verbosity)
+        self.verbosity = verbosity
+        self.log_summary = level >= VERBOSITY_LEVELS["summary"]  # Выводить ли итоговую сводку.
+        # Записывать ли события задач: явно переданный приемник получает события при любом уровне подробности.
+        self.log_events = sink is not None or level >= VERBOSITY_LEVELS["event"]
+        # Приемник событий задач (по умолчанию - буферизованный вывод в stdout).
+        if sink is None and self.log_events:
+            sink = ConsoleEventSink()
+        self.sink = sink
+        self.trace = trace  # Колоночная трасса выполнения задач (TraceRecorder) или None.
+        self.active_cloudlets = 0  # Принятые, но еще не завершенные задачи (потоковый режим).
+        self.drained = None  # Событие завершения всех принятых задач (потоковый режим).
+        self.polling_cloudlets = 0  # Задачи, опрашивающие свободные VM (режим "polling").
+        # Модель сети (FlowNetwork): загрузка входных и выгрузка выходных данных задач входит в их выполнение.
+        # По умолчанию - топология датацентра (Datacenter.set_topology), если она задана.
+        self.network = create_network(env, network, datacenter)
+
+    # Поддерживает ли планировщик быстрый движок (ListSchedulingEngine) вместо процессов SimPy.
+    supports_fast_engine = False
+    # Поддерживает ли планировщик потоковое поступление задач (schedule_stream).
+    supports_streaming = False
+    # Поддерживает ли планировщик модели выполнения VM "space_shared" и "time_shared" (см. vm_execution).
+    supports_execution_models = True
+    # Задает ли waiting_priority порядок ожидающих задач (иначе приоритеты равны и действует порядок поступления).
+    prioritized_waiting = False
 
     def schedule_cloudlets(self, cloudlets):
         # Метод планирования задач, пока не реализован.
         pass
 
+    def order_cloudlets(self, cloudlets):
+        # Порядок, в котором задачи запрашивают VM (по умолчанию - порядок поступления).
+        return list(cloudlets)
+
+    def schedule_stream(self, arrivals):
+        # Потоковое планирование: задачи берутся из итератора по одной, когда время симуляции доходит
+        # до их submit_time, и не хранятся планировщиком после завершения.
+        if not self.supports_streaming:
+            raise ValueError(f"Планировщик {type(self).__name__} не поддерживает потоковое поступление задач")
+        if self.prioritized_waiting and self.dispatch == DISPATCH_POLLING:
+            # Задачи потока начинают опрос в разные моменты, поэтому освободившуюся VM забирала бы задача, чей опрос
+            # наступил раньше, а не задача с меньшим waiting_priority. Опрашивающие задачи хранятся в очереди,
+            # и задача не берет VM, которую ждет опрашивающая задача с более высоким приоритетом.
+            self.polling_queue = WaitingCloudlets(self.resource_classes)
+        for cloudlet in arrivals:
+            delay = cloudlet.submit_time - self.env.now
+            if delay < 0:
+                raise ValueError("Задачи потока должны быть упорядочены по времени поступления (submit_time)")
+            if delay > 0:
+                yield self.env.timeout(delay)
+            self.admit(cloudlet)
+        yield from self.drain()
+        self.finish()
+
+    def admit(self, cloudlet):
+        # Прием поступившей задачи: отдельный процесс планирования, который завершится вместе с задачей.
+        self.active_cloudlets += 1
+        self.env.process(self.run_admitted(cloudlet))
+
+    def run_admitted(self, cloudlet):
+        yield from self.schedule_cloudlet(cloudlet)
+        self.active_cloudlets -= 1
+        if self.active_cloudlets == 0 and self.drained is not None:
+            self.drained.succeed()
+
+    def drain(self):
+        # Ожидание завершения всех принятых задач.
+        if self.active_cloudlets:
+            self.drained = self.env.event()
+            yield self.drained
+
+    def check_fits(self, cloudlet):
+        # Задача, которая не помещается ни на одну VM, отвергается при приеме во всех режимах диспетчеризации:
+        # иначе она навсегда осталась бы в очереди (или опрашивала бы свободные VM), и симуляция не завершилась бы.
+        if not self.waiting_cloudlets.fits(cloudlet):
+            raise ValueError(f"Для задачи {cloudlet.cloudlet_id} нет VM с достаточными ресурсами.")
+
     def schedule_cloudlet(self, cloudlet):
         # Метод планирования отдельной задачи (cloudlet).
+        self.check_fits(cloudlet)
+        if self.dispatch == DISPATCH_EVENT:
+            # Задача получает VM либо сразу, либо в момент освобождения подходящей VM.
+            yield from self.acquire_vm(cloudlet)
+            yield self.env.process(self.execute_cloudlet(cloudlet))
+            return
+
+        polling = False  # Опрашивает ли задача свободные VM
+        entry = None  # Запись задачи в polling_queue
         while True:
             # Поиск первой свободной виртуальной машины, у которой достаточно ресурсов для выполнения задачи.
-            selected_vm = next((vm for vm in self.free_vms if self.has_enough_resources(vm, cloudlet)), None)
+            selected_vm = self.find_free_vm(cloudlet)
             if selected_vm:
-                # Если найдена подходящая VM:
-                self.free_vms.remove(selected_vm)  # Удаление VM из списка свободных.
-                cloudlet.set_vm(selected_vm)  # Назначение задачи на выбранную VM.
-                self.running_vms.append(selected_vm)  # Добавление VM в список занятых.
-                # Обновление максимальной загрузки для данной VM.
-                self.max_utilization[selected_vm.get_id()] = max(self.max_utilization[selected_vm.get_id()],
-                                                                 self.get_utilization(selected_vm, cloudlet))
+                if polling:
+                    self.polling_cloudlets -= 1
+                if entry is not None:
+                    self.polling_queue.discard(entry)
+                # Если найдена подходящая VM, забираем её из списка свободных и назначаем задачу.
+                self.checkout_vm(selected_vm, cloudlet)
                 yield self.env.process(self.execute_cloudlet(cloudlet))
                 # Запуск выполнения задачи.
                 break
             else:
                 # Если нет доступных ресурсов, ждем 1 единицу времени.
+                if not polling:
+                    polling = True
+                    self.polling_cloudlets += 1
+                    if self.polling_queue is not None:
+                        entry = self.polling_queue.append(cloudlet, cloudlet, self.waiting_priority(cloudlet))
                 yield self.env.timeout(1)
 
+    def find_free_vm(self, cloudlet):
+        if self.vm_selection == VM_SELECTION_BEST_FIT:
+            # Поиск наименьшей подходящей свободной VM по индексу классов ресурсов (без перебора всех VM).
+            return self.free_vms.find(cloudlet.pes_number, cloudlet.file_size, cloudlet.output_size,
+                                      lambda vm: self.can_run(vm, cloudlet))
+        # Поиск первой свободной VM, у которой достаточно ресурсов для выполнения задачи.
+        return next((vm for vm in self.free_vms if self.can_run(vm, cloudlet)), None)
+
+    def can_run(self, vm, cloudlet):
+        # Может ли свободная VM сейчас принять задачу: достаточно ресурсов и (для моделей "space_shared" и
+        # "time_shared") есть место среди задач, уже выполняющихся на VM.
+        return (self.has_enough_resources(vm, cloudlet) and (vm.execution is None or vm.execution.can_accept(cloudlet))
+                and (self.polling_queue is None or not self.outranked(vm, cloudlet)))
+
+    def outranked(self, vm, cloudlet):
+        # Ждет ли VM опрашивающая задача с более высоким приоритетом (меньшим waiting_priority), чем у cloudlet
+        priority = self.polling_queue.peek_priority(self.vm_resource_class(vm))
+        return priority is not None and priority < self.waiting_priority(cloudlet)
+
+    def vm_resource_class(self, vm):
+        # Класс ресурсов VM для очередей ожидания (для "space_shared" и "time_shared" - с числом PE, которые VM
+        # может выделить сейчас)
+        execution = vm.execution
+        return vm.pes_number if execution is None else execution.accepted_pes(), vm.ram, vm.size
+
+    def checkout_vm(self, vm, cloudlet):
+        # Назначение задачи на VM из списка свободных. VM покидает список, когда больше не может принимать задачи
+        # (с моделью "exclusive" - сразу).
+        self.assign_vm(vm, cloudlet)
+        if vm.execution is None or not vm.execution.has_capacity():
+            self.free_vms.remove(vm)
+
+    def assign_vm(self, vm, cloudlet):
+        # Назначение задачи на VM (VM уже изъята из списка свободных или может принять еще одну задачу).
+        cloudlet.set_vm(vm)  # Назначение задачи на выбранную VM.
+        self.running_vms.append(vm)  # Добавление VM в список занятых (по одному элементу на задачу).
+        if vm.execution is not None:
+            vm.execution.reserve(cloudlet)
+        # Обновление максимальной загрузки для данной VM (по каждому ресурсу отдельно).
+        self.max_utilization[vm.get_id()] = [max(previous, current) for previous, current in zip(
+            self.max_utilization.get(vm.get_id(), [0, 0, 0]), self.get_utilization(vm, cloudlet))]
+
+    def acquire_vm(self, cloudlet):
+        # Получение VM для задачи в режиме "event" (генератор SimPy, возвращает выделенную VM).
+        selected_vm = self.find_free_vm(cloudlet)
+        if selected_vm is not None:
+            self.checkout_vm(selected_vm, cloudlet)
+            return selected_vm
+
+        # Подходящей свободной VM нет: задача становится в очередь и ждет, пока release_vm не передаст ей VM.
+        request = self.env.event()
+        self.add_waiting(cloudlet, request)
+        selected_vm = yield request
+        return selected_vm
+
+    def add_waiting(self, cloudlet, request):
+        # Постановка задачи в очередь ожидания VM (режим "event") с приоритетом waiting_priority.
+        self.waiting_cloudlets.append(cloudlet, (cloudlet, request), self.waiting_priority(cloudlet))
+
+    def waiting_priority(self, cloudlet):
+        # Приоритет ожидающей задачи (меньше - раньше); по умолчанию одинаковый - порядок поступления.
+        return 0
+
+    def release_vm(self, vm, cloudlet=None):
+        # Освобождение VM после выполнения задачи cloudlet (или её кванта).
+        self.running_vms.remove(vm)
+        execution = vm.execution
+        if execution is None:
+            if self.dispatch == DISPATCH_EVENT and self.hand_over(vm):
+                return
+            # VM возвращается в список свободных.
+            self.free_vms.append(vm)
+            return
+
+        # Модели "space_shared" и "time_shared": освободившееся место может достаться нескольким ожидающим задачам.
+        was_full = not execution.has_capacity()
+        execution.release(cloudlet)
+        if self.dispatch == DISPATCH_EVENT:
+            while execution.has_capacity() and self.hand_over(vm):
+                pass
+        if was_full and execution.has_capacity():
+            self.free_vms.append(vm)
+        elif not was_full and not execution.has_capacity():
+            self.free_vms.remove(vm)
+
+    def hand_over(self, vm):
+        # Передача VM первой ожидающей задаче, которую VM может принять (режим "event"): сравниваются
+        # только головы очередей сигнатур класса ресурсов VM (для "space_shared" - с числом свободных PE).
+        entry = self.waiting_cloudlets.pop_for(self.vm_resource_class(vm))
+        if entry is None:
+            return False
+        cloudlet, request = entry
+        self.assign_vm(vm, cloudlet)
+        request.succeed(vm)
+        return True
+
+    @property
+    def polls_free_vms(self):
+        # Опрашивают ли ожидающие задачи список свободных VM (неудачный выбор VM - итерация опроса).
+        return self.dispatch == DISPATCH_POLLING
+
+    def queue_length(self):
+        # Количество задач, ожидающих VM (в очереди режима "event" или опрашивающих свободные VM).
+        return len(self.waiting_cloudlets) + self.polling_cloudlets
+
     def has_enough_resources(self, vm, cloudlet):
         # Проверка, достаточно ли ресурсов на VM для выполнения задачи.
         return vm.pes_number >= cloudlet.pes_number and vm.ram >= cloudlet.file_size and vm.size >= cloudlet.output_size
@@ -52,25 +374,55 @@ class CloudletScheduler(Entity):
 
     def execute_cloudlet(self, cloudlet):
         # Выполнение задачи (cloudlet) на назначенной VM.
-        print(f"Cloudlet {cloudlet.cloudlet_id} starts execution on VM {cloudlet.get_vm().get_id()} at {self.env.now}")
+        vm = cloudlet.get_vm()
         start_time = self.env.now  # Время начала выполнения задачи.
-        yield self.env.timeout(
-            cloudlet.length)  # Ожидание выполнения задачи в течение ее длины (длительность выполнения).
-        end_time = self.env.now  # Время завершения выполнения.
-        print(
-            f"Cloudlet {cloudlet.cloudlet_id} completes execution on VM {cloudlet.get_vm().get_id()} at {self.env.now}")
+        self.metrics.start(vm, cloudlet, start_time)
+        if self.log_events:
+            self.sink.emit(start_time, EVENT_START, cloudlet.cloudlet_id, vm.get_id())
+        if self.network is not None:
+            yield self.network.stage_in(vm, cloudlet)  # Загрузка входных данных на хост VM.
+        yield self.run_cloudlet(vm, cloudlet)  # Ожидание окончания выполнения задачи.
+        if self.network is not None:
+            yield self.network.stage_out(vm, cloudlet)  # Выгрузка выходных данных в хранилище.
+        self.complete_cloudlet(cloudlet, vm, start_time, self.env.now)
+
+        # После завершения выполнения задачи VM возвращается в список свободных
+        # (или сразу передается ожидающей задаче в режиме "event").
+        self.release_vm(vm, cloudlet)
+
+    def run_cloudlet(self, vm, cloudlet):
+        # Событие окончания выполнения задачи на VM: с моделью "exclusive" выполнение длится cloudlet.length,
+        # иначе длительность определяет модель выполнения VM (MIPS и PE).
+        if vm.execution is None:
+            return self.env.timeout(cloudlet.length)
+        return vm.execution.run(self.env, cloudlet)
+
+    def complete_cloudlet(self, cloudlet, vm, start_time, end_time):
+        # Учет завершенной задачи: общее время выполнения, время завершения, трасса и событие завершения.
         execution_time = end_time - start_time  # Время выполнения задачи.
         self.total_execution_time += execution_time  # Обновление общего времени выполнения.
 
+        cloudlet.finish_time = end_time
+
         # Подсчет времени ожидания и времени выполнения задачи.
-        wait_time = start_time
+        wait_time = start_time - cloudlet.submit_time
         turnaround_time = wait_time + execution_time
-        print(f"Cloudlet {cloudlet.cloudlet_id} - Waiting Time: {wait_time}, Turnaround Time: {turnaround_time}")
+        self.metrics.stop(vm, cloudlet, end_time)
+        self.metrics.complete(vm, wait_time, turnaround_time)
+        if self.trace is not None:
+            self.trace.record_cloudlet(cloudlet, vm, start_time, end_time)
+        if self.log_events:
+            self.sink.emit(end_time, EVENT_COMPLETE, cloudlet.cloudlet_id, vm.get_id(),
+                           {"wait_time": wait_time, "turnaround_time": turnaround_time})
 
-        # После завершения выполнения задачи, VM возвращается в список свободных.
-        self.free_vms.append(cloudlet.get_vm())
-        self.running_vms.remove(cloudlet.get_vm())
-        self.print_summary()  # Печать сводки после выполнения задачи.
+    def finish(self):
+        # Завершение планирования: сброс буфера событий, выгрузка трассы и вывод итоговой сводки.
+        if self.sink is not None:
+            self.sink.flush()
+        if self.trace is not None:
+            self.trace.close()
+        if self.log_summary:
+            self.print_summary()
 
     def get_utilization(self, vm, cloudlet):
         # Получение процента загрузки ресурсов VM для конкретной задачи.
@@ -0,0 +1,222 @@
+# Быстрый движок спискового планирования без вытеснения (FCFS, SJF): те же результаты, что и у процессов SimPy,
+# без отдельного процесса и таймаутов SimPy для каждой задачи
+import heapq
+import math
+import numpy as np
+from cloudsim.entities.cloudlet_batch import cloudlet_column
+from cloudsim.schedulers.cloudlet_scheduler import DISPATCH_EVENT
+from cloudsim.simulation.events import EVENT_START
+
+# Движки выполнения CloudletExecution
+ENGINE_SIMPY = "simpy"  # Каждая задача - процесс SimPy
+ENGINE_FAST = "fast"  # ListSchedulingEngine (только для планировщиков с supports_fast_engine)
+ENGINES = (ENGINE_SIMPY, ENGINE_FAST)
+
+
+class WaitingQueue:
+    """
+    Ожидающие задачи в порядке поступления с поиском первой задачи, которой хватает ресурсов VM.
+
+    Для каждого класса ресурсов VM (PEs, RAM, хранилище) один раз вычисляется (NumPy) упорядоченный массив
+    номеров ожидающих задач, которые на ней помещаются. Задачи только покидают очередь, поэтому первая
+    подходящая задача для класса ищется сдвигом указателя, а не перебором всей очереди.
+    """
+
+    def __init__(self, cloudlets, orders):
+        self.orders = np.asarray(orders, dtype=np.int64)  # Номера ожидающих задач по возрастанию
+        self.pes_number = cloudlet_column(cloudlets, "pes_number")[self.orders]
+        self.file_size = cloudlet_column(cloudlets, "file_size")[self.orders]
+        self.output_size = cloudlet_column(cloudlets, "output_size")[self.orders]
+        self.waiting = np.zeros(len(cloudlets), dtype=bool)  # Ожидает ли задача с данным номером
+        self.waiting[self.orders] = True
+        self.size = len(self.orders)
+        self._fits = {}  # Класс ресурсов VM -> номера задач, которые на ней помещаются
+        self._heads = {}  # Класс ресурсов VM -> индекс первой еще ожидающей задачи в _fits
+
+    def __len__(self):
+        return self.size
+
+    def first_fit(self, vm, start=0):
+        # Наименьший номер ожидающей задачи (не меньше start), которой хватает ресурсов VM, или None
+        key = (vm.pes_number, vm.ram, vm.size)
+        fits = self._fits.get(key)
+        if fits is None:
+            fits = self._fits[key] = self.orders[(self.pes_number <= vm.pes_number) & (self.file_size <= vm.ram) &
+                                                 (self.output_size <= vm.size)]
+            self._heads[key] = 0
+        head = self._heads[key]
+        while head < len(fits) and not self.waiting[fits[head]]:
+            head += 1
+        self._heads[key] = head
+        index = head
+        if start and index < len(fits) and fits[index] < start:
+            index = int(np.searchsorted(fits, start))
+            while index < len(fits) and not self.waiting[fits[index]]:
+                index += 1
+        return int(fits[index]) if index < len(fits) else None
+
+    def remove(self, order):
+        self.waiting[order] = False
+        self.size -= 1
+
+
+class ListSchedulingEngine:
+    """
+    Вычисление расписания планировщика без вытеснения (FCFS, SJF) по куче времен завершения задач.
+
+    Выбор VM, учет загрузки и итоговые данные берутся из самого планировщика (find_free_vm, checkout_vm,
+    complete_cloudlet), а порядок одновременных событий совпадает с порядком SimPy: завершения упорядочены
+    по (время, номер запуска), а номера запуска растут в том же порядке, в котором SimPy создает таймауты.
+
+    В режиме "event" освободившаяся VM передается первой подходящей ожидающей задаче.
+    В режиме "polling" ожидающие задачи опрашивают свободные VM в моменты 1, 2, 3, ... в порядке поступления;
+    раунды опроса, перед которыми не освобождалась ни одна VM, заведомо неудачны и пропускаются целиком,
+    а внутри раунда сразу находится следующая задача, которой хватает ресурсов какой-либо свободной VM.
+    """
+
+    def __init__(self, scheduler):
+        if not scheduler.supports_fast_engine:
+            raise ValueError(f"Планировщик {type(scheduler).__name__} не поддерживает быстрый движок")
+        if any(vm.execution is not None for vm in scheduler.vm_list):
+            raise ValueError("Быстрый движок поддерживает только модель выполнения VM \"exclusive\"")
+        if scheduler.network is not None:
+            raise ValueError("Быстрый движок не моделирует передачу данных по сети")
+        self.scheduler = scheduler
+        # Куча завершений: (время завершения, номер запуска, время начала, номер задачи, запустившей себя
+        # повторным опросом (или None), задача, VM)
+        self.completions = []
+        self.sequence = 0  # Номер последнего запуска
+        self.makespan = 0  # Время завершения последней задачи
+
+    def start(self, cloudlet, vm, time, order=None):
+        # Запуск задачи на VM, уже изъятой из списка свободных
+        scheduler = self.scheduler
+        if scheduler.log_events:
+            scheduler.sink.emit(time, EVENT_START, cloudlet.cloudlet_id, vm.get_id())
+        scheduler.metrics.start(vm, cloudlet, time)
+        self.sequence += 1
+        heapq.heappush(self.completions, (time + cloudlet.length, self.sequence, time, order, cloudlet, vm))
+
+    def complete(self):
+        # Завершение ближайшей задачи; возвращает освободившуюся VM
+        end_time, _, start_time, _, cloudlet, vm = heapq.heappop(self.completions)
+        self.scheduler.complete_cloudlet(cloudlet, vm, start_time, end_time)
+        self.scheduler.running_vms.remove(vm)
+        self.makespan = end_time
+        return vm
+
+    def run(self, cloudlets):
+        # Выполнение всех задач; возвращает время завершения последней задачи (как env.now после env.run())
+        scheduler = self.scheduler
+        cloudlets = scheduler.order_cloudlets(cloudlets)
+        for cloudlet in cloudlets:
+            # Как и процессы SimPy, задача, которая не помещается ни на одну VM, отвергается при приеме.
+            scheduler.check_fits(cloudlet)
+
+        # Момент 0: задачи по порядку получают первую подходящую свободную VM, остальные ждут.
+        # SimPy создает таймауты запущенных задач после того, как все задачи выполнили первый опрос.
+        waiting = []
+        started = []
+        for order, cloudlet in enumerate(cloudlets):
+            vm = scheduler.find_free_vm(cloudlet)
+            if vm is None:
+                waiting.append(order)
+                continue
+            scheduler.checkout_vm(vm, cloudlet)
+            started.append((cloudlet, vm))
+        for cloudlet, vm in started:
+            self.start(cloudlet, vm, 0)
+
+        queue = WaitingQueue(cloudlets, waiting)
+        if scheduler.dispatch == DISPATCH_EVENT:
+            self.run_event(cloudlets, queue)
+        else:
+            self.run_polling(cloudlets, queue)
+        scheduler.finish()
+        return self.makespan
+
+    def run_event(self, cloudlets, queue):
+        # Режим "event": освободившаяся VM передается первой ожидающей задаче, которой хватает её ресурсов.
+        # Задача, получившая VM, продолжает выполнение в SimPy после всех завершений, уже запланированных
+        # на тот же момент, поэтому такие задачи запускаются после обработки этих завершений.
+        scheduler = self.scheduler
+        completions = self.completions
+        while completions:
+            now = completions[0][0]
+            handed = []
+            while completions and completions[0][0] == now:
+                vm = self.complete()
+                order = queue.first_fit(vm) if queue.size else None
+                if order is None:
+                    scheduler.free_vms.append(vm)
+                    continue
+                queue.remove(order)
+                scheduler.assign_vm(vm, cloudlets[order])
+                handed.append((cloudlets[order], vm))
+            for cloudlet, vm in handed:
+                self.start(cloudlet, vm, now)
+
+    def next_poller(self, queue, start):
+        # Наименьший номер ожидающей задачи (не меньше start), которой хватает ресурсов какой-либо свободной VM
+        candidates = [queue.first_fit(vm, start) for vm in self.unique_free_vms()]
+        candidates = [order for order in candidates if order is not None]
+        return min(candidates) if candidates else None
+
+    def unique_free_vms(self):
+        # Свободные VM, по одной на класс ресурсов
+        classes = {}
+        for vm in self.scheduler.free_vms:
+            classes.setdefault((vm.pes_number, vm.ram, vm.size), vm)
+        return classes.values()
+
+    def run_polling(self, cloudlets, queue):
+        # Режим "polling". Завершение в момент раунда R обрабатывается до опросов, если задача начала
+        # выполнение раньше R - 1; если она запущена опросом в раунде R - 1, то между опросами задач,
+        # стоявших до и после нее; иначе (запуск в момент 0 или R) - после всех опросов раунда.
+        scheduler = self.scheduler
+        free_vms = scheduler.free_vms
+        completions = self.completions
+        round_time = 1
+        released = False  # Освобождалась ли VM после последнего раунда опроса
+        while queue.size:
+            while completions and (completions[0][0] < round_time or
+                                   (completions[0][0] == round_time and completions[0][2] < round_time - 1)):
+                free_vms.append(self.complete())
+                released = True
+            if not released and not (completions and completions[0][0] == round_time):
+                # Свободных VM не прибавилось: все опросы до следующего завершения неудачны.
+                # Каждая ожидающая задача помещается на какую-либо VM (run проверяет это при приеме),
+                # поэтому пока очередь не пуста, хотя бы одна задача выполняется.
+                round_time = max(round_time + 1, math.ceil(completions[0][0]))
+                continue
+
+            released = False
+            position = 0  # Номер задачи, с которой продолжается опрос в этом раунде
+            while True:
+                # Ближайшее завершение, которое SimPy обработает между опросами этого раунда
+                limit = None
+                if completions and completions[0][0] == round_time and completions[0][2] == round_time - 1:
+                    limit = completions[0][3]
+                while free_vms:
+                    # Задачи между position и order не находят свободной VM
+                    order = self.next_poller(queue, position)
+                    if order is None or (limit is not None and order >= limit):
+                        break
+                    vm = scheduler.find_free_vm(cloudlets[order])
+                    scheduler.checkout_vm(vm, cloudlets[order])
+                    queue.remove(order)
+                    self.start(cloudlets[order], vm, round_time, order)
+                    position = order + 1
+                if limit is None:
+                    break
+                position = max(position, limit)
+                free_vms.append(self.complete())
+                released = True
+
+            while completions and completions[0][0] == round_time:
+                free_vms.append(self.complete())
+                released = True
+            round_time += 1
+
+        while completions:
+            free_vms.append(self.complete())
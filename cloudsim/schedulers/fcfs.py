@@ -1,12 +1,11 @@
 from cloudsim.schedulers.cloudlet_scheduler import CloudletScheduler
 
 class CloudletSchedulerFCFS(CloudletScheduler):
+    supports_fast_engine = True
+    supports_streaming = True
 
     def schedule_cloudlets(self, cloudlets):
        processes = [self.env.process(self.schedule_cloudlet(cloudlet)) for cloudlet in cloudlets]        
        yield self.env.all_of(processes)
 
-       print(f"Total Execution Time: {self.total_execution_time}")
-
-       for vm in self.max_utilization:
-           print(f"\nVM {vm} utilization:\n {self.max_utilization[vm][0] * 100}% PEs\n, {self.max_utilization[vm][1] * 100}% RAM\n, {self.max_utilization[vm][2] *100}% Storage")
\ No newline at end of file
+       self.finish()  # Вывод итоговой сводки и сброс событий.
@@ -2,15 +2,19 @@ import numpy as np
 import json
 from cloudsim.schedulers.pso.constants import * # Импортируем константы из файла constants.py
 import os
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-import numpy as np
+import time
+from cloudsim.entities.cloudlet_batch import CloudletBatch, cloudlet_column
+from cloudsim.entities.vm_execution import allocated_mips
+from cloudsim.schedulers.cloudlet_scheduler import CloudletScheduler
+from cloudsim.schedulers.pso.parallel import ParallelEvaluator
 
 CONFIG_FILENAME = 'pso_config.json'
 class Particle:
-    def __init__(self, bounds):
+    def __init__(self, bounds, rng=None):
+        # Генератор случайных чисел частицы (оптимизатор передает свой генератор всем частицам роя)
+        self.rng = np.random.default_rng() if rng is None else rng
         # Инициализируем позицию частицы случайным образом с учетом границ
-        self.position = np.array([np.random.uniform(low, high) for low, high in bounds])
+        self.position = np.array([self.rng.uniform(low, high) for low, high in bounds])
         # Инициализируем скорость частицы нулями
         self.velocity = np.zeros_like(self.position)
         # Инициализируем лучшую позицию частицы текущей позицией
@@ -20,8 +24,8 @@ class Particle:
 
     def update_velocity(self, global_best_position, inertia, cognitive, social):
         # Генерируем случайные числа для когнитивной и социальной составляющих скорости
-        r1 = np.random.random(len(self.position))
-        r2 = np.random.random(len(self.position))
+        r1 = self.rng.random(len(self.position))
+        r2 = self.rng.random(len(self.position))
 
         # Вычисляем когнитивную составляющую скорости
         cognitive_velocity = cognitive * r1 * (self.best_position - self.position)
@@ -42,13 +46,16 @@ class Particle:
 
 
 class ParticleSwarmOptimizer:
-    def __init__(self, particle_class, objective_function, config_filename=None):
-
+    def __init__(self, particle_class, objective_function, config_filename=None, config=None, seed=None):
+        # config - словарь конфигурации вместо файла config_filename; seed - зерно (или np.random.Generator)
+        # генератора случайных чисел роя: у каждого оптимизатора свой генератор, глобальный np.random не используется
         self.particle_class = particle_class  # Класс частицы, который будет использоваться
-        if config_filename is None:
-            self.config = self.load_or_create_config()
-        else:
-            self.config = self.load_or_create_config(config_filename)
+        if config is None:
+            if config_filename is None:
+                config = self.load_or_create_config()
+            else:
+                config = self.load_or_create_config(config_filename)
+        self.config = config
         self.objective_function = objective_function  # Целевая функция, которую нужно оптимизировать
         self.bounds = self.config['bounds']  # Границы области поиска
         self.num_particles = self.config['num_particles']  # Количество частиц в рое
@@ -56,8 +63,12 @@ class ParticleSwarmOptimizer:
         self.inertia = self.config['inertia']  # Коэффициент инерции
         self.cognitive = self.config['cognitive']  # Коэффициент когнитивной составляющей
         self.social = self.config['social']  # Коэффициент социальной составляющей
+        self.rng = np.random.default_rng(seed)  # Генератор случайных чисел роя
+        self.init_swarm()
+
+    def init_swarm(self):
         # Создаем рой частиц
-        self.swarm = [self.particle_class(self.bounds) for _ in range(self.num_particles)]
+        self.swarm = [self.particle_class(self.bounds, self.rng) for _ in range(self.num_particles)]
         # Инициализируем глобально лучшую позицию и значение
         self.global_best_position = np.copy(self.swarm[0].position)
         self.global_best_value = float('inf')
@@ -77,49 +88,153 @@ class ParticleSwarmOptimizer:
                 print(f"Configuration file not found. Created default config at {filename}")
         return config
 
-    def optimize(self, save_iterations=False, print_iterations=False):
-        # Инициализируем списки для хранения лучших значений и позиций на каждой итерации, если требуется
-        if save_iterations:
-            best_values_per_iteration = np.zeros(self.num_iterations)
-            best_positions_per_iteration = np.zeros((self.num_iterations, len(self.bounds)))
-
-        for iteration in range(self.num_iterations):
-            for particle in self.swarm:
-                # Вычисляем значение целевой функции для текущей позиции частицы
-                value = self.objective_function(particle.position)
-
-                # Обновляем личный лучший результат частицы
-                if value < particle.best_value:
-                    particle.best_value = value
-                    particle.best_position = np.copy(particle.position)
-
-                # Обновляем глобально лучший результат
-                if value < self.global_best_value:
-                    self.global_best_value = value
-                    self.global_best_position = np.copy(particle.position)
-
-            # Сохраняем текущее глобально лучшее значение и позицию для этой итерации, если требуется
+    def optimize(self, save_iterations=False, print_iterations=False, n_workers=None, chunksize=None, seed=None,
+                 mp_context=None, tolerance=0.0, patience=None, max_time=None, max_evaluations=None,
+                 checkpoint_path=None, checkpoint_every=1, resume_from=None):
+        # n_workers - количество процессов для параллельного вычисления целевой функции частиц итерации,
+        # chunksize - количество частиц в одной порции, seed - если задан, целевая функция вызывается
+        # как objective_function(position, rng) с генератором, зависящим от (seed, итерация, частица).
+        # Досрочная остановка: patience итераций подряд без улучшения глобально лучшего значения
+        # более чем на tolerance, превышение max_time секунд или max_evaluations вычислений целевой функции.
+        # checkpoint_path - файл .npz, в который каждые checkpoint_every итераций сохраняется состояние роя;
+        # resume_from - файл контрольной точки, с которой нужно продолжить оптимизацию.
+        # Причина остановки сохраняется в self.stop_reason, число выполненных итераций - в self.iterations_completed.
+        num_dimensions = len(self.bounds)
+        # Лучшие значения и позиции на каждой итерации (позиции - только если save_iterations=True)
+        best_values_per_iteration = np.zeros(self.num_iterations)
+        best_positions_per_iteration = np.zeros((self.num_iterations, num_dimensions)) if save_iterations else None
+        iteration = 0
+        self.evaluations = 0  # Количество вычислений целевой функции
+        stagnant_iterations = 0  # Количество итераций подряд без улучшения глобально лучшего значения
+        if resume_from is not None:
+            state = self.load_checkpoint(resume_from)
+            iteration = int(state['iteration'])
+            if iteration > self.num_iterations:
+                raise ValueError("Контрольная точка содержит больше итераций, чем задано в num_iterations.")
+            self.evaluations = int(state['evaluations'])
+            stagnant_iterations = int(state['stagnant_iterations'])
+            best_values_per_iteration[:iteration] = state['best_values_per_iteration'][:iteration]
+            if save_iterations and 'best_positions_per_iteration' in state:
+                best_positions_per_iteration[:iteration] = state['best_positions_per_iteration'][:iteration]
+
+        def save_checkpoint():
+            history = {'best_values_per_iteration': best_values_per_iteration[:iteration]}
             if save_iterations:
+                history['best_positions_per_iteration'] = best_positions_per_iteration[:iteration]
+            self.save_checkpoint(checkpoint_path, iteration=iteration, evaluations=self.evaluations,
+                                 stagnant_iterations=stagnant_iterations, **history)
+
+        self.stop_reason = "num_iterations"
+        start_time = time.perf_counter()
+        with self.evaluator(n_workers, chunksize, seed, mp_context) as evaluate:
+            while iteration < self.num_iterations:
+                # Проверяем бюджеты времени и вычислений перед началом итерации
+                if max_evaluations is not None and self.evaluations + self.num_particles > max_evaluations:
+                    self.stop_reason = "max_evaluations"
+                    break
+                if max_time is not None and time.perf_counter() - start_time >= max_time:
+                    self.stop_reason = "max_time"
+                    break
+
+                previous_best_value = self.global_best_value
+                self._iterate(evaluate, iteration, print_iterations)
+                self.evaluations += self.num_particles
+
+                # Сохраняем текущее глобально лучшее значение и позицию для этой итерации
                 best_values_per_iteration[iteration] = self.global_best_value
-                best_positions_per_iteration[iteration] = np.copy(self.global_best_position)
-
-            # Обновляем скорость и позицию каждой частицы
-            for particle in self.swarm:
-                particle.update_velocity(self.global_best_position, self.inertia, self.cognitive, self.social)
-                particle.update_position(self.bounds)
-
-            # Выводим информацию о текущей итерации, если требуется
-            if print_iterations:
-                print(f"Iteration {iteration + 1}/{self.num_iterations}, Global Best Value: {self.global_best_value}")
+                if save_iterations:
+                    best_positions_per_iteration[iteration] = np.copy(self.global_best_position)
+                iteration += 1
+
+                if previous_best_value - self.global_best_value > tolerance:
+                    stagnant_iterations = 0
+                else:
+                    stagnant_iterations += 1
+                if checkpoint_path is not None and iteration % checkpoint_every == 0:
+                    save_checkpoint()
+                if patience is not None and stagnant_iterations >= patience:
+                    self.stop_reason = "stagnation"
+                    break
+
+        self.iterations_completed = iteration
+        if checkpoint_path is not None and iteration % checkpoint_every != 0:
+            save_checkpoint()  # Итоговое состояние, если оно не попало на период сохранения
 
         # Возвращаем лучшие значения и позиции для каждой итерации, если save_iterations=True
         if save_iterations:
-            self.best_values_per_iteration = best_values_per_iteration
-            self.best_positions_per_iteration = best_positions_per_iteration
+            self.best_values_per_iteration = best_values_per_iteration[:iteration]
+            self.best_positions_per_iteration = best_positions_per_iteration[:iteration]
             return self.global_best_position, self.global_best_value, self.best_values_per_iteration, self.best_positions_per_iteration
         else:
             return self.global_best_position, self.global_best_value, None, None
 
+    def evaluator(self, n_workers=None, chunksize=None, seed=None, mp_context=None):
+        # Вычислитель целевой функции для позиций всех частиц
+        return ParallelEvaluator(self.objective_function, n_workers, chunksize, seed, mp_context=mp_context)
+
+    def _iterate(self, evaluate, iteration, print_iterations=False):
+        # Одна итерация алгоритма: вычисляем значения целевой функции для текущих позиций всех частиц
+        values = evaluate(np.array([particle.position for particle in self.swarm]), iteration)
+
+        for particle, value in zip(self.swarm, values):
+            # Обновляем личный лучший результат частицы
+            if value < particle.best_value:
+                particle.best_value = value
+                particle.best_position = np.copy(particle.position)
+
+            # Обновляем глобально лучший результат
+            if value < self.global_best_value:
+                self.global_best_value = value
+                self.global_best_position = np.copy(particle.position)
+
+        # Обновляем скорость и позицию каждой частицы
+        for particle in self.swarm:
+            particle.update_velocity(self.global_best_position, self.inertia, self.cognitive, self.social)
+            particle.update_position(self.bounds)
+
+        # Выводим информацию о текущей итерации, если требуется
+        if print_iterations:
+            print(f"Iteration {iteration + 1}/{self.num_iterations}, Global Best Value: {self.global_best_value}")
+
+    def swarm_state(self):
+        # Полное состояние роя в виде массивов NumPy (для контрольных точек)
+        return {
+            'positions': np.array([particle.position for particle in self.swarm]),
+            'velocities': np.array([particle.velocity for particle in self.swarm]),
+            'best_positions': np.array([particle.best_position for particle in self.swarm]),
+            'best_values': np.array([particle.best_value for particle in self.swarm]),
+            'global_best_position': np.asarray(self.global_best_position),
+            'global_best_value': np.float64(self.global_best_value),
+            'rng_state': np.array(json.dumps(self.rng.bit_generator.state)),
+        }
+
+    def restore_swarm_state(self, state):
+        # Восстановление состояния роя, сохраненного swarm_state
+        if len(state['positions']) != len(self.swarm):
+            raise ValueError("Количество частиц в контрольной точке не совпадает с конфигурацией.")
+        for index, particle in enumerate(self.swarm):
+            particle.position = state['positions'][index].copy()
+            particle.velocity = state['velocities'][index].copy()
+            particle.best_position = state['best_positions'][index].copy()
+            particle.best_value = float(state['best_values'][index])
+        self.global_best_position = state['global_best_position'].copy()
+        self.global_best_value = float(state['global_best_value'])
+        self.rng.bit_generator.state = json.loads(str(state['rng_state']))
+
+    def save_checkpoint(self, path, **extra):
+        # Сохранение состояния роя и дополнительных массивов в сжатый файл .npz (атомарно, через временный файл)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'wb') as f:
+            np.savez_compressed(f, **self.swarm_state(), **extra)
+        os.replace(temporary_path, path)
+
+    def load_checkpoint(self, path):
+        # Загрузка контрольной точки: восстанавливает рой и возвращает все сохраненные массивы
+        with np.load(path) as data:
+            state = {key: data[key] for key in data.files}
+        self.restore_swarm_state(state)
+        return state
+
     def plot_pso_convergence(self, animated=False, gif_name="pso_convergence.gif"):
         """
         Строит график сходимости алгоритма PSO с контурным графиком целевой функции.
@@ -129,6 +244,9 @@ class ParticleSwarmOptimizer:
         - animated: если True, создает анимированный GIF, показывающий процесс сходимости с движением частиц.
         - gif_name: имя GIF-файла для сохранения, если animated=True.
         """
+        # matplotlib импортируется только при построении графика
+        import matplotlib.pyplot as plt
+        import matplotlib.animation as animation
         objective_function = self.objective_function
         iteration_values = self.best_values_per_iteration
         iteration_positions = self.best_positions_per_iteration
@@ -202,3 +320,267 @@ class ParticleSwarmOptimizer:
             plt.ylabel("Global Best Value")
             plt.grid(True)
             plt.show()
+
+
+class VectorizedParticleSwarmOptimizer(ParticleSwarmOptimizer):
+    """
+    Вариант ParticleSwarmOptimizer, хранящий рой в непрерывных массивах (частицы x измерения).
+
+    Позиции, скорости и личные лучшие результаты обновляются операциями над всем роем сразу,
+    а целевая функция может принимать всю матрицу позиций: batch_objective_function(X) -> значения.
+    Если пакетная функция не задана, objective_function вызывается для каждой частицы.
+    Результаты доступны через те же атрибуты, что и у ParticleSwarmOptimizer.
+    """
+
+    def __init__(self, objective_function=None, config_filename=None, batch_objective_function=None,
+                 config=None, seed=None):
+        if objective_function is None and batch_objective_function is None:
+            raise ValueError("Необходимо задать objective_function или batch_objective_function.")
+        self.batch_objective_function = batch_objective_function  # Целевая функция для матрицы позиций
+        if objective_function is None:
+            # Поточечная функция нужна для построения графиков - вычисляем её через пакетную
+            def objective_function(position):
+                return batch_objective_function(np.asarray(position, dtype=float)[None, :])[0]
+        # Рой хранится массивами, а не объектами частиц
+        super().__init__(None, objective_function, config_filename, config, seed)
+        # Количество частиц, перезапускаемых рядом с глобально лучшей позицией после каждой итерации
+        self.local_search_particles = self.config.get('local_search_particles', 0)
+
+    def init_swarm(self):
+        bounds = np.asarray(self.bounds, dtype=float)
+        self.lower_bounds = bounds[:, 0]  # Нижние границы по каждому измерению
+        self.upper_bounds = bounds[:, 1]  # Верхние границы по каждому измерению
+        shape = (self.num_particles, len(bounds))
+        # Рой: позиции, скорости и личные лучшие результаты всех частиц
+        self.positions = self.rng.uniform(self.lower_bounds, self.upper_bounds, shape)
+        self.velocities = np.zeros(shape)
+        self.best_positions = self.positions.copy()
+        self.best_values = np.full(self.num_particles, np.inf)
+        # Инициализируем глобально лучшую позицию и значение
+        self.global_best_position = self.positions[0].copy()
+        self.global_best_value = float('inf')
+
+    def evaluator(self, n_workers=None, chunksize=None, seed=None, mp_context=None):
+        # Вычислитель целевой функции роя: пакетная функция, если задана, иначе поточечная
+        if self.batch_objective_function is not None:
+            return ParallelEvaluator(self.batch_objective_function, n_workers, chunksize, seed, batched=True,
+                                     mp_context=mp_context)
+        return ParallelEvaluator(self.objective_function, n_workers, chunksize, seed, mp_context=mp_context)
+
+    def swarm_state(self):
+        return {
+            'positions': self.positions,
+            'velocities': self.velocities,
+            'best_positions': self.best_positions,
+            'best_values': self.best_values,
+            'global_best_position': np.asarray(self.global_best_position),
+            'global_best_value': np.float64(self.global_best_value),
+            'rng_state': np.array(json.dumps(self.rng.bit_generator.state)),
+        }
+
+    def restore_swarm_state(self, state):
+        if state['positions'].shape != self.positions.shape:
+            raise ValueError("Размеры роя в контрольной точке не совпадают с конфигурацией.")
+        self.positions = state['positions'].copy()
+        self.velocities = state['velocities'].copy()
+        self.best_positions = state['best_positions'].copy()
+        self.best_values = state['best_values'].copy()
+        self.global_best_position = state['global_best_position'].copy()
+        self.global_best_value = float(state['global_best_value'])
+        self.rng.bit_generator.state = json.loads(str(state['rng_state']))
+
+    def _iterate(self, evaluate, iteration, print_iterations=False):
+        # Одна итерация алгоритма для всего роя
+        # Вычисляем значения целевой функции сразу для всего роя
+        values = evaluate(self.positions, iteration)
+
+        # Обновляем личные лучшие результаты частиц
+        improved = values < self.best_values
+        self.best_values[improved] = values[improved]
+        self.best_positions[improved] = self.positions[improved]
+
+        # Обновляем глобально лучший результат
+        best_index = int(np.argmin(values))
+        if values[best_index] < self.global_best_value:
+            self.global_best_value = values[best_index]
+            self.global_best_position = self.positions[best_index].copy()
+
+        # Обновляем скорости и позиции всех частиц (на месте, без промежуточных массивов роя):
+        # v = inertia * v + cognitive * r1 * (pbest - x) + social * r2 * (gbest - x)
+        r1 = self.rng.random(self.positions.shape)
+        r2 = self.rng.random(self.positions.shape)
+        r1 *= self.cognitive
+        r1 *= self.best_positions - self.positions
+        r2 *= self.social
+        r2 *= self.global_best_position - self.positions
+        self.velocities *= self.inertia
+        self.velocities += r1
+        self.velocities += r2
+        self.positions += self.velocities
+        np.clip(self.positions, self.lower_bounds, self.upper_bounds, out=self.positions)
+        if self.local_search_particles:
+            self._restart_near_global_best()
+
+        # Выводим информацию о текущей итерации, если требуется
+        if print_iterations:
+            print(f"Iteration {iteration + 1}/{self.num_iterations}, Global Best Value: {self.global_best_value}")
+
+
+    def _restart_near_global_best(self):
+        # Частицы с худшими личными лучшими значениями переносятся в глобально лучшую позицию с одной случайно
+        # замененной координатой. Частица, нашедшая глобально лучшую позицию, получает нулевую скорость
+        # (её личный и глобальный лучшие совпадают) и стоит на месте, а остальные частицы стягиваются к ней
+        # по всем координатам сразу, поэтому без перезапусков ближайшая окрестность решения почти не исследуется.
+        restarted = np.argsort(self.best_values, kind='stable')[-self.local_search_particles:]
+        coordinates = self.rng.integers(self.positions.shape[1], size=len(restarted))
+        self.positions[restarted] = self.global_best_position
+        self.positions[restarted, coordinates] = self.rng.uniform(self.lower_bounds[coordinates],
+                                                                  self.upper_bounds[coordinates])
+
+
+class PSOCloudletScheduler(CloudletScheduler):
+    """
+    Планировщик, распределяющий задачи (cloudlets) по VM с помощью роя частиц (PSO).
+
+    Рой хранится матрицами (частицы x задачи): координата частицы для задачи - число из [0, 1),
+    задающее VM из списка VM, на которых задача помещается. Приспособленность (makespan плюс
+    взвешенный дисбаланс нагрузки VM) вычисляется сразу для всех частиц через np.bincount.
+    Одна из частиц инициализируется жадным распределением (задача - на наименее загруженную
+    подходящую VM), поэтому результат роя не хуже этой эвристики. После каждой итерации local_search_particles
+    частиц с худшими результатами перезапускаются рядом с лучшим распределением (одна задача на случайной VM),
+    поэтому рой улучшает и само лучшее распределение, а не только сходится к нему.
+    Найденное распределение затем выполняется в SimPy: каждая VM обрабатывает свою очередь задач.
+    """
+
+    def __init__(self, env, datacenter, num_particles=NUM_PARTICLES, num_iterations=NUM_ITERATIONS,
+                 inertia=INERTIA, cognitive=COGNITIVE, social=SOCIAL, imbalance_weight=0.1, seed=None,
+                 greedy_particle=True, local_search_particles=None, **scheduler_options):
+        # scheduler_options - параметры CloudletScheduler (например, verbosity, sink)
+        super().__init__(env, datacenter, **scheduler_options)
+        self.num_particles = num_particles  # Количество частиц в рое
+        self.num_iterations = num_iterations  # Количество итераций алгоритма
+        self.inertia = inertia  # Коэффициент инерции
+        self.cognitive = cognitive  # Коэффициент когнитивной составляющей
+        self.social = social  # Коэффициент социальной составляющей
+        self.imbalance_weight = imbalance_weight  # Вес дисбаланса нагрузки VM в целевой функции
+        self.rng = np.random.default_rng(seed)  # Генератор случайных чисел роя
+        self.greedy_particle = greedy_particle  # Инициализировать ли одну частицу жадным распределением
+        # Количество частиц, перезапускаемых рядом с лучшим распределением (одна задача переназначается
+        # на случайную VM) после каждой итерации; None - половина роя
+        self.local_search_particles = num_particles // 2 if local_search_particles is None else local_search_particles
+        self.mapping = None  # Найденное распределение: индекс VM в vm_list для каждой задачи
+        self.best_fitness = float('inf')  # Значение целевой функции найденного распределения
+        self.best_values_per_iteration = None  # Лучшее значение целевой функции на каждой итерации
+
+    def feasibility_matrix(self, cloudlets):
+        # Матрица (задачи x VM): True, если ресурсов VM достаточно для задачи (как в has_enough_resources)
+        cloudlet_pes = cloudlet_column(cloudlets, "pes_number")[:, None]
+        cloudlet_files = cloudlet_column(cloudlets, "file_size")[:, None]
+        cloudlet_outputs = cloudlet_column(cloudlets, "output_size")[:, None]
+        vm_pes = np.array([vm.pes_number for vm in self.vm_list], dtype=float)
+        vm_ram = np.array([vm.ram for vm in self.vm_list], dtype=float)
+        vm_size = np.array([vm.size for vm in self.vm_list], dtype=float)
+        return (vm_pes >= cloudlet_pes) & (vm_ram >= cloudlet_files) & (vm_size >= cloudlet_outputs)
+
+    def runtime_matrix(self, cloudlets):
+        # Матрица (задачи x VM) длительности выполнения задачи на VM: cloudlet.length для VM с моделью
+        # "exclusive", иначе длина / (MIPS x число PE), как в vm_execution.cloudlet_runtime
+        lengths = cloudlet_column(cloudlets, "length")
+        if all(vm.execution is None for vm in self.vm_list):
+            return np.broadcast_to(lengths[:, None], (len(cloudlets), len(self.vm_list)))
+        pes = cloudlet_column(cloudlets, "pes_number")[:, None]
+        vm_pes = np.array([vm.pes_number for vm in self.vm_list], dtype=float)
+        speed = np.array([1.0 if vm.execution is None else allocated_mips(vm) for vm in self.vm_list])
+        shared = np.array([vm.execution is not None for vm in self.vm_list])
+        return np.where(shared, lengths[:, None] / (speed * np.minimum(pes, vm_pes)), lengths[:, None])
+
+    def decode(self, positions, feasible_vms, feasible_counts):
+        # Перевод координат частиц (частицы x задачи) в индексы VM среди подходящих для каждой задачи
+        choice = np.minimum((positions * feasible_counts).astype(np.int64), feasible_counts - 1)
+        return feasible_vms[np.arange(feasible_vms.shape[0]), choice]
+
+    def encode(self, mapping, feasible_vms, feasible_counts):
+        # Обратное к decode преобразование: координаты в центрах интервалов выбранных VM
+        ranks = np.argsort(feasible_vms, axis=1)[np.arange(feasible_vms.shape[0]), mapping]
+        return (ranks + 0.5) / feasible_counts
+
+    def greedy_mapping(self, feasible, runtimes):
+        # Жадное распределение: каждая задача по порядку назначается на наименее загруженную подходящую VM
+        loads = np.zeros(feasible.shape[1])
+        mapping = np.empty(feasible.shape[0], dtype=np.int64)
+        for index in range(feasible.shape[0]):
+            vm_index = int(np.argmin(np.where(feasible[index], loads + runtimes[index], np.inf)))
+            mapping[index] = vm_index
+            loads[vm_index] += runtimes[index, vm_index]
+        return mapping
+
+    def fitness(self, mapping, runtimes):
+        # Целевая функция для всех частиц сразу: makespan + imbalance_weight * стандартное отклонение нагрузки VM
+        num_particles, num_cloudlets = mapping.shape
+        num_vms = runtimes.shape[1]
+        durations = runtimes[np.arange(num_cloudlets), mapping]
+        # Нагрузка каждой VM в каждой частице: суммирование длительностей по (частица, VM) одним bincount
+        offsets = (np.arange(num_particles) * num_vms)[:, None]
+        loads = np.bincount((mapping + offsets).ravel(), weights=durations.ravel(),
+                            minlength=num_particles * num_vms).reshape(num_particles, num_vms)
+        return loads.max(axis=1) + self.imbalance_weight * loads.std(axis=1)
+
+    def optimize(self, cloudlets):
+        # Поиск распределения задач по VM роем частиц
+        feasible = self.feasibility_matrix(cloudlets)
+        feasible_counts = feasible.sum(axis=1)
+        if (feasible_counts == 0).any():
+            raise ValueError("Для некоторых задач нет VM с достаточными ресурсами.")
+        # Индексы подходящих VM в начале каждой строки (устойчивая сортировка сохраняет порядок vm_list)
+        feasible_vms = np.argsort(~feasible, axis=1, kind='stable')
+        runtimes = self.runtime_matrix(cloudlets)
+
+        config = {
+            'num_particles': self.num_particles,
+            'num_iterations': self.num_iterations,
+            'inertia': self.inertia,
+            'cognitive': self.cognitive,
+            'social': self.social,
+            'bounds': np.tile([0.0, 1.0], (len(cloudlets), 1)),  # Координаты частиц лежат в [0, 1]
+            'local_search_particles': self.local_search_particles,
+        }
+        optimizer = VectorizedParticleSwarmOptimizer(
+            batch_objective_function=lambda positions: self.fitness(
+                self.decode(positions, feasible_vms, feasible_counts), runtimes),
+            config=config, seed=self.rng)
+        if self.greedy_particle:
+            optimizer.positions[0] = self.encode(self.greedy_mapping(feasible, runtimes), feasible_vms,
+                                                 feasible_counts)
+        best_position, best_value, self.best_values_per_iteration, _ = optimizer.optimize(save_iterations=True)
+
+        self.best_fitness = float(best_value)
+        self.mapping = self.decode(best_position[None, :], feasible_vms, feasible_counts)[0]
+        return self.mapping
+
+    def schedule_cloudlets(self, cloudlets):
+        if not isinstance(cloudlets, CloudletBatch):
+            cloudlets = list(cloudlets)
+        if not len(cloudlets):
+            self.finish()
+            return
+        mapping = self.optimize(cloudlets)
+
+        # Очередь задач каждой VM в порядке поступления
+        queues = [[] for _ in self.vm_list]
+        for cloudlet, vm_index in zip(cloudlets, mapping):
+            queues[vm_index].append(cloudlet)
+        processes = [self.env.process(self.run_vm_queue(vm, queue))
+                     for vm, queue in zip(self.vm_list, queues) if queue]
+        yield self.env.all_of(processes)
+
+        self.finish()  # Вывод итоговой сводки и сброс событий.
+
+    def print_summary(self):
+        print(f"PSO best fitness: {self.best_fitness}")
+        super().print_summary()
+
+    def run_vm_queue(self, vm, queue):
+        # Последовательное выполнение назначенных задач на одной VM
+        for cloudlet in queue:
+            self.checkout_vm(vm, cloudlet)
+            yield from self.execute_cloudlet(cloudlet)
@@ -0,0 +1,103 @@
+import math
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Целевая функция в процессе-обработчике (передается один раз при запуске процесса, а не с каждой порцией)
+_worker_objective = None
+_worker_batched = False
+
+
+def particle_rng(seed, iteration, particle):
+    # Генератор случайных чисел частицы: зависит только от (seed, итерация, номер частицы),
+    # поэтому результат не зависит от числа процессов и порядка вычислений
+    return np.random.default_rng([seed, iteration, particle])
+
+
+def evaluate_chunk(objective_function, positions, batched=False, seed=None, iteration=0, first_particle=0):
+    # Вычисление целевой функции для порции частиц
+    if batched:
+        return np.asarray(objective_function(positions), dtype=float)
+    if seed is None:
+        return np.array([objective_function(position) for position in positions], dtype=float)
+    return np.array([objective_function(position, particle_rng(seed, iteration, first_particle + index))
+                     for index, position in enumerate(positions)], dtype=float)
+
+
+def _init_worker(objective_function, batched):
+    global _worker_objective, _worker_batched
+    _worker_objective = objective_function
+    _worker_batched = batched
+
+
+def _evaluate_worker_chunk(positions, seed, iteration, first_particle):
+    return evaluate_chunk(_worker_objective, positions, _worker_batched, seed, iteration, first_particle)
+
+
+class ParallelEvaluator:
+    """
+    Вычисление целевой функции для всех частиц итерации в пуле процессов concurrent.futures.
+
+    Частицы делятся на порции по chunksize (по умолчанию - по одной порции на процесс).
+    Целевая функция передается в процессы один раз при их запуске; при методе запуска "fork"
+    она может быть и непереносимой через pickle (например, lambda), при "spawn" - должна быть
+    функцией уровня модуля или functools.partial от неё.
+    Если задан seed, функция вызывается как objective_function(position, rng), где rng -
+    генератор, однозначно определяемый (seed, итерация, номер частицы).
+    При n_workers=None или 1 вычисления выполняются в текущем процессе с тем же результатом.
+    """
+
+    def __init__(self, objective_function, n_workers=None, chunksize=None, seed=None, batched=False,
+                 mp_context=None):
+        if batched and seed is not None:
+            raise ValueError("seed поддерживается только для поточечной целевой функции.")
+        self.objective_function = objective_function  # Целевая функция
+        self.n_workers = n_workers  # Количество процессов (None или 1 - без пула)
+        self.chunksize = chunksize  # Количество частиц в одной порции
+        self.seed = seed  # Базовое зерно генераторов частиц
+        self.batched = batched  # Принимает ли функция матрицу позиций
+        self.mp_context = mp_context  # Контекст multiprocessing (например, multiprocessing.get_context("spawn"))
+        self.executor = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        # Запуск пула процессов
+        if self.executor is not None or not self.n_workers or self.n_workers <= 1:
+            return
+        context = self.mp_context if self.mp_context is not None else multiprocessing.get_context()
+        start_method = context.get_start_method()
+        if start_method != "fork":
+            try:
+                pickle.dumps(self.objective_function)
+            except (pickle.PicklingError, AttributeError, TypeError) as error:
+                raise TypeError(
+                    "Целевая функция должна быть сериализуема pickle для запуска процессов методом "
+                    f"'{start_method}': используйте функцию уровня модуля или functools.partial.") from error
+        self.executor = ProcessPoolExecutor(max_workers=self.n_workers, mp_context=self.mp_context,
+                                            initializer=_init_worker,
+                                            initargs=(self.objective_function, self.batched))
+
+    def close(self):
+        # Остановка пула процессов
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __call__(self, positions, iteration=0):
+        # Значения целевой функции для всех частиц (строк positions) на данной итерации
+        positions = np.asarray(positions, dtype=float)
+        if self.executor is None:
+            return evaluate_chunk(self.objective_function, positions, self.batched, self.seed, iteration)
+        chunksize = self.chunksize or max(1, math.ceil(len(positions) / self.n_workers))
+        starts = range(0, len(positions), chunksize)
+        futures = [self.executor.submit(_evaluate_worker_chunk, positions[start:start + chunksize], self.seed,
+                                        iteration, start)
+                   for start in starts]
+        return np.concatenate([future.result() for future in futures]) if futures else np.empty(0)
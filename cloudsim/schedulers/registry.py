@@ -0,0 +1,38 @@
+# Реестр планировщиков задач: имя -> класс планировщика, импортируемый при первом использовании
+import importlib
+
+# Имя -> ("модуль:класс" или класс, параметры конструктора по умолчанию)
+_SCHEDULERS = {
+    "FCFS": ("cloudsim.schedulers.fcfs:CloudletSchedulerFCFS", {}),
+    "SJF": ("cloudsim.schedulers.sjf:CloudletSchedulerSJF", {}),
+    "RoundRobin": ("cloudsim.schedulers.roundrobin:CloudletSchedulerRoundRobin", {}),
+    "PS": ("cloudsim.schedulers.pso.PS:PSOCloudletScheduler", {"num_particles": 10, "num_iterations": 20}),
+}
+
+
+def register_scheduler(name, scheduler, **defaults):
+    # Регистрация планировщика: класс (подкласс CloudletScheduler) или строка "модуль:класс" для отложенного
+    # импорта; defaults - параметры конструктора по умолчанию (переопределяются параметрами вызова)
+    _SCHEDULERS[name] = (scheduler, defaults)
+
+
+def scheduler_names():
+    return tuple(_SCHEDULERS)
+
+
+def get_scheduler(name):
+    # Класс планировщика по имени (модуль импортируется при первом обращении)
+    if name not in _SCHEDULERS:
+        raise ValueError(f"Неизвестный планировщик: {name}. Допустимые значения: {scheduler_names()}")
+    scheduler, defaults = _SCHEDULERS[name]
+    if isinstance(scheduler, str):
+        module, class_name = scheduler.split(":")
+        scheduler = getattr(importlib.import_module(module), class_name)
+        _SCHEDULERS[name] = (scheduler, defaults)
+    return scheduler
+
+
+def create_scheduler(name, env, datacenter, **options):
+    # Экземпляр планировщика с параметрами по умолчанию из реестра и параметрами options
+    scheduler = get_scheduler(name)
+    return scheduler(env, datacenter, **{**_SCHEDULERS[name][1], **options})
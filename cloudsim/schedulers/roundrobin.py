@@ -1,17 +1,62 @@
-from cloudsim.schedulers.cloudlet_scheduler import CloudletScheduler
+from cloudsim.schedulers.cloudlet_scheduler import CloudletScheduler, DISPATCH_EVENT, WaitingCloudlets
+from cloudsim.simulation.events import EVENT_COMPLETE, EVENT_SLICE_END, EVENT_SLICE_START, EVENT_WAIT
 from simpy.events import AnyOf
 
+# Режимы Round-Robin.
+RR_MODE_BATCHED = "batched"  # Процесс на каждую задачу, задачи запускаются группами по числу VM (исходный режим).
+RR_MODE_READY_QUEUE = "ready_queue"  # Очередь готовых задач и события окончания кванта на VM, без процессов на задачи.
+RR_MODES = (RR_MODE_BATCHED, RR_MODE_READY_QUEUE)
+
+
+class ReadyQueue(WaitingCloudlets):
+    """
+    Очередь готовых задач Round-Robin (FIFO) с выдачей первой задачи, которой хватает ресурсов VM.
+
+    Как и очередь ожидания режима "event", каждая задача хранится в ней один раз - в очереди своей сигнатуры
+    (набора классов ресурсов VM, на которых она помещается), поэтому повторные постановки в очередь после
+    каждого кванта не оставляют устаревших копий. Элемент очереди - список [задача, оставшаяся длина,
+    начало первого кванта, время передачи данных задачи по сети].
+    """
+
+    def __init__(self, vm_list):
+        super().__init__(self.resource_class(vm) for vm in vm_list)
+
+    @staticmethod
+    def resource_class(vm):
+        return vm.pes_number, vm.ram, vm.size
+
+    def append(self, entry):
+        # Постановка задачи в конец очереди
+        super().append(entry[0], entry)
+
+    def pop_for(self, vm):
+        # Первая в очереди задача, которой хватает ресурсов VM (или None)
+        return super().pop_for(self.resource_class(vm))
+
+
 class CloudletSchedulerRoundRobin(CloudletScheduler):
-    def __init__(self, env, datacenter, time_slice=2):
-        super().__init__(env, datacenter)
+    supports_execution_models = False  # Кванты выполняются на VM по одному
+
+    def __init__(self, env, datacenter, time_slice=2, rr_mode=RR_MODE_BATCHED, **scheduler_options):
+        # scheduler_options - параметры CloudletScheduler (dispatch, vm_selection, verbosity, sink, trace)
+        # rr_mode - "batched" (исходный режим) или "ready_queue" (очередь готовых задач; dispatch не используется)
+        super().__init__(env, datacenter, **scheduler_options)
+        if rr_mode not in RR_MODES:
+            raise ValueError(f"Неизвестный режим Round-Robin: {rr_mode}. Допустимые значения: {RR_MODES}")
+        self.rr_mode = rr_mode
+        self.supports_streaming = rr_mode == RR_MODE_READY_QUEUE  # Потоковый режим - только с очередью готовых задач.
         # Инициализация планировщика с окружением и датацентром, передается временной интервал (time_slice) для задач.
         self.time_slice = time_slice  # Время, в течение которого задача может выполняться на одном цикле (квант времени).
         self.total_execution_time = 0  # Общее время выполнения всех задач.
         self.total_turn_around_time = 0  # Время завершения выполнения всех задач.
-        self.max_utilization = {}  # Хранение максимальной загрузки ресурсов для каждой виртуальной машины (VM).
+        self.ready = ReadyQueue(self.vm_list)  # Очередь готовых задач (режим "ready_queue").
 
     def schedule_cloudlets(self, cloudlets):
+        if self.rr_mode == RR_MODE_READY_QUEUE:
+            self.schedule_ready_queue(cloudlets)
+            return
         remaining_cloudlets = list(cloudlets)  # Создание копии списка задач для обработки.
+        processes = []  # Процессы всех запущенных задач.
         while remaining_cloudlets:
             batch = remaining_cloudlets[:len(self.vm_list)]
             # Выбор подмножества задач по количеству доступных виртуальных машин (VM).
@@ -20,9 +65,138 @@ class CloudletSchedulerRoundRobin(CloudletScheduler):
 
             completion_events = [self.env.process(self.schedule_cloudlet(cloudlet)) for cloudlet in batch]
             # Запуск выполнения каждой задачи в отдельном процессе симуляции.
+            processes.extend(completion_events)
             yield AnyOf(self.env, completion_events)
             # Ожидание завершения любого процесса.
 
+        yield self.env.all_of(processes)
+        # Ожидание завершения всех задач.
+        self.finish()
+        # Вывод итоговой сводки и сброс событий.
+
+    def schedule_ready_queue(self, cloudlets):
+        # Round-Robin с очередью готовых задач: по окончании кванта задача возвращается в конец очереди,
+        # а освободившаяся VM передается первой готовой задаче, которой хватает её ресурсов.
+        # Кванты - таймауты SimPy с обратным вызовом, поэтому число событий равно числу квантов.
+        # Сводка выводится тоже обратным вызовом: после приема задач в симуляции нет процессов-генераторов,
+        # и приостановленную симуляцию можно сохранить в снимок (simulation.snapshot).
+        for cloudlet in cloudlets:
+            self.admit(cloudlet)
+        if self.running_vms or self.ready:
+            self.drained = self.env.event()
+            self.drained.callbacks.append(self.on_drained)
+        else:
+            self.finish()
+
+    def on_drained(self, event):
+        self.finish()
+        # Вывод итоговой сводки и сброс событий.
+
+    def admit(self, cloudlet):
+        if self.rr_mode != RR_MODE_READY_QUEUE:
+            return super().admit(cloudlet)
+        self.check_fits(cloudlet)
+        entry = [cloudlet, cloudlet.length, None, 0]
+        vm = self.find_free_vm(cloudlet) if self.free_vms else None
+        if vm is None:
+            # Задачи, не получившие VM, становятся в очередь в порядке поступления.
+            self.ready.append(entry)
+            return
+        self.checkout_vm(vm, cloudlet)
+        self.start_slice(vm, entry)
+
+    def drain(self):
+        if self.rr_mode != RR_MODE_READY_QUEUE:
+            yield from super().drain()
+            return
+        if self.running_vms or self.ready:
+            self.drained = self.env.event()
+            yield self.drained
+
+    def start_slice(self, vm, entry):
+        # Запуск кванта задачи на VM, уже изъятой из списка свободных.
+        cloudlet = entry[0]
+        self.metrics.start(vm, cloudlet, self.env.now)
+        if entry[2] is None:
+            entry[2] = self.env.now
+            if self.network is not None:
+                # Перед первым квантом на хост VM загружаются входные данные задачи (VM занята).
+                staged = self.network.stage_in(vm, cloudlet)
+                staged.callbacks.append(lambda _: self.staged(vm, entry, entry[2], self.run_slice))
+                return
+        self.run_slice(vm, entry)
+
+    def run_slice(self, vm, entry):
+        cloudlet, remaining = entry[0], entry[1]
+        if self.log_events:
+            self.sink.emit(self.env.now, EVENT_SLICE_START, cloudlet.cloudlet_id, vm.get_id())
+        execution_time = min(self.time_slice, remaining)
+        expiry = self.env.timeout(execution_time, (vm, entry, self.env.now, execution_time))
+        expiry.callbacks.append(self.end_slice)
+
+    def end_slice(self, expiry):
+        # Окончание кванта: учет выполненного времени, возврат задачи в очередь и передача VM следующей задаче.
+        vm, entry, start_time, execution_time = expiry.value
+        cloudlet = entry[0]
+        now = self.env.now
+        entry[1] -= execution_time
+        self.total_execution_time += execution_time
+        if self.trace is not None:
+            self.trace.record_slice(cloudlet, vm, start_time, now)
+        if entry[1] > 0:
+            self.metrics.stop(vm, cloudlet, now)
+            if self.log_events:
+                self.sink.emit(now, EVENT_SLICE_END, cloudlet.cloudlet_id, vm.get_id())
+            self.ready.append(entry)
+            self.next_slice(vm)
+        elif self.network is not None:
+            # После последнего кванта выходные данные выгружаются в хранилище, затем задача завершается.
+            staged = self.network.stage_out(vm, cloudlet)
+            staged.callbacks.append(lambda _: self.staged(vm, entry, now, self.complete_entry))
+        else:
+            self.complete_entry(vm, entry)
+
+    def staged(self, vm, entry, started, proceed):
+        # Окончание передачи данных задачи: учет её длительности и продолжение выполнения.
+        entry[3] += self.env.now - started
+        proceed(vm, entry)
+
+    def complete_entry(self, vm, entry):
+        # Завершение задачи после последнего кванта (и выгрузки выходных данных).
+        cloudlet = entry[0]
+        now = self.env.now
+        self.metrics.stop(vm, cloudlet, now)
+        cloudlet.finish_time = now
+        if self.trace is not None:
+            self.trace.record_cloudlet(cloudlet, vm, entry[2], now)
+        turnaround_time = now - cloudlet.submit_time
+        # Время ожидания - время, в течение которого задача не выполнялась и не передавала данные.
+        wait_time = turnaround_time - cloudlet.length - entry[3]
+        self.metrics.complete(vm, wait_time, turnaround_time)
+        if self.log_events:
+            # Последний квант задачи отмечается событием завершения задачи.
+            self.sink.emit(now, EVENT_COMPLETE, cloudlet.cloudlet_id, vm.get_id(),
+                           {"wait_time": wait_time, "turnaround_time": turnaround_time})
+        self.next_slice(vm)
+
+    def next_slice(self, vm):
+        # Передача освободившейся VM первой готовой задаче, которой хватает её ресурсов.
+        self.running_vms.remove(vm)
+        waiting = self.ready.pop_for(vm)
+        if waiting is not None:
+            self.assign_vm(vm, waiting[0])
+            self.start_slice(vm, waiting)
+        else:
+            self.free_vms.append(vm)
+            if not self.running_vms and not self.ready and self.drained is not None:
+                self.drained.succeed()
+
+    @property
+    def polls_free_vms(self):
+        return self.rr_mode == RR_MODE_BATCHED and super().polls_free_vms
+
+    def queue_length(self):
+        return super().queue_length() + len(self.ready)
 
     def print_summary(self):
         # Вывод суммарных данных о времени выполнения и загрузке каждой виртуальной машины.
@@ -35,52 +209,74 @@ class CloudletSchedulerRoundRobin(CloudletScheduler):
 
     def schedule_cloudlet(self, cloudlet):
         # Функция планирования и выполнения одной задачи (cloudlet).
+        self.check_fits(cloudlet)
+        first_start_time = None  # Время начала первого кванта задачи.
+        service_time = 0  # Время, в течение которого задача выполнялась
+        polling = False  # Опрашивает ли задача свободные VM (режим "polling")
         while cloudlet.length > 0:
             # Пока длина задачи (длительность выполнения) больше 0:
-            for selected_vm in self.free_vms[:]:
-                # Поиск свободной виртуальной машины.
-                if self.has_enough_resources(selected_vm, cloudlet):
-                    # Проверка, достаточно ли ресурсов на данной VM для выполнения задачи.
-                    self.free_vms.remove(selected_vm)
-                    # Удаление VM из списка свободных.
-                    cloudlet.set_vm(selected_vm)
-                    # Назначение задачи на выбранную VM.
-                    self.running_vms.append(selected_vm)
-                    # Добавление VM в список выполняющих задачи.
-                    self.max_utilization[selected_vm.get_id()] = max(
-                        self.max_utilization.get(selected_vm.get_id(), [0, 0, 0]),
-                        # Обновление максимальной загрузки ресурсов на этой VM.
-                        self.get_utilization(selected_vm, cloudlet)
-                    )
-
-                    print(
-                        f"Cloudlet {cloudlet.cloudlet_id} starts execution on VM {cloudlet.get_vm().get_id()} at {self.env.now}"
-                    )
-                    # Вывод информации о начале выполнения задачи.
-
-                    execution_time = min(self.time_slice, cloudlet.length)
-                    # Определение времени выполнения за один цикл (ограничено `time_slice`).
-                    yield self.env.timeout(execution_time)
-                    # Ожидание завершения выполнения за выделенное время.
-                    cloudlet.length -= execution_time
-                    # Уменьшение оставшегося времени задачи.
-
-                    print(
-                        f"Cloudlet {cloudlet.cloudlet_id} completes execution on VM {cloudlet.get_vm().get_id()} at {self.env.now}"
-                    )
-                    # Вывод информации о завершении выполнения задачи.
-
-                    self.running_vms.remove(selected_vm)
-                    # Удаление VM из списка выполняющих задачи.
-                    self.free_vms.append(selected_vm)
-                    # Возвращение VM в список свободных.
-
-                    self.total_execution_time += execution_time
-                    # Обновление общего времени выполнения.
-                    #self.print_summary()
-                    # Печать сводки.
-                    break
+            if self.dispatch == DISPATCH_EVENT:
+                # Ожидание в очереди до освобождения подходящей VM, без опроса каждую единицу времени.
+                selected_vm = yield from self.acquire_vm(cloudlet)
             else:
-                print(f"No available VM for Cloudlet {cloudlet.cloudlet_id} at {self.env.now}, waiting...")
-                yield self.env.timeout(1)
-                # Если нет доступных ресурсов, ждем 1 единицу времени.
+                # Поиск свободной виртуальной машины, у которой достаточно ресурсов для выполнения задачи.
+                selected_vm = self.find_free_vm(cloudlet)
+                if selected_vm is None:
+                    if self.log_events:
+                        self.sink.emit(self.env.now, EVENT_WAIT, cloudlet.cloudlet_id, None)
+                    if not polling:
+                        polling = True
+                        self.polling_cloudlets += 1
+                    yield self.env.timeout(1)
+                    # Если нет доступных ресурсов, ждем 1 единицу времени.
+                    continue
+                if polling:
+                    polling = False
+                    self.polling_cloudlets -= 1
+                self.checkout_vm(selected_vm, cloudlet)
+                # Удаление VM из списка свободных, назначение задачи и обновление максимальной загрузки.
+
+            self.metrics.start(selected_vm, cloudlet, self.env.now)
+            if first_start_time is None:
+                first_start_time = self.env.now
+                if self.network is not None:
+                    # Перед первым квантом на хост VM загружаются входные данные задачи.
+                    yield self.network.stage_in(selected_vm, cloudlet)
+                    service_time += self.env.now - first_start_time
+
+            if self.log_events:
+                self.sink.emit(self.env.now, EVENT_SLICE_START, cloudlet.cloudlet_id, selected_vm.get_id())
+            # Запись события о начале выполнения кванта задачи.
+            slice_start_time = self.env.now
+
+            execution_time = min(self.time_slice, cloudlet.length)
+            # Определение времени выполнения за один цикл (ограничено `time_slice`).
+            yield self.env.timeout(execution_time)
+            # Ожидание завершения выполнения за выделенное время.
+            cloudlet.length -= execution_time
+            # Уменьшение оставшегося времени задачи.
+            service_time += execution_time
+
+            if self.log_events:
+                self.sink.emit(self.env.now, EVENT_SLICE_END, cloudlet.cloudlet_id, selected_vm.get_id())
+            # Запись события о завершении кванта задачи.
+            if self.trace is not None:
+                self.trace.record_slice(cloudlet, selected_vm, slice_start_time, self.env.now)
+            if cloudlet.length <= 0 and self.network is not None:
+                # После последнего кванта выходные данные выгружаются в хранилище.
+                stage_out_time = self.env.now
+                yield self.network.stage_out(selected_vm, cloudlet)
+                service_time += self.env.now - stage_out_time
+            self.metrics.stop(selected_vm, cloudlet, self.env.now)
+            if cloudlet.length <= 0:
+                cloudlet.finish_time = self.env.now
+                turnaround_time = self.env.now - cloudlet.submit_time
+                self.metrics.complete(selected_vm, turnaround_time - service_time, turnaround_time)
+                if self.trace is not None:
+                    self.trace.record_cloudlet(cloudlet, selected_vm, first_start_time, self.env.now)
+
+            self.release_vm(selected_vm)
+            # Возвращение VM в список свободных (или передача следующей ожидающей задаче).
+
+            self.total_execution_time += execution_time
+            # Обновление общего времени выполнения.
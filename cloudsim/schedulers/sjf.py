@@ -1,14 +1,24 @@
+from cloudsim.entities.cloudlet_batch import CloudletBatch
 from cloudsim.schedulers.cloudlet_scheduler import CloudletScheduler
 
 class CloudletSchedulerSJF(CloudletScheduler):
+    supports_fast_engine = True
+    supports_streaming = True
+    prioritized_waiting = True
 
-    def schedule_cloudlets(self, cloudlets):
+    def waiting_priority(self, cloudlet):
+        # Очередь ожидания упорядочена по длине задачи (при равной длине - по времени постановки).
+        return cloudlet.length
+
+    def order_cloudlets(self, cloudlets):
         # Sort cloudlets based on their lengths (SJF)
-        sorted_cloudlets = sorted(cloudlets, key=lambda x: x.length)
+        if isinstance(cloudlets, CloudletBatch):
+            return cloudlets.views(cloudlets.argsort("length"))
+        return sorted(cloudlets, key=lambda x: x.length)
+
+    def schedule_cloudlets(self, cloudlets):
+        sorted_cloudlets = self.order_cloudlets(cloudlets)
         processes = [self.env.process(self.schedule_cloudlet(cloudlet)) for cloudlet in sorted_cloudlets]
         yield self.env.all_of(processes)
 
-        print(f"Total Execution Time: {self.total_execution_time}")
-
-        for vm in self.max_utilization:
-            print(f"\nVM {vm} utilization:\n {self.max_utilization[vm][0] * 100}% PEs\n, {self.max_utilization[vm][1] * 100}% RAM\n, {self.max_utilization[vm][2] *100}% Storage")
\ No newline at end of file
+        self.finish()  # Вывод итоговой сводки и сброс событий.
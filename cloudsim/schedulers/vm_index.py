@@ -0,0 +1,139 @@
+from bisect import bisect_left, insort
+
+
+class FreeVmIndex:
+    """
+    Индекс свободных виртуальных машин, сгруппированных по классам ресурсов (PEs, RAM, Storage).
+
+    Классы хранятся в отсортированных корзинах по числу PE, внутри корзины - по (RAM, Storage).
+    Для каждой корзины хранится дерево отрезков с максимумом Storage классов, поэтому при поиске наименьшей
+    подходящей VM (best-fit) первая корзина и первый класс с достаточной RAM находятся бинарным поиском,
+    а первый следующий за ним класс с достаточным Storage - спуском по дереву за O(log k). Корзины по числу PE
+    просматриваются по порядку, пока в одной из них не найдется подходящий класс: поиск стоит O(b·log k),
+    где b - число просмотренных корзин (не больше числа различных значений PE среди свободных классов),
+    k - число классов в корзине. Внутри класса подходит любая VM "exclusive" (O(1)); с predicate
+    (модели "space_shared" и "time_shared") VM класса проверяются по очереди, пока одна не подойдет, а класс,
+    в котором не подошла ни одна VM, стоит еще одного спуска по дереву.
+    Изъятие и возврат VM - O(1) внутри класса (плюс O(k), когда класс становится пустым/непустым).
+    По интерфейсу (append/remove/итерация/len) индекс заменяет обычный список свободных VM.
+    """
+
+    def __init__(self, vms=()):
+        self._classes = {}  # (pes, ram, size) -> {id VM: VM} свободные VM данного класса
+        self._buckets = {}  # pes -> отсортированный список (ram, size) непустых классов
+        self._size_trees = {}  # pes -> дерево отрезков (список) с максимумом size классов корзины
+        self._pes_keys = []  # Отсортированный список значений PE, для которых есть непустые классы
+        self._size = 0  # Общее количество свободных VM в индексе
+        for vm in vms:
+            self.add(vm)
+
+    @staticmethod
+    def resource_class(vm):
+        # Класс ресурсов VM: количество PE, объем RAM и хранилища.
+        return vm.pes_number, vm.ram, vm.size
+
+    def add(self, vm):
+        # Возврат VM в индекс свободных.
+        key = self.resource_class(vm)
+        vms = self._classes.get(key)
+        if vms is None:
+            vms = self._classes[key] = {}
+        if not vms:
+            # Класс становится непустым - регистрируем его в корзине по числу PE.
+            pes, ram, size = key
+            bucket = self._buckets.get(pes)
+            if bucket is None:
+                bucket = self._buckets[pes] = []
+                insort(self._pes_keys, pes)
+            insort(bucket, (ram, size))
+            self._update_size_tree(pes)
+        vms[vm.get_id()] = vm
+        self._size += 1
+
+    def remove(self, vm):
+        # Изъятие конкретной VM из индекса свободных.
+        key = self.resource_class(vm)
+        vms = self._classes.get(key)
+        if not vms or vms.pop(vm.get_id(), None) is None:
+            raise ValueError("VM отсутствует в индексе свободных VM.")
+        self._size -= 1
+        if not vms:
+            # Класс опустел - удаляем его из корзины, а пустую корзину - из списка PE.
+            pes, ram, size = key
+            bucket = self._buckets[pes]
+            del bucket[bisect_left(bucket, (ram, size))]
+            if not bucket:
+                del self._buckets[pes]
+                del self._size_trees[pes]
+                del self._pes_keys[bisect_left(self._pes_keys, pes)]
+            else:
+                self._update_size_tree(pes)
+
+    def _update_size_tree(self, pes):
+        # Перестроение дерева максимумов size корзины (только при появлении или исчезновении класса).
+        # Листья - классы корзины в позициях leaves..2*leaves-1, лишние листья заполнены -inf.
+        bucket = self._buckets[pes]
+        leaves = 1
+        while leaves < len(bucket):
+            leaves *= 2
+        tree = [float("-inf")] * (2 * leaves)
+        tree[leaves:leaves + len(bucket)] = [size for _, size in bucket]
+        for node in range(leaves - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self._size_trees[pes] = tree
+
+    @staticmethod
+    def _first_fitting(tree, start, size):
+        # Первый индекс класса не меньше start, у которого size не меньше требуемого (или None), за O(log k)
+        leaves = len(tree) // 2
+        node = start + leaves
+        if tree[node] < size:
+            while True:
+                # Переход к следующему справа поддереву того же уровня
+                while node & 1:
+                    if node == 1:
+                        return None
+                    node >>= 1
+                node += 1
+                if tree[node] >= size:
+                    break
+            while node < leaves:
+                node = 2 * node if tree[2 * node] >= size else 2 * node + 1
+        return node - leaves
+
+    # Совместимость с интерфейсом списка свободных VM.
+    append = add
+
+    def find(self, pes_number, ram, size, predicate=None):
+        # Поиск наименьшей свободной VM (по PE, затем по RAM и Storage), у которой
+        # pes_number, ram и size не меньше требуемых. predicate - дополнительная проверка VM.
+        for pes_index in range(bisect_left(self._pes_keys, pes_number), len(self._pes_keys)):
+            pes = self._pes_keys[pes_index]
+            bucket = self._buckets[pes]
+            tree = self._size_trees[pes]
+            ram_index = bisect_left(bucket, (ram,))
+            while ram_index < len(bucket):
+                ram_index = self._first_fitting(tree, ram_index, size)
+                if ram_index is None:
+                    break  # Ни у одного из оставшихся классов корзины не хватает Storage
+                class_ram, class_size = bucket[ram_index]
+                vms = self._classes[(pes, class_ram, class_size)]
+                # Внутри класса берем VM, освобожденную последней (O(1)).
+                for vm in reversed(vms.values()):
+                    if predicate is None or predicate(vm):
+                        return vm
+                ram_index += 1
+        return None
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        # Перебор свободных VM в порядке возрастания класса ресурсов.
+        for pes in self._pes_keys:
+            for ram, size in self._buckets[pes]:
+                yield from self._classes[(pes, ram, size)].values()
+
+    def __contains__(self, vm):
+        vms = self._classes.get(self.resource_class(vm))
+        return bool(vms) and vm.get_id() in vms
@@ -0,0 +1,75 @@
+# Потоки поступления задач для CloudletExecution в потоковом режиме: задачи создаются блоками по мере чтения
+# итератора, поэтому в памяти находятся только текущий блок и еще не завершенные задачи
+from pathlib import Path
+import numpy as np
+from cloudsim.entities.cloudlet import Cloudlet
+from cloudsim.entities.cloudlet_batch import DEFAULT_GENERATOR_CONFIG, generate_column
+
+# Столбцы задачи в файлах трасс поступления
+ARRIVAL_COLUMNS = ("submit_time", "length", "pes_number", "file_size", "output_size")
+
+
+def _cloudlets(columns):
+    # Объекты Cloudlet из блока столбцов (словарь имя -> массив)
+    for submit_time, length, pes_number, file_size, output_size in zip(
+            *(np.asarray(columns[name]).tolist() for name in ARRIVAL_COLUMNS)):
+        cloudlet = Cloudlet(length, pes_number, file_size, output_size)
+        cloudlet.submit_time = submit_time
+        yield cloudlet
+
+
+def poisson_arrivals(rate, count=None, until=None, seed=None, config=None, start=0.0, chunk_size=65536):
+    """
+    Пуассоновский поток задач: интервалы между поступлениями распределены экспоненциально со средним 1 / rate.
+    Поток заканчивается после count задач или на момент until (если не задано ни то, ни другое - бесконечен).
+    config - распределения атрибутов задач, как в CloudletBatch.generate.
+    """
+    if rate <= 0 or chunk_size <= 0:
+        raise ValueError("rate и chunk_size должны быть положительными")
+    rng = np.random.default_rng(seed)
+    config = {**DEFAULT_GENERATOR_CONFIG, **(config or {})}
+    time = start
+    remaining = count
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        columns = {"submit_time": time + np.cumsum(rng.exponential(1 / rate, size))}
+        time = columns["submit_time"][-1]
+        for name in DEFAULT_GENERATOR_CONFIG:
+            columns[name] = generate_column(rng, config[name], size)
+        if until is not None and time > until:
+            # Последний блок обрезается по моменту until
+            size = int(np.searchsorted(columns["submit_time"], until, side="right"))
+            columns = {name: column[:size] for name, column in columns.items()}
+            yield from _cloudlets(columns)
+            return
+        yield from _cloudlets(columns)
+        if remaining is not None:
+            remaining -= size
+
+
+def _read_chunks(path, chunk_size):
+    # Блоки столбцов файла CSV или Parquet (по расширению), не более chunk_size строк в блоке
+    if Path(path).suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=list(ARRIVAL_COLUMNS)):
+            yield {name: batch.column(name).to_numpy() for name in ARRIVAL_COLUMNS}
+    else:
+        import pandas as pd
+        for frame in pd.read_csv(path, usecols=list(ARRIVAL_COLUMNS), chunksize=chunk_size):
+            yield {name: frame[name].to_numpy() for name in ARRIVAL_COLUMNS}
+
+
+def trace_arrivals(path, chunk_size=65536):
+    """
+    Воспроизведение записанного потока задач из файла CSV или Parquet со столбцами ARRIVAL_COLUMNS.
+    Файл читается блоками по chunk_size строк; строки должны быть упорядочены по submit_time.
+    """
+    previous = -np.inf
+    for columns in _read_chunks(path, chunk_size):
+        submit_time = columns["submit_time"]
+        if len(submit_time) == 0:
+            continue
+        if submit_time[0] < previous or np.any(np.diff(submit_time) < 0):
+            raise ValueError(f"Задачи в {path} не упорядочены по submit_time")
+        previous = submit_time[-1]
+        yield from _cloudlets(columns)
@@ -1,46 +1,135 @@
 #simulate cloud load using datacenter and simpy tool
 import simpy
-from cloudsim.schedulers.fcfs import CloudletSchedulerFCFS
-from cloudsim.schedulers.sjf import CloudletSchedulerSJF
-from cloudsim.schedulers.roundrobin import CloudletSchedulerRoundRobin
-from cloudsim.schedulers.pso.PS import PSOCloudletScheduler  # Импортируем класс PSOCloudletScheduler
-import pandas as pd
+from cloudsim.schedulers.cloudlet_scheduler import DISPATCH_POLLING, VM_SELECTION_FIRST_FIT
+from cloudsim.schedulers.registry import create_scheduler
+from cloudsim.schedulers.fast_engine import ENGINE_FAST, ENGINE_SIMPY, ENGINES, ListSchedulingEngine
+from cloudsim.simulation.events import VERBOSITY_EVENT, VERBOSITY_LEVELS, verbosity_level
+from cloudsim.simulation.profiling import SimulationProfiler
+from cloudsim.simulation.trace import TraceRecorder
+from cloudsim.entities.entity import entity_uuid
 
 
 class CloudletExecution:
-    def __init__(self, schedular, cloudlet_list, datacenter):
+    def __init__(self, schedular, cloudlet_list, datacenter, dispatch=DISPATCH_POLLING,
+                 vm_selection=VM_SELECTION_FIRST_FIT, verbosity=VERBOSITY_EVENT, sink=None, trace=None,
+                 engine=ENGINE_SIMPY, scheduler_options=None, streaming=None, profile=None):
+        # dispatch: "polling" - ожидающие задачи опрашивают свободные VM каждую единицу времени,
+        # "event" - ожидающие задачи пробуждаются только при освобождении VM.
+        # vm_selection: "first_fit" - первая подходящая свободная VM, "best_fit" - наименьшая подходящая VM.
+        # verbosity: "off" - без вывода, "summary" - только итоговая сводка, "event" - сводка и события задач.
+        # sink: приемник событий задач (EventSink); по умолчанию события выводятся в stdout.
+        # trace: колоночная трасса выполнения задач (TraceRecorder); True - создать новую.
+        # engine: "simpy" - процессы SimPy, "fast" - расчет расписания без SimPy (только FCFS и SJF).
+        # scheduler_options: дополнительные параметры конструктора планировщика
+        # (например {"time_slice": 4, "rr_mode": "ready_queue"} для Round-Robin).
+        # streaming: задачи поступают из итератора по мере хода времени симуляции (по submit_time);
+        # None - потоковый режим, если cloudlet_list - итератор (например, генератор из simulation.arrivals).
+        # profile: счетчики выполнения (SimulationProfiler); True - создать профилировщик с параметрами по умолчанию.
+        if engine not in ENGINES:
+            raise ValueError(f"Неизвестный движок: {engine}. Допустимые значения: {ENGINES}")
+        if streaming is None:
+            streaming = iter(cloudlet_list) is cloudlet_list
+        if streaming and engine == ENGINE_FAST:
+            raise ValueError(f"Движок \"{ENGINE_FAST}\" не поддерживает потоковое поступление задач")
         self.cloudlet_list = cloudlet_list
+        self.streaming = streaming
         self.scheduler = schedular
         self.env = simpy.Environment()
         self.df_summary = []
-        if self.scheduler == "FCFS":
-            self.scheduler_instance = CloudletSchedulerFCFS(self.env, datacenter)
-        if self.scheduler == "SJF":
-            self.scheduler_instance = CloudletSchedulerSJF(self.env, datacenter)
-        if self.scheduler == "RoundRobin":
-            self.scheduler_instance = CloudletSchedulerRoundRobin(self.env, datacenter)
-        if self.scheduler == "PS":
-            self.scheduler_instance = PSOCloudletScheduler(self.env, datacenter, 10, 20)
+        self.verbosity = verbosity
+        self.engine = engine
+        self.makespan = None  # Время завершения последней задачи (после execute)
+        self.started = False  # Запущены ли процессы планирования (start)
+        if trace is True:
+            trace = TraceRecorder()
+        self.trace = trace
+        scheduler_options = {"dispatch": dispatch, "vm_selection": vm_selection, "verbosity": verbosity, "sink": sink,
+                             "trace": trace, **(scheduler_options or {})}
+        # Планировщик по имени из реестра (cloudsim.schedulers.registry); модуль импортируется при первом запуске
+        self.scheduler_instance = create_scheduler(self.scheduler, self.env, datacenter, **scheduler_options)
+        if engine == ENGINE_FAST and not self.scheduler_instance.supports_fast_engine:
+            raise ValueError(f"Планировщик {self.scheduler} не поддерживает движок \"{ENGINE_FAST}\"")
+        if streaming and not self.scheduler_instance.supports_streaming:
+            raise ValueError(f"Планировщик {self.scheduler} не поддерживает потоковое поступление задач")
+        if profile is True:
+            profile = SimulationProfiler()
+        self.profiler = profile
+        if profile is not None:
+            profile.attach(self.scheduler_instance, self.env)
+
+    def start(self):
+        # Начало симуляции (однократно): вывод, запуск профилировщика и процессов планирования SimPy
+        if self.started:
+            return
+        self.started = True
+        if verbosity_level(self.verbosity) >= VERBOSITY_LEVELS["summary"]:
+            print(f"Using {self.scheduler} scheduler \n")
+        if self.profiler is not None:
+            self.profiler.start()
+        if self.engine == ENGINE_FAST:
+            return
+        if self.streaming:
+            self.env.process(self.scheduler_instance.schedule_stream(self.cloudlet_list))
+        else:
+            self.env.process(self.scheduler_instance.schedule_cloudlets(self.cloudlet_list))
+
+    def run_until(self, until):
+        # Выполнение событий симуляции до момента until (не включая) и пауза: приостановленную симуляцию можно
+        # сохранить в снимок или разветвить (simulation.snapshot), execute() продолжает её до конца.
+        # Шаги выполняются напрямую: env.run(until) оставил бы в очереди событие остановки и сдвинул часы.
+        if self.engine == ENGINE_FAST:
+            raise ValueError(f"Движок \"{ENGINE_FAST}\" не поддерживает приостановку симуляции")
+        self.start()
+        env = self.env
+        while env.peek() < until:
+            env.step()
 
     def execute(self):
-        print(f"Using {self.scheduler} scheduler \n")
-        self.env.process(self.scheduler_instance.schedule_cloudlets(self.cloudlet_list))
-        self.env.run()
+        self.start()
+        if self.engine == ENGINE_FAST:
+            self.makespan = ListSchedulingEngine(self.scheduler_instance).run(self.cloudlet_list)
+        else:
+            self.env.run()
+            self.makespan = self.env.now
+        self.scheduler_instance.metrics.finish(self.makespan)
+        if self.profiler is not None:
+            self.profiler.stop(self.makespan)
         #self.scheduler_instance.print_summary()
 
-    def create_summary_dataset(self):
+    def create_summary_dataset(self, uuid_ids=False, level="vm"):
+        # uuid_ids - заменить целочисленные идентификаторы VM (и хостов) на UUID
+        # level - "vm" (строка на VM), "host" (строка на хост) или "run" (одна строка на всю симуляцию);
+        # взвешенные по времени метрики берутся из накопителей планировщика (UtilizationMetrics)
+        import pandas as pd
+        metrics = self.scheduler_instance.metrics
+        if level == "run":
+            return pd.DataFrame([{"scheduler": self.scheduler,
+                                  "total_execution_time": self.scheduler_instance.total_execution_time,
+                                  **metrics.run_summary()}])
+        if level == "host":
+            return pd.DataFrame([{"scheduler": self.scheduler,
+                                  "host_id": entity_uuid(host_id) if uuid_ids else host_id,
+                                  **metrics.host_summary(host_id)} for host_id in metrics.hosts])
+        if level != "vm":
+            raise ValueError(f"Неизвестный уровень сводки: {level}. Допустимые значения: ('vm', 'host', 'run')")
+
         # Инициализация списка для хранения данных
         data = []
 
         # Проход по каждой виртуальной машине и сбор данных
+        hosts = {vm.get_id(): vm.host for vm in self.scheduler_instance.vm_list}
         for vm_id, utilization in self.scheduler_instance.max_utilization.items():
+            host = hosts.get(vm_id)
+            host_id = None if host is None else host.host_id
             data.append({
                 "scheduler": self.scheduler,
                 "total_execution_time": self.scheduler_instance.total_execution_time,
-                "vm_id": vm_id,
+                "vm_id": entity_uuid(vm_id) if uuid_ids else vm_id,
+                "host_id": entity_uuid(host_id) if uuid_ids and host_id is not None else host_id,
                 "PE_usage": utilization[0] * 100,  # Процент использования PEs
                 "RAM_usage": utilization[1] * 100,  # Процент использования RAM
-                "Storage_usage": utilization[2] * 100  # Процент использования Storage
+                "Storage_usage": utilization[2] * 100,  # Процент использования Storage
+                **metrics.vm_summary(vm_id),
             })
 
         # Создание DataFrame
@@ -48,3 +137,15 @@ class CloudletExecution:
 
         # Возвращение DataFrame для дальнейшей обработки
         return df
+
+    def profile_report(self):
+        # Счетчики выполнения симуляции (см. SimulationProfiler.report)
+        if self.profiler is None:
+            raise ValueError("Профилирование не включено: передайте profile=True или SimulationProfiler в CloudletExecution")
+        return self.profiler.report()
+
+    def create_trace_dataset(self, uuid_ids=False):
+        # Трасса выполнения задач (по строке на задачу и на квант) в виде DataFrame
+        if self.trace is None:
+            raise ValueError("Трасса не записывалась: передайте trace=True или TraceRecorder в CloudletExecution")
+        return self.trace.to_dataframe(uuid_ids)
@@ -0,0 +1,108 @@
+# Уровни подробности вывода симуляции и буферизованные приемники событий
+import json
+import sys
+
+VERBOSITY_OFF = "off"  # Ничего не выводить
+VERBOSITY_SUMMARY = "summary"  # Только итоговая сводка после завершения симуляции
+VERBOSITY_EVENT = "event"  # Сводка и записи о каждом событии задач (начало, завершение, ожидание)
+VERBOSITY_LEVELS = {VERBOSITY_OFF: 0, VERBOSITY_SUMMARY: 1, VERBOSITY_EVENT: 2}
+
+# Типы событий задач
+EVENT_START = "start"  # Задача начала выполнение на VM
+EVENT_COMPLETE = "complete"  # Задача завершила выполнение (data: wait_time, turnaround_time)
+EVENT_SLICE_START = "slice_start"  # Начало кванта выполнения задачи (Round-Robin)
+EVENT_SLICE_END = "slice_end"  # Конец кванта выполнения задачи (Round-Robin)
+EVENT_WAIT = "wait"  # Задача не нашла свободную VM и ожидает
+
+
+def verbosity_level(verbosity):
+    # Числовой уровень подробности по его имени
+    if verbosity not in VERBOSITY_LEVELS:
+        raise ValueError(f"Неизвестный уровень подробности: {verbosity}. Допустимые значения: {tuple(VERBOSITY_LEVELS)}")
+    return VERBOSITY_LEVELS[verbosity]
+
+
+class EventSink:
+    """
+    Буферизованный приемник структурированных событий симуляции.
+
+    Событие - кортеж (time, event, cloudlet_id, vm_id, data), где data - словарь дополнительных полей
+    или None. Если задан stream (или path), буфер сбрасывается в него строками JSON при заполнении
+    и по flush(); иначе события накапливаются в памяти и доступны через records / to_dataframe().
+    """
+
+    def __init__(self, stream=None, path=None, buffer_size=8192):
+        self.stream = stream  # Поток для записи событий (JSON Lines)
+        self.path = path  # Файл для записи событий (JSON Lines), открывается при первом сбросе
+        self.buffer_size = buffer_size  # Количество событий в буфере до сброса в поток
+        self.buffer = []  # Буфер событий
+        self.records = []  # Все события (если поток не задан)
+
+    def emit(self, time, event, cloudlet_id, vm_id, data=None):
+        # Добавление события в буфер
+        self.buffer.append((time, event, cloudlet_id, vm_id, data))
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        # Сброс буфера в поток (или в список records)
+        if not self.buffer:
+            return
+        if self.stream is None and self.path is not None:
+            self.stream = open(self.path, "w")
+        if self.stream is None:
+            self.records.extend(self.buffer)
+        else:
+            self.stream.write("".join(self.format(record) for record in self.buffer))
+            self.stream.flush()
+        self.buffer = []
+
+    def format(self, record):
+        # Представление события в виде строки JSON
+        time, event, cloudlet_id, vm_id, data = record
+        fields = {"time": time, "event": event, "cloudlet_id": cloudlet_id, "vm_id": vm_id}
+        if data:
+            fields.update(data)
+        return json.dumps(fields, default=str) + "\n"
+
+    def close(self):
+        # Сброс буфера и закрытие файла, открытого по path
+        self.flush()
+        if self.path is not None and self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def to_dataframe(self):
+        # События, накопленные в памяти, в виде DataFrame (поля data разворачиваются в столбцы)
+        import pandas as pd
+        self.flush()
+        rows = [{"time": time, "event": event, "cloudlet_id": cloudlet_id, "vm_id": vm_id, **(data or {})}
+                for time, event, cloudlet_id, vm_id, data in self.records]
+        return pd.DataFrame(rows)
+
+
+class ConsoleEventSink(EventSink):
+    # Приемник, выводящий события в stdout в текстовом виде, пакетами по buffer_size событий
+    def __init__(self, stream=None, buffer_size=1024):
+        super().__init__(stream, buffer_size=buffer_size)
+
+    def flush(self):
+        if not self.buffer:
+            return
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("".join(self.format(record) for record in self.buffer))
+        self.buffer = []
+
+    def format(self, record):
+        time, event, cloudlet_id, vm_id, data = record
+        if event in (EVENT_START, EVENT_SLICE_START):
+            return f"Cloudlet {cloudlet_id} starts execution on VM {vm_id} at {time}\n"
+        if event == EVENT_SLICE_END:
+            return f"Cloudlet {cloudlet_id} completes execution on VM {vm_id} at {time}\n"
+        if event == EVENT_COMPLETE:
+            return (f"Cloudlet {cloudlet_id} completes execution on VM {vm_id} at {time}\n"
+                    f"Cloudlet {cloudlet_id} - Waiting Time: {data['wait_time']}, "
+                    f"Turnaround Time: {data['turnaround_time']}\n")
+        if event == EVENT_WAIT:
+            return f"No available VM for Cloudlet {cloudlet_id} at {time}, waiting...\n"
+        return super().format(record)
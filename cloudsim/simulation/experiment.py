@@ -0,0 +1,191 @@
+# Пакетный запуск экспериментов: сетка (планировщики x зерна нагрузки x конфигурации датацентров),
+# каждая симуляция выполняется в отдельном процессе со своим simpy.Environment
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from cloudsim.entities.cloudlet import Cloudlet
+from cloudsim.entities.datacenter import Datacenter, DatacenterCharacteristics
+from cloudsim.entities.entity import get_id_mode, reset_ids, set_id_mode
+from cloudsim.entities.host import Host
+from cloudsim.entities.pe import Pe
+from cloudsim.entities.vm import Vm
+from cloudsim.entities.vm_execution import EXECUTION_EXCLUSIVE
+from cloudsim.network.topology import NetworkTopology
+from cloudsim.schedulers.registry import scheduler_names
+from cloudsim.simulation.cloudlet import CloudletExecution
+
+# Конфигурация датацентра по умолчанию (как в example.py)
+DEFAULT_DATACENTER_CONFIG = {
+    "name": "MyDatacenter",
+    "arch": "x86",
+    "os": "Linux",
+    "vmm": "Xen",
+    "time_zone": 10.0,
+    "cost": 100.0,
+    "cost_per_mem": 0.10,
+    "cost_per_storage": 0.002,
+    "cost_per_bw": 0.0,
+    "vm_allocation_policy": None,
+    "hosts": [{"count": 1, "ram": 4096, "bw": 10000, "storage": 1000000, "pes": 4, "mips": 1000}],
+    "vms": [
+        {"count": 1, "mips": 500, "pes_number": 1, "ram": 819.2, "bw": 2000, "size": 10000, "vmm": "Xen"},
+        {"count": 1, "mips": 175, "pes_number": 2, "ram": 512, "bw": 2000, "size": 10000, "vmm": "Xen"},
+        {"count": 1, "mips": 125, "pes_number": 1, "ram": 2048, "bw": 2000, "size": 10000, "vmm": "Xen"},
+    ],
+}
+
+# Параметры генерации случайной нагрузки по умолчанию (диапазоны значений, как в example.py)
+DEFAULT_WORKLOAD_CONFIG = {
+    "num_cloudlets": 100,
+    "length": [1, 15],
+    "pes_number": [1, 2],
+    "file_size": [100, 500],
+    "output_size": [30, 150],
+}
+
+
+def build_datacenter(config):
+    # Создание датацентра с хостами и VM по словарю конфигурации (передается в процессы вместо объектов)
+    config = {**DEFAULT_DATACENTER_CONFIG, **config}
+    host_list = []
+    for host_config in config["hosts"]:
+        for _ in range(host_config.get("count", 1)):
+            pe_list = [Pe(host_config["mips"]) for _ in range(host_config["pes"])]
+            # power_model - модель мощности хоста, например {"model": "linear", "max_power": 250}
+            host_list.append(Host(host_config["ram"], host_config["bw"], host_config["storage"], pe_list,
+                                  host_config.get("power_model")))
+    characteristics = DatacenterCharacteristics(
+        config["arch"], config["os"], config["vmm"], host_list, config["time_zone"], config["cost"],
+        config["cost_per_mem"], config["cost_per_storage"], config["cost_per_bw"])
+    datacenter = Datacenter(config["name"], characteristics, config["vm_allocation_policy"], deque(), 0)
+
+    broker_id = datacenter.get_broker_id()
+    vm_list = []
+    for vm_config in config["vms"]:
+        for _ in range(vm_config.get("count", 1)):
+            vm_list.append(Vm(broker_id, vm_config["mips"], vm_config["pes_number"], vm_config["ram"],
+                              vm_config["bw"], vm_config["size"], vm_config["vmm"],
+                              vm_config.get("execution_model", EXECUTION_EXCLUSIVE)))
+    datacenter.set_vms(vm_list)
+    if config.get("network") is not None:
+        # Сеть датацентра: параметры NetworkTopology.add_datacenter (latency, storage_bandwidth, storage_latency)
+        datacenter.set_topology(NetworkTopology(), **config["network"])
+    return datacenter
+
+
+def generate_cloudlets(seed, config=None):
+    # Случайная нагрузка, однозначно определяемая зерном
+    config = {**DEFAULT_WORKLOAD_CONFIG, **(config or {})}
+    rng = random.Random(seed)
+    return [Cloudlet(length=rng.randint(*config["length"]), pes_number=rng.randint(*config["pes_number"]),
+                     file_size=rng.randint(*config["file_size"]), output_size=rng.randint(*config["output_size"]))
+            for _ in range(config["num_cloudlets"])]
+
+
+def run_simulation(run_id, scheduler, seed, datacenter_config, workload_config=None, execution_options=None,
+                   id_mode=None):
+    # Одна симуляция: собственный датацентр, нагрузка и simpy.Environment (выполняется в процессе пула).
+    # id_mode - режим идентификаторов сущностей (None - текущий режим процесса)
+    started = time.perf_counter()
+    if id_mode is not None:
+        set_id_mode(id_mode)
+    reset_ids()  # Идентификаторы сущностей нумеруются заново в каждой симуляции
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        datacenter = build_datacenter(datacenter_config)
+        execution = CloudletExecution(scheduler, generate_cloudlets(seed, workload_config), datacenter,
+                                      **{"verbosity": "off", **(execution_options or {})})
+        execution.execute()
+        summary = execution.create_summary_dataset()
+    summary.insert(0, "run_id", run_id)
+    summary.insert(2, "seed", seed)
+    summary.insert(3, "datacenter", datacenter.name)
+    summary["makespan"] = execution.makespan
+    summary["wall_time"] = time.perf_counter() - started
+    return summary
+
+
+class ExperimentRunner:
+    """
+    Запуск сетки экспериментов (планировщики x зерна нагрузки x конфигурации датацентров) в пуле процессов.
+
+    Каждая симуляция строит свой датацентр из словаря конфигурации и выполняется в отдельном процессе.
+    Результаты (строки create_summary_dataset с идентификатором запуска, зерном и датацентром)
+    выдаются по мере завершения запусков и могут сразу дописываться в CSV-файл.
+    """
+
+    def __init__(self, schedulers, seeds, datacenter_configs=None, workload_config=None, execution_options=None,
+                 n_workers=None):
+        self.schedulers = list(schedulers)  # Имена планировщиков ("FCFS", "SJF", "RoundRobin", "PS")
+        self.seeds = list(seeds)  # Зерна генерации нагрузки
+        self.datacenter_configs = list(datacenter_configs or [DEFAULT_DATACENTER_CONFIG])  # Конфигурации датацентров
+        self.workload_config = workload_config  # Параметры генерации нагрузки
+        self.execution_options = execution_options  # Дополнительные параметры CloudletExecution
+        self.n_workers = n_workers  # Количество процессов (None - по числу ядер)
+
+    def tasks(self):
+        # Все комбинации сетки экспериментов
+        grid = itertools.product(range(len(self.datacenter_configs)), self.seeds, self.schedulers)
+        # Режим идентификаторов передается запускам явно: процессы пула могут не наследовать его
+        return [(run_id, scheduler, seed, self.datacenter_configs[config_index], self.workload_config,
+                 self.execution_options, get_id_mode())
+                for run_id, (config_index, seed, scheduler) in enumerate(grid)]
+
+    def iter_results(self):
+        # Результаты запусков в порядке их завершения
+        with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+            futures = [executor.submit(run_simulation, *task) for task in self.tasks()]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(self, output=None):
+        # Выполнение всех запусков; при заданном output результаты дописываются в CSV по мере завершения
+        import pandas as pd
+        results = []
+        for index, summary in enumerate(self.iter_results()):
+            if output is not None:
+                summary.to_csv(output, mode="w" if index == 0 else "a", header=index == 0, index=False)
+            results.append(summary)
+        if not results:
+            return pd.DataFrame()
+        return pd.concat(results, ignore_index=True).sort_values(["run_id", "vm_id"], ignore_index=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетный запуск экспериментов cloudsim в пуле процессов")
+    parser.add_argument("--schedulers", nargs="+", default=list(scheduler_names()),
+                        help="имена планировщиков")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0], help="зерна генерации нагрузки")
+    parser.add_argument("--datacenters", help="JSON-файл со списком конфигураций датацентров")
+    parser.add_argument("--workload", help="JSON-файл с параметрами генерации нагрузки")
+    parser.add_argument("--cloudlets", type=int, help="количество задач в нагрузке")
+    parser.add_argument("--options", help="JSON-объект с дополнительными параметрами CloudletExecution")
+    parser.add_argument("--workers", type=int, help="количество процессов")
+    parser.add_argument("--output", default="experiment_summary.csv", help="CSV-файл для сводной таблицы")
+    args = parser.parse_args(argv)
+
+    datacenter_configs = None
+    if args.datacenters:
+        with open(args.datacenters) as f:
+            datacenter_configs = json.load(f)
+    workload_config = {}
+    if args.workload:
+        with open(args.workload) as f:
+            workload_config = json.load(f)
+    if args.cloudlets is not None:
+        workload_config["num_cloudlets"] = args.cloudlets
+    execution_options = json.loads(args.options) if args.options else None
+
+    runner = ExperimentRunner(args.schedulers, args.seeds, datacenter_configs, workload_config, execution_options,
+                              args.workers)
+    summary = runner.run(output=args.output)
+    print(f"{summary['run_id'].nunique() if len(summary) else 0} runs written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+# Параллельная симуляция федерации датацентров: каждый датацентр (хосты, VM, планировщик) моделируется в своем
+# окружении SimPy, окружения распределены по процессам и синхронизируются консервативно окнами длиной lookahead
+import contextlib
+import heapq
+import math
+import multiprocessing
+import os
+import random
+import time
+import traceback
+import simpy
+from cloudsim.entities.cloudlet import Cloudlet
+from cloudsim.entities.entity import get_id_mode, reset_ids, set_id_mode
+from cloudsim.schedulers.registry import create_scheduler
+from cloudsim.simulation.arrivals import poisson_arrivals
+from cloudsim.simulation.experiment import DEFAULT_DATACENTER_CONFIG, build_datacenter
+
+# Политики передачи задач в другие датацентры
+FORWARD_NONE = "none"  # Задачи выполняются там, куда поступили
+FORWARD_OVERFLOW = "overflow"  # Задача передается, если очередь ожидающих задач не короче forward_threshold
+FORWARD_RANDOM = "random"  # Задача передается с вероятностью forward_probability
+FORWARD_POLICIES = (FORWARD_NONE, FORWARD_OVERFLOW, FORWARD_RANDOM)
+
+SITE_ID_STRIDE = 1 << 32  # Диапазон идентификаторов сущностей одного датацентра (уникальны во всей федерации)
+
+
+class FederationSite:
+    """
+    Один датацентр федерации: собственное окружение SimPy, датацентр, планировщик с потоковым приемом задач
+    (admit) и пуассоновский поток поступления задач.
+
+    Поступившая задача выполняется на месте или, по политике передачи, отправляется в другой датацентр
+    сообщением с меткой времени (момент отправки + задержка между датацентрами). Полученные сообщения
+    (deliver) становятся задачами, поступающими в момент метки; полученные задачи дальше не передаются.
+    """
+
+    def __init__(self, index, n_sites, latency, datacenter_config, scheduler, scheduler_options, arrival_rate,
+                 cloudlets, until, workload_config, seed, forward, forward_threshold, forward_probability, id_mode):
+        self.index = index
+        self.n_sites = n_sites
+        self.latency = latency  # Задержки до всех датацентров федерации
+        self.forward = forward
+        self.forward_threshold = forward_threshold
+        self.forward_probability = forward_probability
+        set_id_mode(id_mode)  # Режим идентификаторов координатора (процессы "spawn" его не наследуют)
+        reset_ids(index * SITE_ID_STRIDE)
+        self.datacenter = build_datacenter(datacenter_config)
+        self.env = simpy.Environment()
+        self.scheduler_name = scheduler
+        self.scheduler = create_scheduler(scheduler, self.env, self.datacenter,
+                                          **{"dispatch": "event", "verbosity": "off", **(scheduler_options or {})})
+        if not self.scheduler.supports_streaming:
+            raise ValueError(f"Планировщик {scheduler} не поддерживает потоковое поступление задач")
+        self.rng = random.Random(seed)  # Решения политики "random"
+        self.next_target = index  # Последний датацентр, получивший задачу по политике "overflow"
+        self.outbox = []  # Сообщения, отправленные в текущем окне
+        self.sequence = 0  # Номер последнего отправленного сообщения
+        self.arrived = 0  # Задачи, поступившие в датацентр из его потока
+        self.forwarded = 0  # Задачи, переданные в другие датацентры
+        self.received = 0  # Задачи, полученные из других датацентров
+        arrivals = poisson_arrivals(arrival_rate, count=cloudlets, until=until, seed=seed, config=workload_config)
+        self.env.process(self.generate(arrivals))
+
+    def generate(self, arrivals):
+        for cloudlet in arrivals:
+            delay = cloudlet.submit_time - self.env.now
+            if delay > 0:
+                yield self.env.timeout(delay)
+            self.arrived += 1
+            target = self.forward_target()
+            if target is None:
+                self.scheduler.admit(cloudlet)
+            else:
+                self.send(target, cloudlet)
+
+    def forward_target(self):
+        # Датацентр, в который передается поступившая задача (None - выполнить на месте)
+        if self.n_sites < 2 or self.forward == FORWARD_NONE:
+            return None
+        if self.forward == FORWARD_OVERFLOW:
+            if self.scheduler.queue_length() < self.forward_threshold:
+                return None
+            # Датацентры-получатели чередуются по кругу
+            self.next_target = (self.next_target + 1) % self.n_sites
+            if self.next_target == self.index:
+                self.next_target = (self.next_target + 1) % self.n_sites
+            return self.next_target
+        if self.rng.random() >= self.forward_probability:
+            return None
+        target = self.rng.randrange(self.n_sites - 1)
+        return target + 1 if target >= self.index else target
+
+    def send(self, target, cloudlet):
+        self.forwarded += 1
+        self.sequence += 1
+        self.outbox.append((self.env.now + self.latency[target], self.index, self.sequence, target, cloudlet.length,
+                            cloudlet.pes_number, cloudlet.file_size, cloudlet.output_size))
+
+    def deliver(self, messages):
+        # Сообщения других датацентров (упорядоченные по метке времени) - задачи, поступающие в момент метки
+        for arrival_time, _, _, _, length, pes_number, file_size, output_size in messages:
+            cloudlet = Cloudlet(length, pes_number, file_size, output_size)
+            self.env.timeout(arrival_time - self.env.now, cloudlet).callbacks.append(self.receive)
+
+    def receive(self, event):
+        cloudlet = event.value
+        cloudlet.submit_time = self.env.now
+        self.received += 1
+        self.scheduler.admit(cloudlet)
+
+    def run(self, window_end):
+        # Выполнение событий до window_end (не включая); возвращает сообщения, отправленные за окно.
+        # Шаги выполняются напрямую: env.run(until) оставляет в очереди событие остановки.
+        env = self.env
+        while env.peek() < window_end:
+            env.step()
+        outbox, self.outbox = self.outbox, []
+        return outbox
+
+    def next_time(self):
+        # Момент ближайшего события датацентра (inf - событий нет)
+        return self.env.peek()
+
+    def summary(self):
+        # Итоги датацентра после окончания симуляции
+        metrics = self.scheduler.metrics
+        makespan = metrics.last_change()
+        metrics.finish(makespan)
+        self.scheduler.finish()
+        return {"site": self.index, "datacenter": self.datacenter.name, "scheduler": self.scheduler_name,
+                "arrived": self.arrived, "forwarded": self.forwarded, "received": self.received,
+                "total_execution_time": self.scheduler.total_execution_time, **metrics.run_summary()}
+
+
+class LocalWorker:
+    # Датацентры, моделируемые в процессе координатора (n_workers=0; для отладки и небольших федераций)
+
+    def __init__(self, site_specs):
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            self.sites = [FederationSite(**spec) for spec in site_specs]
+        self._result = {site.index: site.next_time() for site in self.sites}
+
+    def submit(self, command):
+        self._result = _execute(self.sites, command)
+
+    def result(self):
+        return self._result
+
+    def close(self):
+        pass
+
+
+class ProcessWorker:
+    # Датацентры, моделируемые в отдельном процессе; команды и результаты передаются через канал
+
+    def __init__(self, site_specs, context):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_site_worker, args=(site_specs, child), daemon=True)
+        self.process.start()
+        child.close()
+
+    def submit(self, command):
+        self.connection.send(command)
+
+    def result(self):
+        result = self.connection.recv()
+        if isinstance(result, _WorkerError):
+            raise RuntimeError(f"Ошибка в процессе датацентров федерации:\n{result.text}")
+        return result
+
+    def close(self):
+        self.connection.close()
+        self.process.join()
+
+
+class _WorkerError:
+    def __init__(self, text):
+        self.text = text
+
+
+def _execute(sites, command):
+    # Команда процесса: (конец окна, {датацентр: сообщения}) -> (отправленные сообщения, {датацентр: след. событие})
+    # или None - итоги всех датацентров
+    if command is None:
+        return [site.summary() for site in sites]
+    window_end, messages = command
+    outbox = []
+    for site in sites:
+        site.deliver(messages.get(site.index, ()))
+        if site.next_time() < window_end:
+            outbox.extend(site.run(window_end))
+    return outbox, {site.index: site.next_time() for site in sites}
+
+
+def _site_worker(site_specs, connection):
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            sites = [FederationSite(**spec) for spec in site_specs]
+            connection.send({site.index: site.next_time() for site in sites})
+            while True:
+                command = connection.recv()
+                connection.send(_execute(sites, command))
+                if command is None:
+                    break
+    except Exception:
+        connection.send(_WorkerError(traceback.format_exc()))
+    finally:
+        connection.close()
+
+
+class FederationRunner:
+    """
+    Федерация датацентров с консервативной синхронизацией по окнам (PDES).
+
+    Каждый датацентр моделируется в своем окружении SimPy; датацентры распределены по n_workers процессам.
+    Задача, переданная из датацентра i в j в момент t, поступает в j в момент t + latency[i][j], поэтому
+    lookahead - наименьшая задержка между датацентрами: сообщения, отправленные в окне [T, T + lookahead),
+    поступают не раньше конца окна. Координатор повторяет шаги:
+      - начало окна T - ближайшее событие всех датацентров и недоставленных сообщений (пустые окна пропускаются);
+      - процессы доставляют сообщения своим датацентрам и выполняют их события до T + lookahead, параллельно;
+      - отправленные за окно сообщения собираются для следующего окна.
+    Сообщения доставляются в порядке (метка времени, отправитель, номер), поэтому результаты не зависят от
+    числа процессов.
+
+    latency - задержка между любыми двумя датацентрами или матрица задержек (n x n). Поток задач каждого
+    датацентра - пуассоновский (arrival_rate, cloudlets или until, workload_config как в CloudletBatch.generate),
+    с зерном seed + номер датацентра. Планировщик должен поддерживать потоковый прием задач.
+    n_workers: None - по числу ядер (не больше числа датацентров), 0 - все датацентры в процессе координатора.
+    """
+
+    def __init__(self, datacenter_configs=None, scheduler="FCFS", latency=1.0, arrival_rate=1.0, cloudlets=None,
+                 until=None, workload_config=None, scheduler_options=None, forward=FORWARD_OVERFLOW,
+                 forward_threshold=1, forward_probability=0.1, seed=0, n_workers=None):
+        if forward not in FORWARD_POLICIES:
+            raise ValueError(f"Неизвестная политика передачи задач: {forward}. Допустимые значения: {FORWARD_POLICIES}")
+        if cloudlets is None and until is None:
+            raise ValueError("Нужно задать количество задач (cloudlets) или длительность потока (until)")
+        self.datacenter_configs = list(datacenter_configs or [DEFAULT_DATACENTER_CONFIG])
+        n_sites = len(self.datacenter_configs)
+        if isinstance(latency, (int, float)):
+            latency = [[0.0 if i == j else latency for j in range(n_sites)] for i in range(n_sites)]
+        if len(latency) != n_sites or any(len(row) != n_sites for row in latency):
+            raise ValueError("Матрица задержек должна иметь размер (число датацентров x число датацентров)")
+        self.latency = latency
+        self.lookahead = min((latency[i][j] for i in range(n_sites) for j in range(n_sites) if i != j),
+                             default=math.inf)
+        if self.lookahead <= 0:
+            raise ValueError("Задержки между датацентрами должны быть положительными (lookahead > 0)")
+        self.site_specs = [{
+            "index": index, "n_sites": n_sites, "latency": latency[index], "datacenter_config": config,
+            "scheduler": scheduler, "scheduler_options": scheduler_options, "arrival_rate": arrival_rate,
+            "cloudlets": cloudlets, "until": until, "workload_config": workload_config, "seed": seed + index,
+            "forward": forward, "forward_threshold": forward_threshold, "forward_probability": forward_probability,
+            "id_mode": get_id_mode(),
+        } for index, config in enumerate(self.datacenter_configs)]
+        if n_workers is None:
+            n_workers = min(os.cpu_count() or 1, n_sites)
+        self.n_workers = n_workers
+        self.stats = {}  # Счетчики последнего запуска (окна, сообщения, время выполнения)
+
+    def start_workers(self):
+        if self.n_workers == 0:
+            return [LocalWorker(self.site_specs)], {spec["index"]: 0 for spec in self.site_specs}
+        context = multiprocessing.get_context("spawn")
+        workers = [ProcessWorker(self.site_specs[offset::self.n_workers], context) for offset in range(self.n_workers)]
+        owner = {spec["index"]: index % self.n_workers for index, spec in enumerate(self.site_specs)}
+        return workers, owner
+
+    def run(self):
+        # Выполнение федерации; возвращает DataFrame с итогами по датацентрам
+        import pandas as pd
+        started = time.perf_counter()
+        workers, owner = self.start_workers()
+        sites = [[site for site, site_owner in owner.items() if site_owner == index] for index in range(len(workers))]
+        try:
+            next_times = {}
+            for worker in workers:
+                next_times.update(worker.result())
+            pending = []  # Куча недоставленных сообщений
+            windows = 0
+            messages = 0
+            while True:
+                window_start = min(min(next_times.values()), pending[0][0] if pending else math.inf)
+                if window_start == math.inf:
+                    break
+                window_end = window_start + self.lookahead
+                deliveries = [{} for _ in workers]
+                while pending:
+                    message = heapq.heappop(pending)
+                    deliveries[owner[message[3]]].setdefault(message[3], []).append(message)
+                # Процессы, у датацентров которых нет событий в окне и сообщений, пропускают окно
+                active = [index for index in range(len(workers))
+                          if deliveries[index] or any(next_times[site] < window_end for site in sites[index])]
+                for index in active:
+                    workers[index].submit((window_end, deliveries[index]))
+                for index in active:
+                    outbox, times = workers[index].result()
+                    next_times.update(times)
+                    for message in outbox:
+                        heapq.heappush(pending, message)
+                    messages += len(outbox)
+                windows += 1
+            rows = []
+            for worker in workers:
+                worker.submit(None)
+            for worker in workers:
+                rows.extend(worker.result())
+        finally:
+            for worker in workers:
+                worker.close()
+        rows.sort(key=lambda row: row["site"])
+        self.stats = {"sites": len(self.site_specs), "workers": self.n_workers, "lookahead": self.lookahead,
+                      "windows": windows, "messages": messages, "wall_time": time.perf_counter() - started,
+                      "makespan": max((row["makespan"] for row in rows), default=0.0)}
+        return pd.DataFrame(rows)
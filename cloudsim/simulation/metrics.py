@@ -0,0 +1,174 @@
+# Взвешенные по времени метрики загрузки VM и хостов (и энергия хостов с моделью мощности), обновляемые при каждом
+# запуске и окончании выполнения задачи за O(1), без пересчета по трассе
+
+UTILIZATION_BINS = 100  # Число интервалов гистограммы загрузки PE (шаг 1%)
+RESOURCES = ("pe", "ram", "storage")
+
+
+class UsageAccumulator:
+    """
+    Загрузка одного ресурса (VM или хоста) во времени: текущая нагрузка задач (PE, RAM, хранилище),
+    интегралы загрузки по времени, время занятости и гистограмма времени по уровням загрузки PE
+    (для процентилей). Интегралы продвигаются до текущего момента при каждом изменении нагрузки.
+    С моделью мощности (PowerModel) накапливается и энергия: загрузка PE между изменениями постоянна,
+    поэтому энергия интервала - мощность при этой загрузке, умноженная на его длительность (без выборки по тактам).
+    """
+
+    __slots__ = ("capacity", "load", "cloudlets", "updated", "busy_time", "integral", "histogram", "completed",
+                 "wait_time", "turnaround_time", "power_model", "energy")
+
+    def __init__(self, capacity, power_model=None):
+        self.capacity = capacity  # (PE, RAM, хранилище)
+        self.load = [0, 0, 0]  # Суммарные требования выполняющихся задач
+        self.cloudlets = 0  # Количество выполняющихся задач
+        self.updated = 0.0  # Момент, до которого продвинуты интегралы
+        self.busy_time = 0.0  # Время, в течение которого выполнялась хотя бы одна задача
+        self.integral = [0.0, 0.0, 0.0]  # Интегралы загрузки (доли, не больше 1) по времени
+        self.histogram = [0.0] * (UTILIZATION_BINS + 1)  # Время по уровням загрузки PE (округление до 1%)
+        self.completed = 0  # Завершенные задачи
+        self.wait_time = 0.0  # Суммарное время ожидания завершенных задач
+        self.turnaround_time = 0.0  # Суммарное полное время выполнения завершенных задач
+        self.power_model = power_model  # Модель мощности (только у хостов) или None
+        self.energy = 0.0  # Потребленная энергия (мощность x время симуляции)
+
+    def advance(self, now):
+        duration = now - self.updated
+        if duration <= 0:
+            return
+        self.updated = now
+        if not self.cloudlets:
+            self.histogram[0] += duration
+            if self.power_model is not None:
+                self.energy += self.power_model.power(0.0) * duration
+            return
+        self.busy_time += duration
+        capacity = self.capacity
+        load = self.load
+        pe = min(1.0, load[0] / capacity[0])
+        self.integral[0] += pe * duration
+        self.integral[1] += min(1.0, load[1] / capacity[1]) * duration
+        self.integral[2] += min(1.0, load[2] / capacity[2]) * duration
+        self.histogram[int(pe * UTILIZATION_BINS + 0.5)] += duration
+        if self.power_model is not None:
+            self.energy += self.power_model.power(pe) * duration
+
+    def change(self, now, cloudlet, sign):
+        # Запуск (sign = 1) или окончание (sign = -1) выполнения задачи
+        self.advance(now)
+        self.cloudlets += sign
+        self.load[0] += sign * cloudlet.pes_number
+        self.load[1] += sign * cloudlet.file_size
+        self.load[2] += sign * cloudlet.output_size
+
+    def percentile(self, q, duration):
+        # q-й процентиль загрузки PE по времени на интервале [0, duration]
+        if duration <= 0:
+            return 0.0
+        threshold = q / 100 * duration
+        elapsed = 0.0
+        for level, time in enumerate(self.histogram):
+            elapsed += time
+            if elapsed >= threshold:
+                return level / UTILIZATION_BINS
+        return 1.0
+
+    def summary(self, duration):
+        # Итоговые метрики на интервале [0, duration]
+        mean = [value / duration if duration > 0 else 0.0 for value in self.integral]
+        summary = {
+            "busy_time": self.busy_time,
+            "busy_fraction": self.busy_time / duration if duration > 0 else 0.0,
+            **{f"mean_{resource}_utilization": value for resource, value in zip(RESOURCES, mean)},
+            "p95_pe_utilization": self.percentile(95, duration),
+            "completed": self.completed,
+            "throughput": self.completed / duration if duration > 0 else 0.0,
+            "mean_wait_time": self.wait_time / self.completed if self.completed else None,
+            "mean_turnaround_time": self.turnaround_time / self.completed if self.completed else None,
+        }
+        if self.power_model is not None:
+            summary["energy"] = self.energy
+            summary["mean_power"] = self.energy / duration if duration > 0 else 0.0
+        return summary
+
+
+class UtilizationMetrics:
+    """
+    Метрики загрузки всех VM планировщика и хостов, на которых они размещены.
+
+    Планировщик сообщает о запуске и окончании выполнения задачи (или кванта) на VM (start/stop) и о завершении
+    задачи (complete); каждое сообщение обновляет накопители VM и её хоста за O(1). finish(makespan) продвигает
+    интегралы до конца симуляции. Загрузка хоста - суммарные требования задач всех его VM к ресурсам хоста.
+    Энергия учитывается для хостов с моделью мощности (Host.power_model), на которых размещены VM
+    планировщика; хосты без VM считаются выключенными.
+    """
+
+    def __init__(self, vm_list):
+        self.vms = {vm.get_id(): UsageAccumulator((vm.pes_number, vm.ram, vm.size)) for vm in vm_list}
+        self.hosts = {}
+        self.vm_hosts = {}  # Идентификатор VM -> накопитель хоста
+        for vm in vm_list:
+            host = vm.host
+            if host is None:
+                continue
+            accumulator = self.hosts.get(host.host_id)
+            if accumulator is None:
+                accumulator = self.hosts[host.host_id] = UsageAccumulator((len(host.pe_list), host.ram, host.storage),
+                                                                          host.power_model)
+            self.vm_hosts[vm.get_id()] = accumulator
+        self.powered = [accumulator for accumulator in self.hosts.values() if accumulator.power_model is not None]
+        self.total = UsageAccumulator((1, 1, 1))  # Счетчики завершенных задач по всей симуляции
+        self.makespan = 0.0
+
+    def start(self, vm, cloudlet, now):
+        self.vms[vm.get_id()].change(now, cloudlet, 1)
+        host = self.vm_hosts.get(vm.get_id())
+        if host is not None:
+            host.change(now, cloudlet, 1)
+
+    def stop(self, vm, cloudlet, now):
+        self.vms[vm.get_id()].change(now, cloudlet, -1)
+        host = self.vm_hosts.get(vm.get_id())
+        if host is not None:
+            host.change(now, cloudlet, -1)
+
+    def complete(self, vm, wait_time, turnaround_time):
+        # Учет завершенной задачи (время ожидания и полное время выполнения)
+        for accumulator in (self.vms[vm.get_id()], self.vm_hosts.get(vm.get_id()), self.total):
+            if accumulator is not None:
+                accumulator.completed += 1
+                accumulator.wait_time += wait_time
+                accumulator.turnaround_time += turnaround_time
+
+    def finish(self, makespan):
+        # Продвижение интегралов всех VM и хостов до окончания симуляции
+        self.makespan = makespan
+        for accumulator in (*self.vms.values(), *self.hosts.values()):
+            accumulator.advance(makespan)
+
+    def last_change(self):
+        # Момент последнего изменения загрузки VM (после симуляции - окончание последней задачи)
+        return max((accumulator.updated for accumulator in self.vms.values()), default=0.0)
+
+    def vm_summary(self, vm_id):
+        return self.vms[vm_id].summary(self.makespan)
+
+    def host_summary(self, host_id):
+        return self.hosts[host_id].summary(self.makespan)
+
+    def run_summary(self):
+        # Метрики всей симуляции: makespan, пропускная способность, среднее ожидание и полное время выполнения,
+        # энергия хостов с моделью мощности
+        total = self.total
+        summary = {
+            "makespan": self.makespan,
+            "completed": total.completed,
+            "throughput": total.completed / self.makespan if self.makespan else 0.0,
+            "mean_wait_time": total.wait_time / total.completed if total.completed else None,
+            "mean_turnaround_time": total.turnaround_time / total.completed if total.completed else None,
+        }
+        if self.powered:
+            # Энергия датацентра - сумма энергии хостов с моделью мощности
+            energy = sum(accumulator.energy for accumulator in self.powered)
+            summary["energy"] = energy
+            summary["mean_power"] = energy / self.makespan if self.makespan else 0.0
+        return summary
@@ -0,0 +1,194 @@
+# Профилирование симуляции: счетчики горячих участков планировщика и обертка env.step
+import cProfile
+import heapq
+import math
+import time
+from collections import defaultdict
+import numpy as np
+from simpy.events import NORMAL, Process
+
+
+class EventCounter:
+    # Счетчик событий, запланированных в окружении SimPy после создания счетчика: env.schedule подменяется
+    # атрибутом экземпляра окружения (без обращения к внутренним полям SimPy)
+
+    def __init__(self, env):
+        self.count = 0
+        schedule = env.schedule
+
+        def counted_schedule(event, priority=NORMAL, delay=0):
+            self.count += 1
+            schedule(event, priority, delay)
+
+        env.schedule = counted_schedule
+
+
+def event_label(event):
+    # Метка события для распределения времени шагов: имя процесса SimPy или функции обратного вызова
+    for callback in event.callbacks or ():
+        owner = getattr(callback, "__self__", None)
+        if isinstance(owner, Process):
+            return f"process:{owner.name}"
+        return getattr(callback, "__qualname__", type(callback).__name__)
+    return type(event).__name__
+
+
+class SimulationProfiler:
+    """
+    Счетчики выполнения одной симуляции CloudletExecution.
+
+    attach() подменяет методы конкретного планировщика, env.schedule и env.step атрибутами экземпляра с подсчетом,
+    поэтому без профилировщика симуляция выполняется без каких-либо проверок. Собираются:
+      - число событий SimPy (запланированных и обработанных) и время выполнения;
+      - вызовы выбора VM (find_free_vm), неудачные выборы и затраченное на них время, проверки ресурсов VM
+        (has_enough_resources); неудачные выборы в режиме "polling" - это итерации опроса ожидающих задач;
+      - длина очереди ожидающих задач во времени и доля времени, в течение которого каждая VM была занята
+        (значения меняются только в моменты событий, поэтому учитываются при каждом продвижении времени).
+    step_timing=True распределяет время шагов env.step по меткам событий (event_label), cprofile=True
+    профилирует шаги через cProfile; оба измеряют только каждый sample_every-й шаг.
+    Для движка "fast" собираются только счетчики выбора VM.
+    """
+
+    def __init__(self, step_timing=False, cprofile=False, sample_every=1):
+        if sample_every <= 0:
+            raise ValueError("sample_every должно быть положительным")
+        self.step_timing = step_timing
+        self.sample_every = sample_every
+        self.profile = cProfile.Profile() if cprofile else None  # Результаты cProfile (pstats.Stats(profile))
+        self.scheduler = None
+        self.env = None
+        self.wall_time = 0.0  # Время выполнения симуляции, с
+        self.makespan = None
+        self.events_scheduled = 0
+        self.events_processed = 0
+        self.vm_selection_calls = 0
+        self.vm_selection_misses = 0  # Выборы VM, не нашедшие свободной VM
+        self.vm_selection_time = 0.0
+        self.resource_checks = 0  # Вызовы has_enough_resources
+        self.queue_times = []  # Моменты изменения длины очереди
+        self.queue_lengths = []  # Длина очереди ожидающих задач с соответствующего момента
+        self.busy_time = defaultdict(float)  # Идентификатор VM -> время, в течение которого VM была занята
+        self.step_time = defaultdict(lambda: [0, 0.0])  # Метка события -> [количество шагов, время, с]
+        # Копия очереди событий окружения для step_timing: куча (время, приоритет, номер планирования, событие)
+        # упорядочена так же, как очередь SimPy, поэтому её вершина - событие, которое обработает следующий шаг
+        self._pending = []
+        self._started = None
+
+    def attach(self, scheduler, env):
+        # Подключение к планировщику и окружению SimPy
+        self.scheduler = scheduler
+        self.env = env
+        find_free_vm = scheduler.find_free_vm
+        has_enough_resources = scheduler.has_enough_resources
+
+        def profiled_find_free_vm(cloudlet):
+            started = time.perf_counter()
+            vm = find_free_vm(cloudlet)
+            self.vm_selection_time += time.perf_counter() - started
+            self.vm_selection_calls += 1
+            if vm is None:
+                self.vm_selection_misses += 1
+            return vm
+
+        def profiled_has_enough_resources(vm, cloudlet):
+            self.resource_checks += 1
+            return has_enough_resources(vm, cloudlet)
+
+        scheduler.find_free_vm = profiled_find_free_vm
+        scheduler.has_enough_resources = profiled_has_enough_resources
+        env.schedule = self.wrap_schedule(env.schedule)
+        env.step = self.wrap_step(env.step)
+
+    def wrap_schedule(self, schedule):
+        env = self.env
+
+        def profiled_schedule(event, priority=NORMAL, delay=0):
+            self.events_scheduled += 1
+            if self.step_timing:
+                heapq.heappush(self._pending, (env.now + delay, priority, self.events_scheduled, event))
+            schedule(event, priority, delay)
+
+        return profiled_schedule
+
+    def wrap_step(self, step):
+        env = self.env
+        scheduler = self.scheduler
+
+        def profiled_step():
+            now = env.now
+            following = env.peek()
+            if following == math.inf:
+                return step()  # Событий не осталось: step() завершит env.run()
+            if now < following:
+                # Время продвигается: до следующего события очередь и занятые VM не меняются
+                duration = following - now
+                length = scheduler.queue_length()
+                if not self.queue_lengths or self.queue_lengths[-1] != length:
+                    self.queue_times.append(now)
+                    self.queue_lengths.append(length)
+                for vm in set(scheduler.running_vms):
+                    self.busy_time[vm.get_id()] += duration
+            self.events_processed += 1
+            event = heapq.heappop(self._pending)[3] if self.step_timing else None
+            if self.events_processed % self.sample_every or not (self.step_timing or self.profile):
+                return step()
+            label = event_label(event) if event is not None else None
+            started = time.perf_counter()
+            if self.profile is not None:
+                self.profile.enable()
+            try:
+                return step()
+            finally:
+                if self.profile is not None:
+                    self.profile.disable()
+                if label is not None:
+                    timing = self.step_time[label]
+                    timing[0] += 1
+                    timing[1] += time.perf_counter() - started
+
+        return profiled_step
+
+    def start(self):
+        self._started = time.perf_counter()
+
+    def stop(self, makespan):
+        self.wall_time = time.perf_counter() - self._started
+        self.makespan = makespan
+
+    def queue_series(self):
+        # Длина очереди ожидающих задач во времени: (моменты изменения, длины)
+        return np.array(self.queue_times, dtype=float), np.array(self.queue_lengths, dtype=np.int64)
+
+    def mean_queue_length(self):
+        # Средняя по времени длина очереди
+        times, lengths = self.queue_series()
+        if not self.makespan or not len(times):
+            return 0.0
+        durations = np.diff(np.append(times, self.makespan))
+        return float(np.dot(durations, lengths) / self.makespan)
+
+    def vm_busy_fraction(self):
+        # Доля времени симуляции, в течение которого на VM выполнялась хотя бы одна задача
+        if not self.makespan:
+            return {}
+        return {vm.get_id(): self.busy_time.get(vm.get_id(), 0.0) / self.makespan for vm in self.scheduler.vm_list}
+
+    def report(self):
+        # Итоговые счетчики в виде словаря
+        return {
+            "wall_time": self.wall_time,
+            "makespan": self.makespan,
+            "events_scheduled": self.events_scheduled,
+            "events_processed": self.events_processed,
+            "events_per_sec": self.events_processed / self.wall_time if self.wall_time else None,
+            "vm_selection_calls": self.vm_selection_calls,
+            "vm_selection_misses": self.vm_selection_misses,
+            "vm_selection_time": self.vm_selection_time,
+            "resource_checks": self.resource_checks,
+            "wait_polls": self.vm_selection_misses if self.scheduler.polls_free_vms else 0,
+            "max_queue_length": max(self.queue_lengths, default=0),
+            "mean_queue_length": self.mean_queue_length(),
+            "vm_busy_fraction": self.vm_busy_fraction(),
+            "step_time": {label: {"count": count, "seconds": seconds}
+                          for label, (count, seconds) in sorted(self.step_time.items(), key=lambda item: -item[1][1])},
+        }
@@ -0,0 +1,154 @@
+# Снимки приостановленной симуляции и ветвление сценариев: общий прогрев выполняется один раз, а сценарии
+# продолжают его копии (os.fork с копированием при записи или восстановление из сериализованного снимка)
+import io
+import os
+import pickle
+import random
+import sys
+import traceback
+import types
+import zlib
+import numpy as np
+from simpy.events import Process
+from cloudsim.entities.entity import get_id_state, set_id_state
+
+SNAPSHOT_VERSION = 1  # Версия формата снимка
+
+
+def capture_rng():
+    # Состояние генераторов случайных чисел модулей random и numpy.random
+    return {"random": random.getstate(), "numpy": np.random.get_state()}
+
+
+def restore_rng(state):
+    random.setstate(state["random"])
+    np.random.set_state(state["numpy"])
+
+
+class _SnapshotPickler(pickle.Pickler):
+    # Pickler снимка: находит активные процессы SimPy, где бы они ни были (в очереди событий или в обратных
+    # вызовах ожидаемых событий), и сериализует методы окружения, привязанные к классам событий
+    # (Environment.process, timeout, event - BoundClass), которые стандартный pickle не восстанавливает
+
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.processes = []
+
+    def reducer_override(self, obj):
+        if isinstance(obj, Process) and obj.is_alive:
+            self.processes.append(obj)
+            return str, (obj.name,)  # Заглушка: снимок всё равно будет отклонен
+        if isinstance(obj, types.MethodType) and isinstance(obj.__func__, type):
+            return _bind, (obj.__func__, obj.__self__)
+        return NotImplemented
+
+
+def _bind(cls, instance):
+    return types.MethodType(cls, instance)
+
+
+def snapshot(state, compress=True):
+    """
+    Снимок приостановленной симуляции в виде байтов: объект state (обычно CloudletExecution после run_until -
+    сущности, очереди, состояние планировщика и окружение SimPy с часами и очередью событий), состояние
+    генераторов случайных чисел и идентификаторов сущностей. Данные сериализуются pickle и сжимаются zlib.
+
+    Генераторы Python не сериализуются, поэтому снимок возможен, только пока в симуляции нет активных процессов
+    SimPy: между этапами (все задачи завершены) или с планировщиками на обратных вызовах (Round-Robin
+    "ready_queue"). Иначе используйте fork_branches.
+    """
+    payload = {"version": SNAPSHOT_VERSION, "state": state, "rng": capture_rng(), "ids": get_id_state()}
+    buffer = io.BytesIO()
+    pickler = _SnapshotPickler(buffer)
+    try:
+        pickler.dump(payload)
+    except (TypeError, AttributeError, pickle.PicklingError) as error:
+        raise ValueError(f"Снимок невозможен: состояние симуляции не сериализуется ({error})") from error
+    if pickler.processes:
+        names = sorted({process.name for process in pickler.processes})
+        raise ValueError(f"Снимок невозможен: в симуляции {len(pickler.processes)} активных процессов SimPy "
+                         f"({', '.join(names[:5])}); используйте fork_branches")
+    data = buffer.getvalue()
+    return zlib.compress(data) if compress else data
+
+
+def restore(data):
+    # Восстановление снимка: возвращает объект state; генераторы случайных чисел и идентификаторов
+    # текущего процесса продолжают с момента снимка
+    try:
+        data = zlib.decompress(data)
+    except zlib.error:
+        pass  # Снимок без сжатия
+    payload = pickle.loads(data)
+    if payload.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия снимка: {payload.get('version')}")
+    restore_rng(payload["rng"])
+    set_id_state(payload["ids"])
+    return payload["state"]
+
+
+def fork_branches(branches, *args, max_workers=None):
+    """
+    Ветвление приостановленной симуляции через os.fork: каждая ветка branch(*args) выполняется в дочернем
+    процессе над копией памяти родителя (копирование при записи), поэтому прогрев не повторяется, а активные
+    процессы SimPy продолжают работу в каждой ветке. Результат ветки передается родителю через pickle.
+    Ветки наследуют состояние генераторов случайных чисел; для разных случайных сценариев задайте зерно в ветке.
+    max_workers ограничивает число одновременно выполняющихся веток (None - все сразу).
+    Возвращает результаты в порядке веток.
+    """
+    if not hasattr(os, "fork"):
+        raise ValueError("fork_branches требует os.fork (POSIX); используйте snapshot и restore")
+    branches = list(branches)
+    results = [None] * len(branches)
+    errors = []  # Ошибки веток (сообщаются после завершения всех дочерних процессов)
+    running = []  # (номер ветки, pid, дескриптор чтения)
+    for index, branch in enumerate(branches):
+        if max_workers is not None and len(running) >= max_workers:
+            _collect(running.pop(0), results, errors)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            _run_branch(branch, args, write)
+        os.close(write)
+        running.append((index, pid, read))
+    for child in running:
+        _collect(child, results, errors)
+    if errors:
+        raise RuntimeError("\n".join(errors))
+    return results
+
+
+def _run_branch(branch, args, write):
+    # Дочерний процесс: выполнение ветки, передача результата и выход без обработчиков родителя
+    status = 1
+    try:
+        try:
+            result = ("ok", branch(*args))
+            data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except BaseException:
+            data = pickle.dumps(("error", traceback.format_exc()))
+        with os.fdopen(write, "wb") as stream:
+            stream.write(data)
+        status = 0
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(status)
+
+
+def _collect(child, results, errors):
+    index, pid, read = child
+    with os.fdopen(read, "rb") as stream:
+        data = stream.read()
+    os.waitpid(pid, 0)
+    if not data:
+        errors.append(f"Ветка {index} завершилась без результата")
+        return
+    status, value = pickle.loads(data)
+    if status == "error":
+        errors.append(f"Ошибка в ветке {index}:\n{value}")
+    else:
+        results[index] = value
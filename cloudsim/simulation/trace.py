@@ -0,0 +1,194 @@
+# Колоночная трасса выполнения задач: события хранятся в массивах NumPy, а не в списках словарей
+import numpy as np
+from cloudsim.entities.entity import entity_uuid
+
+# Типы записей трассы
+TRACE_CLOUDLET = 0  # Выполнение задачи целиком (от первого запуска до завершения)
+TRACE_SLICE = 1  # Один квант выполнения задачи (Round-Robin)
+TRACE_KINDS = ("cloudlet", "slice")
+
+# Столбцы трассы и их типы
+TRACE_COLUMNS = (
+    ("kind", np.int8),  # Тип записи (TRACE_CLOUDLET или TRACE_SLICE)
+    ("cloudlet", np.int64),  # Код идентификатора задачи (см. cloudlet_ids)
+    ("vm", np.int64),  # Код идентификатора VM (см. vm_ids)
+    ("submit_time", np.float64),  # Время поступления задачи
+    ("start_time", np.float64),  # Время начала выполнения
+    ("finish_time", np.float64),  # Время окончания выполнения
+)
+
+
+class TraceRecorder:
+    """
+    Запись событий выполнения задач в заранее выделенные столбцы NumPy.
+
+    Каждая строка записывается сразу в свою позицию заранее выделенных буферов. Буферы растут блоками
+    по chunk_size строк (но не меньше текущей емкости). Идентификаторы задач и VM заменяются целыми
+    кодами; сами идентификаторы хранятся один раз в cloudlet_ids / vm_ids. Экспорт в pandas и
+    Arrow не копирует числовые столбцы.
+
+    При заданном spill_path трасса не хранится целиком: каждые spill_rows строк дописываются в файл Parquet
+    и удаляются из буферов вместе с кодами задач, поэтому память не растет с длиной симуляции (потоковый
+    режим). Задача, которая еще выполняется (например, следующие кванты Round-Robin), после выгрузки получает
+    новый код, поэтому её идентификатор может встречаться в словарях нескольких групп строк файла; при чтении
+    файла (pyarrow.parquet.read_table) значения идентификаторов восстанавливаются по словарю своей группы.
+    В этом режиме arrays() и экспорт содержат только еще не выгруженные строки, а после окончания
+    записи нужно вызвать close().
+    """
+
+    def __init__(self, capacity=65536, chunk_size=65536, spill_path=None, spill_rows=1048576):
+        if capacity <= 0 or chunk_size <= 0 or spill_rows <= 0:
+            raise ValueError("capacity, chunk_size и spill_rows должны быть положительными")
+        self.chunk_size = chunk_size  # Минимальный шаг увеличения буферов
+        self.size = 0  # Количество записанных строк
+        self.columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in TRACE_COLUMNS}
+        self._buffers = tuple(self.columns.values())  # Буферы в порядке TRACE_COLUMNS (для record)
+        self.cloudlet_ids = []  # Идентификаторы задач по коду
+        self.vm_ids = []  # Идентификаторы VM по коду
+        self._cloudlet_codes = {}  # Идентификатор задачи -> код
+        self._vm_codes = {}  # Идентификатор VM -> код
+        self.spill_path = spill_path  # Файл Parquet для выгрузки строк (None - трасса хранится в памяти)
+        self.spill_rows = spill_rows  # Количество строк, при котором буферы выгружаются в файл
+        self.spilled = 0  # Количество строк, уже выгруженных в файл
+        self._writer = None  # pyarrow.parquet.ParquetWriter файла выгрузки
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def capacity(self):
+        return len(self.columns["kind"])
+
+    def _grow(self, required):
+        # Увеличение всех буферов шагами по max(chunk_size, capacity) строк до емкости не меньше required
+        capacity = self.capacity
+        while capacity < required:
+            capacity += max(self.chunk_size, capacity)
+        for name, column in self.columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+        self._buffers = tuple(self.columns.values())
+
+    @staticmethod
+    def _intern(codes, ids, key):
+        # Код идентификатора (новые идентификаторы получают следующий свободный код)
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = len(ids)
+            ids.append(key)
+        return code
+
+    def record(self, kind, cloudlet_id, vm_id, submit_time, start_time, finish_time):
+        # Запись одной строки трассы прямо в буферы
+        cloudlet_code = self._cloudlet_codes.get(cloudlet_id)
+        if cloudlet_code is None:
+            cloudlet_code = self._intern(self._cloudlet_codes, self.cloudlet_ids, cloudlet_id)
+        vm_code = self._vm_codes.get(vm_id)
+        if vm_code is None:
+            vm_code = self._intern(self._vm_codes, self.vm_ids, vm_id)
+        row = self.size
+        if row == len(self._buffers[0]):
+            self._grow(row + 1)
+        kinds, cloudlets, vms, submit_times, start_times, finish_times = self._buffers
+        kinds[row] = kind
+        cloudlets[row] = cloudlet_code
+        vms[row] = vm_code
+        submit_times[row] = submit_time
+        start_times[row] = start_time
+        finish_times[row] = finish_time
+        self.size = row + 1
+        if self.spill_path is not None and self.size >= self.spill_rows:
+            self.spill()
+
+    def spill(self):
+        # Дозапись строк из буферов в файл spill_path и удаление их из памяти
+        import pyarrow.parquet as pq
+        if not self.size:
+            return
+        table = self.to_arrow()
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(str(self.spill_path), table.schema)
+        self._writer.write_table(table)
+        self.spilled += self.size
+        self.clear()
+        # Коды задач забываются: задача, которая еще выполняется, при следующей записи получит новый код
+        # (её идентификатор повторится в словаре следующей группы строк файла)
+        self.cloudlet_ids = []
+        self._cloudlet_codes = {}
+
+    def close(self):
+        # Выгрузка оставшихся строк и закрытие файла выгрузки
+        if self.spill_path is None:
+            return
+        self.spill()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def record_cloudlet(self, cloudlet, vm, start_time, finish_time):
+        # Запись о выполнении задачи целиком
+        self.record(TRACE_CLOUDLET, cloudlet.cloudlet_id, vm.get_id(), cloudlet.submit_time, start_time, finish_time)
+
+    def record_slice(self, cloudlet, vm, start_time, finish_time):
+        # Запись об одном кванте выполнения задачи
+        self.record(TRACE_SLICE, cloudlet.cloudlet_id, vm.get_id(), cloudlet.submit_time, start_time, finish_time)
+
+    def arrays(self):
+        # Записанные строки в виде представлений (views) буферов, без копирования
+        return {name: column[:self.size] for name, column in self.columns.items()}
+
+    def latencies(self, kind=TRACE_CLOUDLET):
+        # Время ожидания и полное время выполнения (turnaround) для записей указанного типа
+        columns = self.arrays()
+        mask = columns["kind"] == kind
+        submit = columns["submit_time"][mask]
+        return columns["start_time"][mask] - submit, columns["finish_time"][mask] - submit
+
+    def clear(self):
+        # Удаление записанных строк (буферы и коды идентификаторов сохраняются)
+        self.size = 0
+
+    @staticmethod
+    def _categories(ids, uuid_ids):
+        # Значения категориальных столбцов идентификаторов (при uuid_ids - UUID сущностей)
+        return [entity_uuid(entity_id) for entity_id in ids] if uuid_ids else ids
+
+    def to_dataframe(self, uuid_ids=False):
+        # DataFrame поверх буферов трассы; идентификаторы - категориальные столбцы по кодам
+        import pandas as pd
+        columns = self.arrays()
+        data = {
+            "kind": pd.Categorical.from_codes(columns.pop("kind"), categories=list(TRACE_KINDS)),
+            "cloudlet_id": pd.Categorical.from_codes(columns.pop("cloudlet"),
+                                                     categories=self._categories(self.cloudlet_ids, uuid_ids)),
+            "vm_id": pd.Categorical.from_codes(columns.pop("vm"), categories=self._categories(self.vm_ids, uuid_ids)),
+        }
+        data.update(columns)
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self, uuid_ids=False):
+        # Таблица pyarrow поверх буферов трассы; идентификаторы - словарные (dictionary) столбцы
+        import pyarrow as pa
+        columns = self.arrays()
+        data = {
+            "kind": pa.DictionaryArray.from_arrays(columns.pop("kind"), pa.array(TRACE_KINDS)),
+            "cloudlet_id": pa.DictionaryArray.from_arrays(columns.pop("cloudlet"),
+                                                          pa.array(self._categories(self.cloudlet_ids, uuid_ids))),
+            "vm_id": pa.DictionaryArray.from_arrays(columns.pop("vm"), pa.array(self._categories(self.vm_ids, uuid_ids))),
+        }
+        data.update({name: pa.array(column) for name, column in columns.items()})
+        return pa.table(data)
+
+    def write_parquet(self, path, uuid_ids=False, **kwargs):
+        # Сохранение трассы в файл Parquet (kwargs передаются в pyarrow.parquet.write_table)
+        import pyarrow.parquet as pq
+        pq.write_table(self.to_arrow(uuid_ids), path, **kwargs)
+
+    def write_ipc(self, path, uuid_ids=False):
+        # Сохранение трассы в файл Arrow IPC (Feather v2)
+        import pyarrow as pa
+        table = self.to_arrow(uuid_ids)
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
@@ -0,0 +1,12 @@
+# Тесты сравнивают расписания нескольких запусков по идентификаторам сущностей, поэтому используют
+# целочисленные идентификаторы (reset_ids перед построением симуляции дает одинаковую нумерацию)
+import pytest
+from cloudsim.entities.entity import get_id_mode, set_id_mode
+
+
+@pytest.fixture(autouse=True)
+def int_ids():
+    mode = get_id_mode()
+    set_id_mode("int")
+    yield
+    set_id_mode(mode)
@@ -0,0 +1,55 @@
+# Выбор хоста брокером без политики размещения: наибольший кортеж свободных ресурсов (RAM, BW, хранилище, PE)
+# среди хостов, на которых VM помещается, при равенстве - первый хост в списке
+import random
+from collections import deque
+import pytest
+from cloudsim.entities.datacenter import Datacenter, DatacenterCharacteristics
+from cloudsim.entities.entity import reset_ids
+from cloudsim.entities.host import Host
+from cloudsim.entities.pe import Pe
+from cloudsim.entities.vm import Vm
+
+
+def expected_host(hosts, vm):
+    fitting = [host for host in hosts if host.has_enough_resources(vm)]
+    return max(fitting, key=lambda host: host.available_resources()) if fitting else None
+
+
+def test_select_host_prefers_ram_then_other_resources():
+    reset_ids()
+    hosts = [Host(4096, 1000, 10000, [Pe(1000) for _ in range(8)]),
+             Host(8192, 500, 5000, [Pe(1000) for _ in range(2)]),
+             Host(8192, 500, 5000, [Pe(1000) for _ in range(4)])]
+    characteristics = DatacenterCharacteristics("x86", "Linux", "Xen", hosts, 10.0, 100.0, 0.1, 0.002, 0.0)
+    datacenter = Datacenter("dc", characteristics, None, deque(), 0)
+    broker = datacenter.broker
+    # Больше всего RAM у хостов 1 и 2; при равных RAM, BW и хранилище решает число PE
+    assert broker.select_host(Vm(0, 500, 1, 512, 100, 1000, "Xen")) is hosts[2]
+    # На хостах 1 и 2 не хватает хранилища: выбирается хост с меньшей RAM
+    assert broker.select_host(Vm(0, 500, 1, 512, 100, 8000, "Xen")) is hosts[0]
+    # Никому не хватает RAM
+    assert broker.select_host(Vm(0, 500, 1, 16384, 100, 1000, "Xen")) is None
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_select_host_matches_linear_scan(seed):
+    rng = random.Random(seed)
+    reset_ids()
+    hosts = [Host(rng.choice([2048, 4096, 8192]), rng.choice([1000, 2000]), rng.choice([5000, 10000]),
+                  [Pe(1000) for _ in range(rng.randint(1, 8))]) for _ in range(20)]
+    characteristics = DatacenterCharacteristics("x86", "Linux", "Xen", hosts, 10.0, 100.0, 0.1, 0.002, 0.0)
+    datacenter = Datacenter("dc", characteristics, None, deque(), 0)
+    broker = datacenter.broker
+    placed = []
+    for _ in range(500):
+        if placed and rng.random() < 0.4:
+            broker.release_vm(placed.pop(rng.randrange(len(placed))))
+            continue
+        vm = Vm(0, 500, rng.randint(0, 4), rng.choice([256, 512, 1024, 2048]), rng.choice([100, 500]),
+                rng.choice([500, 1000, 4000]), "Xen")
+        host = expected_host(hosts, vm)
+        assert broker.select_host(vm) is host
+        if host is not None:
+            broker.assign_vm_to_host(vm)
+            assert vm.host is host
+            placed.append(vm)
@@ -0,0 +1,67 @@
+# CloudletBatch: преобразование в объекты Cloudlet и обратно, выполнение пакета и списка задач
+import numpy as np
+import pytest
+from cloudsim.entities.cloudlet import Cloudlet
+from cloudsim.entities.cloudlet_batch import CloudletBatch
+from cloudsim.entities.entity import reset_ids
+from cloudsim.simulation.cloudlet import CloudletExecution
+from cloudsim.simulation.experiment import DEFAULT_DATACENTER_CONFIG, build_datacenter
+
+ATTRIBUTES = ("length", "pes_number", "file_size", "output_size", "submit_time")
+
+
+def attributes(cloudlets):
+    return [tuple(getattr(cloudlet, name) for name in ATTRIBUTES) for cloudlet in cloudlets]
+
+
+def test_round_trip_preserves_attributes():
+    cloudlets = [Cloudlet(length, pes, file_size, output_size)
+                 for length, pes, file_size, output_size in [(5, 1, 100, 30), (12, 2, 480, 150), (1, 1, 250, 90)]]
+    for submit_time, cloudlet in zip([0.0, 2.5, 7.0], cloudlets):
+        cloudlet.submit_time = submit_time
+    batch = CloudletBatch.from_cloudlets(cloudlets)
+    assert attributes(batch) == attributes(cloudlets)
+    assert attributes(batch.to_cloudlets()) == attributes(cloudlets)
+    assert attributes(CloudletBatch.from_cloudlets(batch)) == attributes(cloudlets)
+    # Идентификаторы пакета - последовательный диапазон
+    assert np.diff(batch.cloudlet_id).tolist() == [1, 1]
+
+
+def test_generate_is_reproducible():
+    config = {"length": {"distribution": "exponential", "scale": 5, "round": True, "min": 1}, "pes_number": 2}
+    first = CloudletBatch.generate(1000, seed=3, config=config)
+    second = CloudletBatch.generate(1000, seed=3, config=config)
+    assert attributes(first) == attributes(second)
+    assert first.length.min() >= 1 and (first.pes_number == 2).all()
+    with pytest.raises(ValueError):
+        CloudletBatch.generate(10, config={"length": [1, 2, 3]})
+
+
+def test_view_updates_columns():
+    reset_ids()
+    batch = CloudletBatch.generate(3, seed=0)
+    datacenter = build_datacenter(DEFAULT_DATACENTER_CONFIG)
+    view = batch[-1]
+    view.set_vm(datacenter.vm_list[1])
+    assert view.get_status() == "Running" and view.get_vm() is datacenter.vm_list[1]
+    view.finish_time = 4.0
+    assert batch.status.tolist() == [0, 0, 2] and batch.finish_time[2] == 4.0
+    assert batch.vm_ids() == [None, None, datacenter.vm_list[1].get_id()]
+    with pytest.raises(IndexError):
+        batch[3]
+
+
+@pytest.mark.parametrize("scheduler", ["FCFS", "SJF", "PS"])
+def test_batch_runs_like_cloudlet_list(scheduler):
+    def run(cloudlets):
+        reset_ids()
+        datacenter = build_datacenter(DEFAULT_DATACENTER_CONFIG)
+        execution = CloudletExecution(scheduler, cloudlets, datacenter, dispatch="event", verbosity="off",
+                                      scheduler_options={"seed": 0} if scheduler == "PS" else None)
+        execution.execute()
+        vm_indices = {vm.get_id(): index for index, vm in enumerate(datacenter.vm_list)}
+        return execution.makespan, [(vm_indices[cloudlet.get_vm().get_id()], cloudlet.finish_time)
+                                    for cloudlet in cloudlets]
+
+    batch = CloudletBatch.generate(200, seed=5)
+    assert run(batch) == run(batch.to_cloudlets())
@@ -0,0 +1,44 @@
+# Режим "event" должен давать то же расписание, что и опрос свободных VM ("polling"), там, где порядок выдачи
+# VM в режимах совпадает
+import pytest
+from cloudsim.entities.entity import reset_ids
+from cloudsim.entities.cloudlet import Cloudlet
+from cloudsim.simulation.cloudlet import CloudletExecution
+from cloudsim.simulation.experiment import DEFAULT_DATACENTER_CONFIG, build_datacenter, generate_cloudlets
+
+# Одинаковые VM: опрашивающая задача берет первую освободившуюся VM, как и при передаче VM в режиме "event".
+# Задачи длиннее одной единицы времени: задача длины 1 освобождает VM уже после того, как опрос в этот момент прошел.
+DATACENTER_CONFIG = {
+    **DEFAULT_DATACENTER_CONFIG,
+    "hosts": [{"count": 2, "ram": 8192, "bw": 20000, "storage": 1000000, "pes": 8, "mips": 1000}],
+    "vms": [{"count": 5, "mips": 500, "pes_number": 2, "ram": 1024, "bw": 2000, "size": 10000, "vmm": "Xen"}],
+}
+WORKLOAD_CONFIG = {"num_cloudlets": 300, "length": [2, 15]}
+
+
+def run_schedule(scheduler, dispatch, seed):
+    # Расписание (задача, VM, окончание) и итоговые метрики одной симуляции
+    reset_ids()
+    cloudlets = generate_cloudlets(seed, WORKLOAD_CONFIG)
+    execution = CloudletExecution(scheduler, cloudlets, build_datacenter(DATACENTER_CONFIG), dispatch=dispatch,
+                                  verbosity="off")
+    execution.execute()
+    schedule = [(cloudlet.cloudlet_id, cloudlet.get_vm().get_id(), cloudlet.finish_time) for cloudlet in cloudlets]
+    return execution.makespan, schedule, execution.scheduler_instance.metrics.run_summary()
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("scheduler", ["FCFS", "SJF"])
+def test_event_dispatch_matches_polling(scheduler, seed):
+    assert run_schedule(scheduler, "event", seed) == run_schedule(scheduler, "polling", seed)
+
+
+@pytest.mark.parametrize("dispatch", ["polling", "event"])
+def test_unfit_cloudlet_is_rejected(dispatch):
+    reset_ids()
+    cloudlets = generate_cloudlets(0, {"num_cloudlets": 20})
+    cloudlets.append(Cloudlet(length=5, pes_number=64, file_size=100, output_size=30))
+    execution = CloudletExecution("FCFS", cloudlets, build_datacenter(DATACENTER_CONFIG), dispatch=dispatch,
+                                  verbosity="off")
+    with pytest.raises(ValueError):
+        execution.execute()
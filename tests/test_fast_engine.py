@@ -0,0 +1,75 @@
+# Быстрый движок (ListSchedulingEngine) должен давать то же расписание, что и процессы SimPy
+import random
+import pytest
+from cloudsim.entities.cloudlet import Cloudlet
+from cloudsim.entities.entity import reset_ids
+from cloudsim.simulation.cloudlet import CloudletExecution
+from cloudsim.simulation.experiment import DEFAULT_DATACENTER_CONFIG, build_datacenter, generate_cloudlets
+
+# Несколько классов VM на двух хостах, чтобы выбор VM (first_fit/best_fit) и ожидание были нетривиальными
+DATACENTER_CONFIG = {
+    **DEFAULT_DATACENTER_CONFIG,
+    "hosts": [{"count": 2, "ram": 8192, "bw": 20000, "storage": 1000000, "pes": 8, "mips": 1000}],
+    "vms": [
+        {"count": 2, "mips": 500, "pes_number": 1, "ram": 819.2, "bw": 2000, "size": 10000, "vmm": "Xen"},
+        {"count": 2, "mips": 175, "pes_number": 2, "ram": 512, "bw": 2000, "size": 10000, "vmm": "Xen"},
+        {"count": 1, "mips": 125, "pes_number": 2, "ram": 2048, "bw": 2000, "size": 10000, "vmm": "Xen"},
+    ],
+}
+WORKLOAD_CONFIG = {"num_cloudlets": 300}
+
+
+def run_schedule(scheduler, engine, dispatch, vm_selection, seed, float_lengths=False):
+    # Расписание (задача, VM, окончание) и итоговые метрики одной симуляции
+    reset_ids()
+    cloudlets = generate_cloudlets(seed, WORKLOAD_CONFIG)
+    if float_lengths:
+        # Дробные длины: завершения попадают между раундами опроса и совпадают по времени реже
+        rng = random.Random(seed)
+        for cloudlet in cloudlets:
+            cloudlet.length *= rng.choice([0.25, 0.3, 0.5, 1.0, 1.1])
+    execution = CloudletExecution(scheduler, cloudlets, build_datacenter(DATACENTER_CONFIG), dispatch=dispatch,
+                                  vm_selection=vm_selection, verbosity="off", engine=engine)
+    execution.execute()
+    schedule = [(cloudlet.cloudlet_id, cloudlet.get_vm().get_id(), cloudlet.finish_time) for cloudlet in cloudlets]
+    return execution.makespan, schedule, execution.scheduler_instance.metrics.run_summary()
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("vm_selection", ["first_fit", "best_fit"])
+@pytest.mark.parametrize("dispatch", ["polling", "event"])
+@pytest.mark.parametrize("scheduler", ["FCFS", "SJF"])
+def test_fast_engine_matches_simpy(scheduler, dispatch, vm_selection, seed):
+    simpy_result = run_schedule(scheduler, "simpy", dispatch, vm_selection, seed)
+    fast_result = run_schedule(scheduler, "fast", dispatch, vm_selection, seed)
+    assert fast_result == simpy_result
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+@pytest.mark.parametrize("vm_selection", ["first_fit", "best_fit"])
+@pytest.mark.parametrize("dispatch", ["polling", "event"])
+@pytest.mark.parametrize("scheduler", ["FCFS", "SJF"])
+def test_fast_engine_matches_simpy_with_float_lengths(scheduler, dispatch, vm_selection, seed):
+    simpy_result = run_schedule(scheduler, "simpy", dispatch, vm_selection, seed, float_lengths=True)
+    fast_result = run_schedule(scheduler, "fast", dispatch, vm_selection, seed, float_lengths=True)
+    assert fast_result == simpy_result
+
+
+@pytest.mark.parametrize("dispatch", ["polling", "event"])
+@pytest.mark.parametrize("engine", ["simpy", "fast"])
+def test_unfit_cloudlet_is_rejected(engine, dispatch):
+    # Задача, которой не хватает PE ни на одной VM, отвергается одинаково в обоих движках и режимах
+    reset_ids()
+    cloudlets = generate_cloudlets(0, {"num_cloudlets": 20})
+    cloudlets.insert(5, Cloudlet(length=5, pes_number=16, file_size=100, output_size=30))
+    execution = CloudletExecution("FCFS", cloudlets, build_datacenter(DATACENTER_CONFIG), dispatch=dispatch,
+                                  verbosity="off", engine=engine)
+    with pytest.raises(ValueError, match=str(cloudlets[5].cloudlet_id)):
+        execution.execute()
+
+
+def test_fast_engine_rejects_unsupported_scheduler():
+    reset_ids()
+    with pytest.raises(ValueError):
+        CloudletExecution("RoundRobin", generate_cloudlets(0, WORKLOAD_CONFIG), build_datacenter(DATACENTER_CONFIG),
+                          verbosity="off", engine="fast")
@@ -0,0 +1,22 @@
+# Результаты федерации не должны зависеть от числа процессов
+import pandas as pd
+import pytest
+from cloudsim.simulation.experiment import DEFAULT_DATACENTER_CONFIG
+from cloudsim.simulation.federation import FederationRunner
+
+
+@pytest.mark.parametrize("forward", ["overflow", "random"])
+def test_results_do_not_depend_on_number_of_workers(forward):
+    configs = [{**DEFAULT_DATACENTER_CONFIG, "name": f"dc{index}"} for index in range(4)]
+    latency = [[0.0 if i == j else 0.5 + 0.25 * abs(i - j) for j in range(4)] for i in range(4)]
+    results = []
+    for n_workers in (0, 2):
+        runner = FederationRunner(configs, "FCFS", latency=latency, arrival_rate=0.5, cloudlets=150, forward=forward,
+                                  forward_threshold=2, forward_probability=0.3, seed=3, n_workers=n_workers)
+        results.append((runner.run(), runner.stats))
+    (local, local_stats), (parallel, parallel_stats) = results
+    assert local["forwarded"].sum() > 0  # Задачи действительно передавались между датацентрами
+    assert local["received"].sum() == local["forwarded"].sum()
+    pd.testing.assert_frame_equal(local, parallel)
+    for key in ("windows", "messages", "makespan"):
+        assert local_stats[key] == parallel_stats[key]
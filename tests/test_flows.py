@@ -0,0 +1,44 @@
+# Max-min справедливое разделение полосы между потоками, посчитанное вручную
+import pytest
+import simpy
+from cloudsim.network.flows import FlowNetwork
+from cloudsim.network.topology import NetworkTopology
+
+
+def shared_link_network():
+    # Канал A -> B (12) общий для всех потоков, канал B -> C (4) - только для потоков в C
+    topology = NetworkTopology()
+    topology.add_link("A", "B", 12)
+    topology.add_link("B", "C", 4)
+    env = simpy.Environment()
+    return env, FlowNetwork(env, topology)
+
+
+def finish_times(env, events):
+    times = [None] * len(events)
+    for index, event in enumerate(events):
+        event.callbacks.append(lambda _, index=index: times.__setitem__(index, env.now))
+    env.run()
+    return times
+
+
+def test_max_min_rates_on_shared_link():
+    env, network = shared_link_network()
+    events = [network.transfer("A", "B", 80), network.transfer("A", "C", 4), network.transfer("A", "C", 20)]
+    # Потоки в C делят канал B -> C (по 2), поток в B получает остаток канала A -> B (12 - 2 - 2 = 8)
+    assert [flow.rate for flow in network.flows] == pytest.approx([8, 2, 2])
+    # t = 2: второй поток завершен, третий получает весь канал B -> C (4), первый - 12 - 4 = 8;
+    # t = 6: третий поток завершен (16 / 4), первый получает весь канал A -> B: 80 - 48 = 32 за 32 / 12
+    assert finish_times(env, events) == pytest.approx([6 + 32 / 12, 2, 6])
+    assert network.report()["transfers"] == 3
+    assert network.report()["volume"] == 104
+
+
+def test_rate_limit_leaves_bandwidth_to_other_flows():
+    env, network = shared_link_network()
+    network.transfer("A", "B", 80, rate_limit=3)
+    network.transfer("A", "C", 4)
+    network.transfer("A", "B", 20)
+    # Равная доля канала A -> B (4) выше ограничения первого потока (3): второй поток ограничен каналом B -> C (4),
+    # третьему остается 12 - 3 - 4 = 5
+    assert [flow.rate for flow in network.flows] == pytest.approx([3, 4, 5])
@@ -0,0 +1,52 @@
+# Взвешенные по времени метрики загрузки VM и хоста на примере из двух задач, посчитанном вручную
+import pytest
+from cloudsim.entities.cloudlet import Cloudlet
+from cloudsim.entities.entity import reset_ids
+from cloudsim.simulation.cloudlet import CloudletExecution
+from cloudsim.simulation.experiment import DEFAULT_DATACENTER_CONFIG, build_datacenter
+
+DATACENTER_CONFIG = {
+    **DEFAULT_DATACENTER_CONFIG,
+    "hosts": [{"count": 1, "ram": 4000, "bw": 10000, "storage": 4000, "pes": 4, "mips": 1000}],
+    "vms": [{"count": 1, "mips": 1000, "pes_number": 2, "ram": 1000, "bw": 1000, "size": 1000, "vmm": "Xen"}],
+}
+
+
+def run_two_cloudlets(dispatch):
+    # Задача A (1 PE, RAM 500, хранилище 100) выполняется в [0, 4], VM простаивает в [4, 6],
+    # задача B (2 PE, RAM 250, хранилище 400) поступает в момент 6 и выполняется в [6, 8]
+    reset_ids()
+    first = Cloudlet(length=4, pes_number=1, file_size=500, output_size=100)
+    second = Cloudlet(length=2, pes_number=2, file_size=250, output_size=400)
+    second.submit_time = 6.0
+    datacenter = build_datacenter(DATACENTER_CONFIG)
+    execution = CloudletExecution("FCFS", iter([first, second]), datacenter, dispatch=dispatch, verbosity="off")
+    execution.execute()
+    return execution, datacenter
+
+
+@pytest.mark.parametrize("dispatch", ["polling", "event"])
+def test_time_weighted_vm_and_host_utilization(dispatch):
+    execution, datacenter = run_two_cloudlets(dispatch)
+    metrics = execution.scheduler_instance.metrics
+    vm = datacenter.vm_list[0]
+    assert execution.makespan == 8
+    assert metrics.vm_summary(vm.get_id()) == pytest.approx({
+        "busy_time": 6.0,
+        "busy_fraction": 6 / 8,
+        "mean_pe_utilization": (0.5 * 4 + 1.0 * 2) / 8,
+        "mean_ram_utilization": (0.5 * 4 + 0.25 * 2) / 8,
+        "mean_storage_utilization": (0.1 * 4 + 0.4 * 2) / 8,
+        "p95_pe_utilization": 1.0,  # Загрузка 0 - 2 единицы времени, 50% - 4, 100% - 2
+        "completed": 2,
+        "throughput": 2 / 8,
+        "mean_wait_time": 0.0,
+        "mean_turnaround_time": (4 + 2) / 2,
+    })
+    assert metrics.vms[vm.get_id()].percentile(50, 8) == 0.5
+    host_summary = metrics.host_summary(vm.host.host_id)
+    assert host_summary["mean_pe_utilization"] == pytest.approx((1 / 4 * 4 + 2 / 4 * 2) / 8)
+    assert host_summary["mean_ram_utilization"] == pytest.approx((500 * 4 + 250 * 2) / 4000 / 8)
+    assert host_summary["busy_time"] == 6.0
+    assert metrics.run_summary() == pytest.approx({"makespan": 8, "completed": 2, "throughput": 2 / 8,
+                                                   "mean_wait_time": 0.0, "mean_turnaround_time": 3.0})
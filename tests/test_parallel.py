@@ -0,0 +1,45 @@
+# Параллельное вычисление целевой функции PSO должно давать тот же результат, что и последовательное
+import multiprocessing
+import numpy as np
+import pytest
+from cloudsim.schedulers.pso.PS import Particle, ParticleSwarmOptimizer, VectorizedParticleSwarmOptimizer
+from cloudsim.schedulers.pso.parallel import ParallelEvaluator
+
+PSO_CONFIG = {"num_particles": 7, "num_iterations": 6, "inertia": 0.5, "cognitive": 2, "social": 2,
+              "bounds": [[-10, 10]] * 3}
+
+
+def noisy_sphere(position, rng):
+    # Целевая функция с шумом: результат зависит от генератора частицы
+    return float(np.sum(np.asarray(position) ** 2) + rng.normal())
+
+
+def batch_sphere(positions):
+    return np.sum(positions ** 2, axis=1)
+
+
+@pytest.mark.parametrize("chunksize", [None, 1, 3])
+@pytest.mark.parametrize("kind", ["classic", "vectorized"])
+def test_parallel_optimize_matches_serial(kind, chunksize):
+    def run(n_workers):
+        if kind == "vectorized":
+            optimizer = VectorizedParticleSwarmOptimizer(noisy_sphere, config=PSO_CONFIG, seed=0)
+        else:
+            optimizer = ParticleSwarmOptimizer(Particle, noisy_sphere, config=PSO_CONFIG, seed=0)
+        return optimizer.optimize(save_iterations=True, n_workers=n_workers, chunksize=chunksize, seed=11)
+
+    serial = run(None)
+    for serial_result, parallel_result in zip(serial, run(2)):
+        np.testing.assert_array_equal(serial_result, parallel_result)
+
+
+def test_parallel_batched_objective_matches_serial():
+    positions = np.random.default_rng(0).uniform(-10, 10, (10, 4))
+    with ParallelEvaluator(batch_sphere, n_workers=3, chunksize=4, batched=True) as evaluate:
+        np.testing.assert_array_equal(evaluate(positions, 2), batch_sphere(positions))
+
+
+def test_spawn_rejects_unpicklable_objective():
+    evaluator = ParallelEvaluator(lambda position: 0.0, n_workers=2, mp_context=multiprocessing.get_context("spawn"))
+    with pytest.raises(TypeError):
+        evaluator.start()
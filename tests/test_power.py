@@ -0,0 +1,79 @@
+# Модели мощности, энергия хостов и политика размещения VM "power_aware"
+from collections import deque
+import numpy as np
+import pytest
+from cloudsim.entities.cloudlet import Cloudlet
+from cloudsim.entities.datacenter import Datacenter, DatacenterCharacteristics
+from cloudsim.entities.entity import reset_ids
+from cloudsim.entities.host import Host
+from cloudsim.entities.pe import Pe
+from cloudsim.entities.power_model import PowerModel, PowerModelLinear, PowerModelSpecPower
+from cloudsim.entities.vm import Vm
+from cloudsim.entities.vm_allocation_policy import VmAllocationPolicyPowerAware, host_capacity_matrix
+from cloudsim.simulation.cloudlet import CloudletExecution
+
+
+class QuadraticPowerModel(PowerModel):
+    # Пользовательская модель без векторной версии powers
+    def power(self, utilization):
+        return 50 + 150 * utilization * utilization
+
+
+def make_host(power_model, pes=8):
+    return Host(100000, 100000, 10 ** 7, [Pe(1000) for _ in range(pes)], power_model)
+
+
+def make_datacenter(hosts, policy, vm_pes):
+    characteristics = DatacenterCharacteristics("x86", "Linux", "Xen", hosts, 10.0, 100.0, 0.1, 0.002, 0.0)
+    datacenter = Datacenter("dc", characteristics, policy, deque(), 0)
+    datacenter.set_vms([Vm(datacenter.get_broker_id(), 500, pes, 1000, 10, 10000, "Xen") for pes in vm_pes])
+    return datacenter
+
+
+def test_spec_power_powers_matches_power():
+    model = PowerModelSpecPower([100, 180, 190, 250, 400])
+    utilization = np.linspace(0, 1, 41)
+    assert model.powers(utilization).tolist() == [model.power(value) for value in utilization]
+
+
+def test_power_aware_scores_use_host_power_models():
+    # Таблица из 5 точек и пользовательская модель: оценка - точный прирост power(), а не интерполяция по сетке
+    reset_ids()
+    models = [PowerModelSpecPower([100, 180, 190, 250, 400]), QuadraticPowerModel(), PowerModelLinear(300)]
+    hosts = [make_host(model) for model in models]
+    policy = VmAllocationPolicyPowerAware()
+    policy.prepare(hosts)
+    capacity = host_capacity_matrix(hosts)
+    used = np.zeros_like(capacity)
+    used[0] = [1000, 10, 10000, 3]
+    used[2] = [2000, 20, 20000, 5]  # Хост 1 пуст: размещение на нем стоит и мощности простоя
+    demand = np.array([1000, 10, 10000, 2], dtype=float)
+    scores = policy.score(capacity - used, capacity, demand, np.arange(len(hosts)))
+    expected = [models[0].power(5 / 8) - models[0].power(3 / 8), models[1].power(2 / 8),
+                models[2].power(7 / 8) - models[2].power(5 / 8)]
+    np.testing.assert_allclose(scores, expected)
+
+
+def test_power_aware_packs_vms_onto_efficient_hosts():
+    reset_ids()
+    hosts = [make_host(PowerModelLinear(300)), make_host(PowerModelLinear(150)), make_host(PowerModelLinear(150))]
+    datacenter = make_datacenter(hosts, "power_aware", [2, 2, 2, 2, 2])
+    # Экономичный хост заполняется первым (4 VM по 2 PE), пятая VM включает второй экономичный хост
+    assert [hosts.index(vm.host) for vm in datacenter.vm_list] == [1, 1, 1, 1, 2]
+
+
+def test_power_aware_requires_power_models():
+    reset_ids()
+    with pytest.raises(ValueError):
+        make_datacenter([make_host(None), make_host(PowerModelLinear(200))], "power_aware", [1])
+
+
+def test_linear_energy_of_two_cloudlets():
+    # Хост из 4 PE: 10 единиц времени занят 1 PE (155 Вт), затем 10 единиц - 2 PE (170 Вт)
+    reset_ids()
+    datacenter = make_datacenter([make_host({"model": "linear", "max_power": 200}, pes=4)], None, [2])
+    execution = CloudletExecution("FCFS", [Cloudlet(10, 1, 1, 1), Cloudlet(10, 2, 1, 1)], datacenter,
+                                  verbosity="off")
+    execution.execute()
+    run = execution.create_summary_dataset(level="run")
+    assert run[["makespan", "energy", "mean_power"]].values.tolist() == [[20.0, 3250.0, 162.5]]
@@ -0,0 +1,102 @@
+# Рой PSOCloudletScheduler должен улучшать жадное распределение, которым инициализируется одна из частиц
+import numpy as np
+import pytest
+from cloudsim.entities.entity import reset_ids
+from cloudsim.schedulers.pso.PS import Particle, ParticleSwarmOptimizer, VectorizedParticleSwarmOptimizer
+from cloudsim.simulation.cloudlet import CloudletExecution
+from cloudsim.simulation.experiment import (DEFAULT_DATACENTER_CONFIG, DEFAULT_WORKLOAD_CONFIG, build_datacenter,
+                                            generate_cloudlets)
+
+# Задачи с одним PE помещаются на любую VM, поэтому нагрузку можно перераспределять между всеми VM
+# (задачи с двумя PE помещаются только на VM с двумя PE, и её нагрузка фиксирует makespan).
+WORKLOAD_CONFIG = {**DEFAULT_WORKLOAD_CONFIG, "num_cloudlets": 40, "length": [1, 50], "pes_number": [1, 1]}
+
+
+def run_pso(cloudlets, seed=0, **options):
+    execution = CloudletExecution("PS", cloudlets, build_datacenter(DEFAULT_DATACENTER_CONFIG), verbosity="off",
+                                  scheduler_options={"seed": seed, **options})
+    execution.execute()
+    return execution
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_swarm_improves_on_greedy_seed(seed):
+    reset_ids()
+    cloudlets = generate_cloudlets(seed, WORKLOAD_CONFIG)
+    scheduler = run_pso(cloudlets, seed).scheduler_instance
+    feasible = scheduler.feasibility_matrix(cloudlets)
+    runtimes = scheduler.runtime_matrix(cloudlets)
+    greedy_value = scheduler.fitness(scheduler.greedy_mapping(feasible, runtimes)[None, :], runtimes)[0]
+    values = scheduler.best_values_per_iteration
+    assert values[0] <= greedy_value
+    assert values[-1] < values[0]
+    assert (np.diff(values) <= 0).all()
+    # Лучшее значение роя - значение выполненного распределения
+    assert scheduler.fitness(scheduler.mapping[None, :], runtimes)[0] == pytest.approx(scheduler.best_fitness)
+    loads = np.bincount(scheduler.mapping, weights=runtimes[np.arange(len(cloudlets)), scheduler.mapping],
+                        minlength=len(scheduler.vm_list))
+    assert max(cloudlet.finish_time for cloudlet in cloudlets) == loads.max()
+
+
+def test_encode_inverts_decode():
+    reset_ids()
+    cloudlets = generate_cloudlets(0, DEFAULT_WORKLOAD_CONFIG)
+    scheduler = run_pso(cloudlets).scheduler_instance
+    feasible = scheduler.feasibility_matrix(cloudlets)
+    counts = feasible.sum(axis=1)
+    feasible_vms = np.argsort(~feasible, axis=1, kind='stable')
+    mapping = scheduler.greedy_mapping(feasible, scheduler.runtime_matrix(cloudlets))
+    positions = scheduler.encode(mapping, feasible_vms, counts)
+    assert (scheduler.decode(positions[None, :], feasible_vms, counts)[0] == mapping).all()
+    assert feasible[np.arange(len(cloudlets)), scheduler.mapping].all()
+
+
+def test_empty_workload_prints_summary(capsys):
+    execution = CloudletExecution("PS", [], build_datacenter(DEFAULT_DATACENTER_CONFIG), verbosity="summary")
+    execution.execute()
+    assert "PSO best fitness" in capsys.readouterr().out
+
+
+def sphere(position):
+    return float(np.sum(np.asarray(position) ** 2))
+
+
+PSO_CONFIG = {"num_particles": 8, "num_iterations": 15, "inertia": 0.5, "cognitive": 2, "social": 2,
+              "bounds": [[-10, 10]] * 3}
+
+
+def create_optimizer(kind, seed):
+    if kind == "vectorized":
+        return VectorizedParticleSwarmOptimizer(sphere, config=PSO_CONFIG, seed=seed)
+    return ParticleSwarmOptimizer(Particle, sphere, config=PSO_CONFIG, seed=seed)
+
+
+@pytest.mark.parametrize("kind", ["classic", "vectorized"])
+def test_optimizer_uses_its_own_generator(kind):
+    # Результат определяется seed оптимизатора и не зависит от глобального np.random (и не меняет его)
+    np.random.seed(1)
+    global_state = np.random.get_state()[1].copy()
+    first = create_optimizer(kind, 3).optimize(save_iterations=True)
+    np.random.seed(2)
+    second = create_optimizer(kind, 3).optimize(save_iterations=True)
+    np.random.seed(1)
+    assert (np.random.get_state()[1] == global_state).all()
+    for first_result, second_result in zip(first, second):
+        np.testing.assert_array_equal(first_result, second_result)
+    assert first[1] < first[2][0]
+
+
+@pytest.mark.parametrize("kind", ["classic", "vectorized"])
+def test_resume_from_checkpoint_matches_uninterrupted_run(kind, tmp_path):
+    expected = create_optimizer(kind, 5).optimize(save_iterations=True)
+    checkpoint = str(tmp_path / "pso.npz")
+    interrupted = create_optimizer(kind, 5)
+    interrupted.optimize(save_iterations=True, max_evaluations=6 * PSO_CONFIG["num_particles"],
+                         checkpoint_path=checkpoint, checkpoint_every=4)
+    assert interrupted.stop_reason == "max_evaluations" and interrupted.iterations_completed == 6
+    # Другой seed: состояние роя и генератора полностью берется из контрольной точки
+    resumed = create_optimizer(kind, 99)
+    result = resumed.optimize(save_iterations=True, resume_from=checkpoint)
+    assert resumed.iterations_completed == PSO_CONFIG["num_iterations"]
+    for expected_result, result_value in zip(expected, result):
+        np.testing.assert_array_equal(expected_result, result_value)
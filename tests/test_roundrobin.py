@@ -0,0 +1,66 @@
+# Round-Robin с очередью готовых задач ("ready_queue") и исходный пакетный режим ("batched")
+import pytest
+from cloudsim.entities.cloudlet import Cloudlet
+from cloudsim.entities.entity import reset_ids
+from cloudsim.simulation.cloudlet import CloudletExecution
+from cloudsim.simulation.experiment import DEFAULT_DATACENTER_CONFIG, build_datacenter, generate_cloudlets
+from cloudsim.simulation.trace import TRACE_SLICE, TraceRecorder
+
+DATACENTER_CONFIG = {
+    **DEFAULT_DATACENTER_CONFIG,
+    "hosts": [{"count": 2, "ram": 8192, "bw": 20000, "storage": 1000000, "pes": 8, "mips": 1000}],
+    "vms": [
+        {"count": 2, "mips": 500, "pes_number": 2, "ram": 1024, "bw": 2000, "size": 10000, "vmm": "Xen"},
+        {"count": 3, "mips": 250, "pes_number": 2, "ram": 512, "bw": 2000, "size": 10000, "vmm": "Xen"},
+    ],
+}
+SINGLE_VM_CONFIG = {
+    **DEFAULT_DATACENTER_CONFIG,
+    "vms": [{"count": 1, "mips": 500, "pes_number": 2, "ram": 1024, "bw": 2000, "size": 10000, "vmm": "Xen"}],
+}
+
+
+def run_slices(cloudlets, datacenter_config, rr_mode, dispatch="polling"):
+    # Кванты (задача, VM, начало, окончание) в порядке записи
+    trace = TraceRecorder()
+    execution = CloudletExecution("RoundRobin", cloudlets, build_datacenter(datacenter_config), dispatch=dispatch,
+                                  verbosity="off", trace=trace, scheduler_options={"rr_mode": rr_mode})
+    execution.execute()
+    columns = trace.arrays()
+    rows = zip(columns["kind"].tolist(), columns["cloudlet"].tolist(), columns["vm"].tolist(),
+               columns["start_time"].tolist(), columns["finish_time"].tolist())
+    return [(trace.cloudlet_ids[cloudlet], trace.vm_ids[vm], start, finish)
+            for kind, cloudlet, vm, start, finish in rows if kind == TRACE_SLICE]
+
+
+@pytest.mark.parametrize("dispatch", ["polling", "event"])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_ready_queue_matches_batched_slices(seed, dispatch):
+    # Задач не больше, чем VM: пакетный режим запускает их одним пакетом, и каждая задача выполняет кванты
+    # без ожидания - как и в очереди готовых задач. VM кванта может отличаться: в пакетном режиме задача после
+    # кванта берет первую свободную VM, а в очереди готовых задач остается на своей.
+    slices = {}
+    for rr_mode in ("batched", "ready_queue"):
+        reset_ids()
+        cloudlets = generate_cloudlets(seed, {"num_cloudlets": 5})
+        slices[rr_mode] = sorted((cloudlet, start, finish) for cloudlet, _, start, finish
+                                 in run_slices(cloudlets, DATACENTER_CONFIG, rr_mode, dispatch))
+    assert slices["ready_queue"] == slices["batched"]
+
+
+def test_ready_queue_rotates_cloudlets():
+    # Одна VM, квант 2: задачи сменяют друг друга после каждого кванта в порядке очереди
+    reset_ids()
+    cloudlets = [Cloudlet(length, 1, 100, 30) for length in (3, 5, 1)]
+    first, second, third = (cloudlet.cloudlet_id for cloudlet in cloudlets)
+    slices = run_slices(cloudlets, SINGLE_VM_CONFIG, "ready_queue")
+    assert [(cloudlet, start, finish) for cloudlet, _, start, finish in slices] == [
+        (first, 0, 2), (second, 2, 4), (third, 4, 5), (first, 5, 6), (second, 6, 8), (second, 8, 9)]
+    assert [cloudlet.finish_time for cloudlet in cloudlets] == [6, 9, 5]
+
+
+def test_ready_queue_rejects_unfit_cloudlet():
+    reset_ids()
+    cloudlets = [Cloudlet(4, 1, 100, 30), Cloudlet(4, 8, 100, 30)]
+    with pytest.raises(ValueError):
+        run_slices(cloudlets, SINGLE_VM_CONFIG, "ready_queue")
@@ -0,0 +1,64 @@
+# Приостановленная и продолженная (в том числе из снимка или ветки fork) симуляция должна давать те же результаты,
+# что и симуляция без паузы
+import os
+import pytest
+from cloudsim.entities.entity import reset_ids
+from cloudsim.simulation.cloudlet import CloudletExecution
+from cloudsim.simulation.experiment import build_datacenter, generate_cloudlets
+from cloudsim.simulation.snapshot import fork_branches, restore, snapshot
+
+WORKLOAD_CONFIG = {"num_cloudlets": 200}
+PAUSE_AT = 150
+READY_QUEUE = {"rr_mode": "ready_queue"}
+
+
+def create_execution(scheduler, scheduler_options=None):
+    reset_ids()
+    return CloudletExecution(scheduler, generate_cloudlets(0, WORKLOAD_CONFIG), build_datacenter({}),
+                             verbosity="off", scheduler_options=scheduler_options)
+
+
+def finish(execution):
+    # Продолжение симуляции до конца; результат - makespan, расписание задач и итоговые метрики
+    execution.execute()
+    schedule = [(cloudlet.cloudlet_id, cloudlet.get_vm().get_id(), cloudlet.finish_time)
+                for cloudlet in execution.cloudlet_list]
+    return execution.makespan, schedule, execution.scheduler_instance.metrics.run_summary()
+
+
+@pytest.mark.parametrize("scheduler, options", [("FCFS", None), ("SJF", {"dispatch": "event"}),
+                                                ("RoundRobin", None), ("RoundRobin", READY_QUEUE)])
+def test_run_until_then_execute_matches_uninterrupted_run(scheduler, options):
+    expected = finish(create_execution(scheduler, options))
+    execution = create_execution(scheduler, options)
+    execution.run_until(PAUSE_AT)
+    assert execution.env.now < PAUSE_AT
+    assert finish(execution) == expected
+
+
+def test_restored_snapshot_matches_uninterrupted_run():
+    expected = finish(create_execution("RoundRobin", READY_QUEUE))
+    execution = create_execution("RoundRobin", READY_QUEUE)
+    execution.run_until(PAUSE_AT)
+    data = snapshot(execution)
+    # Каждое восстановление - независимая копия; исходная симуляция тоже продолжается без изменений
+    assert finish(restore(data)) == expected
+    assert finish(restore(data)) == expected
+    assert finish(execution) == expected
+
+
+def test_snapshot_rejects_live_processes():
+    execution = create_execution("FCFS")
+    execution.run_until(PAUSE_AT)
+    with pytest.raises(ValueError):
+        snapshot(execution)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork_branches требует os.fork")
+@pytest.mark.parametrize("scheduler, options", [("FCFS", None), ("RoundRobin", READY_QUEUE)])
+def test_fork_branches_match_uninterrupted_run(scheduler, options):
+    expected = finish(create_execution(scheduler, options))
+    execution = create_execution(scheduler, options)
+    execution.run_until(PAUSE_AT)
+    assert fork_branches([finish, finish], execution) == [expected, expected]
+    assert finish(execution) == expected
@@ -0,0 +1,76 @@
+# Потоковое поступление задач: порядок SJF в обоих режимах диспетчеризации и совпадение с пакетным выполнением
+import pytest
+from cloudsim.entities.cloudlet import Cloudlet
+from cloudsim.entities.entity import reset_ids
+from cloudsim.simulation.arrivals import poisson_arrivals
+from cloudsim.simulation.cloudlet import CloudletExecution
+from cloudsim.simulation.experiment import DEFAULT_DATACENTER_CONFIG, build_datacenter
+
+# Одна VM: порядок выполнения ожидающих задач определяется только планировщиком
+SINGLE_VM_CONFIG = {
+    **DEFAULT_DATACENTER_CONFIG,
+    "vms": [{"count": 1, "mips": 500, "pes_number": 1, "ram": 1024, "bw": 2000, "size": 10000, "vmm": "Xen"}],
+}
+# (submit_time, length): пока выполняется первая задача, поступают четыре задачи разной длины
+ARRIVALS = [(0, 10), (1, 8), (2, 1), (3, 5), (3.5, 2)]
+
+
+def stream(arrivals):
+    for submit_time, length in arrivals:
+        cloudlet = Cloudlet(length=length, pes_number=1, file_size=100, output_size=30)
+        cloudlet.submit_time = submit_time
+        yield cloudlet
+
+
+def finish_times(scheduler, dispatch):
+    reset_ids()
+    cloudlets = list(stream(ARRIVALS))
+    CloudletExecution(scheduler, iter(cloudlets), build_datacenter(SINGLE_VM_CONFIG), dispatch=dispatch,
+                      verbosity="off").execute()
+    return [cloudlet.finish_time for cloudlet in cloudlets]
+
+
+def test_streaming_sjf_event_runs_shortest_waiting_first():
+    # В момент 10 ждут задачи длины 8, 1, 5, 2: они выполняются в порядке 1, 2, 5, 8
+    assert finish_times("SJF", "event") == [10, 26, 11, 18, 13]
+    assert finish_times("FCFS", "event") == [10, 18, 19, 24, 26]
+
+
+def test_streaming_sjf_polling_runs_shortest_waiting_first():
+    # Задачи опрашивают VM в моменты submit_time + 1, 2, ...: VM, освободившуюся в момент 10, задача длины 8
+    # (опрос в 10) и задача длины 5 (опрос в 10) уступают задаче длины 1; в момент 11 задачи длины 8 и 5
+    # уступают задаче длины 2 (опрос в 11.5), в момент 13.5 VM свободна, и в 14 её забирает задача длины 5
+    assert finish_times("SJF", "polling") == [10, 27, 11, 19, 13.5]
+    # FCFS: VM забирает задача, опрос которой наступил первым
+    assert finish_times("FCFS", "polling") == [10, 24, 16, 15, 26.5]
+
+
+@pytest.mark.parametrize("dispatch", ["polling", "event"])
+@pytest.mark.parametrize("scheduler", ["FCFS", "SJF"])
+def test_streaming_matches_batch_for_simultaneous_arrivals(scheduler, dispatch):
+    # Все задачи поступают в момент 0 в порядке order_cloudlets (задачи одного момента принимаются в порядке
+    # итератора): потоковый режим дает то же расписание, что и пакетный
+    def run(streaming):
+        reset_ids()
+        cloudlets = list(poisson_arrivals(rate=1000, count=100, seed=4))
+        for cloudlet in cloudlets:
+            cloudlet.submit_time = 0.0
+        if scheduler == "SJF":
+            cloudlets.sort(key=lambda cloudlet: cloudlet.length)
+        datacenter = build_datacenter(DEFAULT_DATACENTER_CONFIG)
+        CloudletExecution(scheduler, iter(cloudlets) if streaming else cloudlets, datacenter, dispatch=dispatch,
+                          verbosity="off").execute()
+        vm_indices = {vm.get_id(): index for index, vm in enumerate(datacenter.vm_list)}
+        return [(vm_indices[cloudlet.get_vm().get_id()], cloudlet.finish_time) for cloudlet in cloudlets]
+
+    assert run(True) == run(False)
+
+
+def test_polling_queue_is_empty_after_run():
+    reset_ids()
+    execution = CloudletExecution("SJF", poisson_arrivals(rate=0.5, count=500, seed=2),
+                                  build_datacenter(DEFAULT_DATACENTER_CONFIG), dispatch="polling", verbosity="off")
+    execution.execute()
+    scheduler = execution.scheduler_instance
+    assert scheduler.metrics.run_summary()["completed"] == 500
+    assert len(scheduler.polling_queue) == 0 and scheduler.polling_cloudlets == 0
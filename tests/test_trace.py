@@ -0,0 +1,51 @@
+# Колоночная трасса: запись в буферы, их рост и выгрузка в Parquet (spill)
+import pytest
+from cloudsim.entities.entity import reset_ids
+from cloudsim.simulation.cloudlet import CloudletExecution
+from cloudsim.simulation.experiment import build_datacenter, generate_cloudlets
+from cloudsim.simulation.trace import TRACE_CLOUDLET, TRACE_KINDS, TRACE_SLICE, TraceRecorder
+
+
+def run_round_robin(trace):
+    # Round-Robin с очередью готовых задач: задачи получают кванты и после выгрузки трассы
+    reset_ids()
+    execution = CloudletExecution("RoundRobin", generate_cloudlets(0, {"num_cloudlets": 40}), build_datacenter({}),
+                                  verbosity="off", trace=trace, scheduler_options={"rr_mode": "ready_queue"})
+    execution.execute()
+    return execution
+
+
+def trace_rows(trace):
+    columns = trace.arrays()
+    return [(TRACE_KINDS[kind], trace.cloudlet_ids[cloudlet], trace.vm_ids[vm], submit, start, finish)
+            for kind, cloudlet, vm, submit, start, finish in zip(*(column.tolist() for column in columns.values()))]
+
+
+def test_record_grows_buffers():
+    trace = TraceRecorder(capacity=4, chunk_size=4)
+    execution = run_round_robin(trace)
+    slices = [row for row in trace_rows(trace) if row[0] == "slice"]
+    cloudlets = [row for row in trace_rows(trace) if row[0] == "cloudlet"]
+    assert trace.capacity >= len(trace) > 4
+    assert len(cloudlets) == 40
+    assert sum(finish - start for _, _, _, _, start, finish in slices) == execution.scheduler_instance.total_execution_time
+    wait, turnaround = trace.latencies(TRACE_CLOUDLET)
+    assert len(wait) == 40 and (turnaround >= wait).all()
+    assert len(trace.latencies(TRACE_SLICE)[0]) == len(slices)
+
+
+def test_spilled_trace_matches_memory_trace(tmp_path):
+    # После каждой выгрузки задача, которой еще остались кванты, получает новый код: идентификаторы
+    # повторяются в словарях разных групп строк, но читаются из файла теми же значениями
+    pq = pytest.importorskip("pyarrow.parquet")
+    memory = TraceRecorder()
+    run_round_robin(memory)
+    path = tmp_path / "trace.parquet"
+    spilled = TraceRecorder(spill_path=path, spill_rows=7)
+    run_round_robin(spilled)
+    spilled.close()
+    table = pq.read_table(str(path)).to_pandas()
+    assert spilled.spilled == len(table) == len(memory)
+    rows = list(zip(table["kind"].astype(str), table["cloudlet_id"].astype(int), table["vm_id"].astype(int),
+                    table["submit_time"], table["start_time"], table["finish_time"]))
+    assert rows == trace_rows(memory)
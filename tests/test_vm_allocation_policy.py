@@ -0,0 +1,50 @@
+# Политики размещения VM: размещения для небольших хостов, вычисленные вручную
+from collections import deque
+import numpy as np
+import pytest
+from cloudsim.entities.datacenter import Datacenter, DatacenterCharacteristics
+from cloudsim.entities.host import Host
+from cloudsim.entities.pe import Pe
+from cloudsim.entities.vm import Vm
+from cloudsim.entities.vm_allocation_policy import get_vm_allocation_policy
+
+# Хост 0 вдвое больше хоста 1 по всем ресурсам (RAM, BW, Storage, PEs)
+CAPACITY = [[8, 8, 8, 8], [4, 4, 4, 4]]
+DEMANDS = [[2, 2, 2, 2], [3, 3, 3, 3], [4, 4, 4, 4], [9, 9, 9, 9]]
+
+# Оценки хостов для каждой VM (по свободным ресурсам после предыдущих размещений):
+# first_fit   - VM 0, 1 помещаются на хост 0 (свободно 8 -> 6 -> 3), VM 2 - только на хост 1;
+# best_fit    - VM 0: остаток 6/8*4 = 3 против 2/4*4 = 2 -> хост 1; VM 1, 2 помещаются только на хост 0;
+# worst_fit   - VM 0: -3 против -2 -> хост 0; VM 1: -(6-3)/8*4 = -1.5 против -1 -> хост 0; VM 2 - хост 1;
+# dot_product - VM 0: -(8/8)(2/8)*4 = -1 против -(4/4)(2/4)*4 = -2 -> хост 1; VM 1, 2 - только хост 0.
+# VM 3 не помещается ни на один хост.
+EXPECTED = {
+    "first_fit": [0, 0, 1, -1],
+    "best_fit": [1, 0, 0, -1],
+    "worst_fit": [0, 0, 1, -1],
+    "dot_product": [1, 0, 0, -1],
+}
+
+
+@pytest.mark.parametrize("policy", sorted(EXPECTED))
+def test_allocation_matches_hand_computed_placement(policy):
+    placement = get_vm_allocation_policy(policy).allocate(CAPACITY, np.zeros((2, 4)), DEMANDS)
+    assert placement.tolist() == EXPECTED[policy]
+
+
+def test_allocation_accounts_for_used_resources():
+    # Хост 0 наполовину занят, поэтому у обоих хостов свободно по 4 единицы. Остаток нормируется емкостью:
+    # VM 0 - на хост 0 (1/8*4 = 0.5 против 1/4*4 = 1), VM 1 - только хост 1, VM 2 - на последнюю единицу хоста 0
+    placement = get_vm_allocation_policy("best_fit").allocate(CAPACITY, [[4, 4, 4, 4], [0, 0, 0, 0]],
+                                                                [[3, 3, 3, 3], [4, 4, 4, 4], [1, 1, 1, 1]])
+    assert placement.tolist() == [0, 1, 0]
+
+
+@pytest.mark.parametrize("policy", sorted(EXPECTED))
+def test_datacenter_places_vms_with_policy(policy):
+    hosts = [Host(ram, bw, storage, [Pe(1000) for _ in range(pes)]) for ram, bw, storage, pes in CAPACITY]
+    characteristics = DatacenterCharacteristics("x86", "Linux", "Xen", hosts, 10.0, 100.0, 0.1, 0.002, 0.0)
+    datacenter = Datacenter("dc", characteristics, policy, deque(), 0)
+    vms = [Vm(datacenter.get_broker_id(), 1000, pes, ram, bw, size, "Xen") for ram, bw, size, pes in DEMANDS[:3]]
+    datacenter.set_vms(vms)
+    assert [hosts.index(vm.host) for vm in vms] == EXPECTED[policy][:3]
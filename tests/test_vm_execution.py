@@ -0,0 +1,83 @@
+# Модель "time_shared" должна давать те же времена завершения, что и точное разделение процессора
+import random
+import pytest
+from cloudsim.entities.cloudlet import Cloudlet
+from cloudsim.entities.vm import Vm
+from cloudsim.entities.vm_execution import TimeSharedExecution
+from cloudsim.simulation.cloudlet import CloudletExecution
+from cloudsim.simulation.experiment import DEFAULT_DATACENTER_CONFIG, build_datacenter
+
+MIPS = 100
+
+
+def datacenter_config(pes):
+    return {
+        **DEFAULT_DATACENTER_CONFIG,
+        "hosts": [{"count": 1, "ram": 8192, "bw": 20000, "storage": 1000000, "pes": 8, "mips": 1000}],
+        "vms": [{"count": 1, "mips": MIPS, "pes_number": pes, "ram": 4096, "bw": 1000, "size": 100000,
+                 "vmm": "Xen", "execution_model": "time_shared"}],
+    }
+
+
+def reference_finish_times(jobs, pes):
+    # Точное разделение процессора: jobs - (поступление, длина, PE); остаток каждой задачи пересчитывается
+    # на каждом событии
+    time = 0.0
+    active = {}
+    finish = {}
+    pending = sorted(range(len(jobs)), key=lambda index: jobs[index][0])
+    position = 0
+    while position < len(pending) or active:
+        requested = sum(jobs[index][2] for index in active)
+        rates = {index: MIPS * jobs[index][2] * min(1, pes / requested) for index in active}
+        next_finish = min((time + remaining / rates[index] for index, remaining in active.items()),
+                          default=float("inf"))
+        next_arrival = jobs[pending[position]][0] if position < len(pending) else float("inf")
+        next_time = min(next_finish, next_arrival)
+        for index in active:
+            active[index] -= rates[index] * (next_time - time)
+        time = next_time
+        for index in [index for index, remaining in active.items() if remaining <= 1e-9 * jobs[index][1]]:
+            finish[index] = time
+            del active[index]
+        while position < len(pending) and jobs[pending[position]][0] <= time:
+            active[pending[position]] = jobs[pending[position]][1]
+            position += 1
+    return [finish[index] for index in range(len(jobs))]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_time_shared_matches_processor_sharing(seed):
+    rng = random.Random(seed)
+    pes = rng.randint(1, 4)
+    jobs = sorted((rng.randint(0, 20) * 0.5, rng.randint(1, 50) * 10, rng.randint(1, pes))
+                  for _ in range(rng.randint(1, 30)))
+    cloudlets = []
+    for submit_time, length, pes_number in jobs:
+        cloudlet = Cloudlet(length=length, pes_number=pes_number, file_size=10, output_size=10)
+        cloudlet.submit_time = submit_time
+        cloudlets.append(cloudlet)
+    execution = CloudletExecution("FCFS", iter(cloudlets), build_datacenter(datacenter_config(pes)),
+                                  dispatch="event", verbosity="off")
+    execution.execute()
+    expected = reference_finish_times(jobs, pes)
+    assert [cloudlet.finish_time for cloudlet in cloudlets] == pytest.approx(expected, rel=1e-9, abs=1e-9)
+
+
+def test_equal_marks_finish_together():
+    # Отметка второй задачи (1.1 * 100 + 10) отличается от отметки первой (120) только погрешностью округления:
+    # обе задачи завершаются одним таймаутом в один и тот же момент
+    first = Cloudlet(length=120, pes_number=1, file_size=10, output_size=10)
+    first.submit_time = 0.0
+    second = Cloudlet(length=10, pes_number=1, file_size=10, output_size=10)
+    second.submit_time = 1.1
+    execution = CloudletExecution("FCFS", iter([first, second]), build_datacenter(datacenter_config(4)),
+                                  dispatch="event", verbosity="off")
+    execution.execute()
+    assert first.finish_time == second.finish_time == pytest.approx(1.2)
+
+
+def test_max_cloudlets_must_be_positive():
+    vm = Vm(0, MIPS, 1, 1024, 1000, 10000, "Xen")
+    with pytest.raises(ValueError):
+        TimeSharedExecution(vm, max_cloudlets=0)
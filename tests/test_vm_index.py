@@ -0,0 +1,45 @@
+# FreeVmIndex должен находить ту же VM, что и линейный поиск наименьшей подходящей свободной VM
+import random
+import pytest
+from cloudsim.entities.vm import Vm
+from cloudsim.schedulers.vm_index import FreeVmIndex
+
+
+def linear_find(free_vms, pes_number, ram, size, predicate=None):
+    # Наименьший класс (PE, RAM, Storage) среди подходящих свободных VM; внутри класса - VM, освобожденная последней
+    found = None
+    for vm in free_vms:
+        if vm.pes_number < pes_number or vm.ram < ram or vm.size < size:
+            continue
+        if predicate is not None and not predicate(vm):
+            continue
+        if found is None or FreeVmIndex.resource_class(vm) <= FreeVmIndex.resource_class(found):
+            found = vm
+    return found
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_free_vm_index_matches_linear_scan(seed):
+    rng = random.Random(seed)
+    vms = [Vm(0, 1000, rng.randint(1, 8), rng.choice([256, 512, 1024, 2048, 4096]),
+              1000, rng.choice([1000, 5000, 10000, 20000]), "Xen") for _ in range(60)]
+    index = FreeVmIndex()
+    free_vms = []  # Свободные VM в порядке освобождения
+    for _ in range(3000):
+        if free_vms and rng.random() < 0.4:
+            vm = free_vms.pop(rng.randrange(len(free_vms)))
+            index.remove(vm)
+        else:
+            busy = [vm for vm in vms if vm not in index]
+            if busy:
+                vm = rng.choice(busy)
+                index.append(vm)
+                free_vms.append(vm)
+        pes_number, ram, size = rng.randint(1, 8), rng.randint(1, 4096), rng.randint(1, 20000)
+        assert index.find(pes_number, ram, size) is linear_find(free_vms, pes_number, ram, size)
+        # predicate отвергает часть VM: поиск продолжается в следующих классах и корзинах
+        allowed = set(rng.sample([vm.get_id() for vm in vms], 30))
+        predicate = lambda vm: vm.get_id() in allowed
+        assert index.find(pes_number, ram, size, predicate) is linear_find(free_vms, pes_number, ram, size, predicate)
+    assert len(index) == len(free_vms)
+    assert sorted(vm.get_id() for vm in index) == sorted(vm.get_id() for vm in free_vms)